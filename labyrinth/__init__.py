@@ -0,0 +1,22 @@
+"""Labyrinth: a plugin-friendly challenge arena for OpenClaw agents."""
+from labyrinth.core.arena import (
+    Arena,
+    ArenaError,
+    AssetIntegrityError,
+    ChallengeBusy,
+    InvalidSubmission,
+    RateLimited,
+    UnknownAgent,
+    UnknownChallenge,
+)
+
+__all__ = [
+    "Arena",
+    "ArenaError",
+    "AssetIntegrityError",
+    "ChallengeBusy",
+    "InvalidSubmission",
+    "RateLimited",
+    "UnknownAgent",
+    "UnknownChallenge",
+]
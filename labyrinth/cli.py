@@ -2,17 +2,42 @@ from __future__ import annotations
 
 import json
 import os
+import sys
+import time
 from pathlib import Path
 import typer
 from importlib import metadata
 from rich.console import Console
 from rich.table import Table
 
-from labyrinth.core.config import load_master_config
-from labyrinth.core.db import connect, init_db, fetch_one, fetch_all
-from labyrinth.core.registry import load_plugins
-from labyrinth.core.scoring import leaderboard as lb
-from labyrinth.core.audit import append_audit
+from labyrinth.core.agents import detect_format, iter_agent_records
+from labyrinth.core.assets import PACK_NAME, AssetPackError, build_pack, open_pack, prune_loose
+from labyrinth.core.images import IMAGE_CACHE_DIR, image_index, image_manifest
+from labyrinth.core.arena import Arena, ArenaError, UnknownAgent, query_tracer
+from labyrinth.core.config import load_master_config, load_yaml, parse_duration
+from labyrinth.core.db import connect, init_db
+from labyrinth.core.models import CachedResponse
+from labyrinth.core.loadtest import loadtest as run_loadtest
+from labyrinth.core.profiling import (
+    DEFAULT_PROFILE_DIR,
+    PROFILE_ENV,
+    PROFILE_MEMORY_ENV,
+    Profiler,
+    profile_files,
+    resolve_profile_dir,
+    summarize,
+)
+from labyrinth.core.scoring import engine_for
+from labyrinth.core.validate import validate_tree
+from labyrinth.core.word_ladder import DEFAULT_MIN_ZIPF, generate_puzzles, plugin_config
+from labyrinth.core.wordlist import DEFAULT_WORDLIST, WordList, WordListError, build_wordlist, wordfreq_entries
+from labyrinth.core.audit import (
+    DEFAULT_AUDIT_PATH,
+    build_audit_index,
+    iter_audit,
+    parse_time,
+    replay_audit,
+)
 
 
 app = typer.Typer(add_completion=False, help="Labyrinth: plugin-friendly challenges for OpenClaw agents")
@@ -58,6 +83,18 @@ def main(
         help="Show the Labyrinth version and exit.",
         is_eager=True,
     ),
+    profile: str = typer.Option(
+        None,
+        "--profile",
+        envvar=PROFILE_ENV,
+        help="Profile the command with cProfile and write the report to this directory.",
+    ),
+    profile_memory: bool = typer.Option(
+        False,
+        "--profile-memory",
+        envvar=PROFILE_MEMORY_ENV,
+        help="With --profile, also record top allocation sites with tracemalloc.",
+    ),
 ):
     if version:
         console.print(_get_version())
@@ -65,22 +102,42 @@ def main(
     if ctx.invoked_subcommand is None:
         console.print(ctx.get_help())
         raise typer.Exit()
+    out_dir = resolve_profile_dir(profile)
+    if out_dir and ctx.invoked_subcommand != "profile":
+        profiler = Profiler(out_dir, ctx.invoked_subcommand, memory=profile_memory).start()
+        ctx.call_on_close(profiler.stop)
 
 
-def _get_env(config_path: str):
+def _get_db(config_path: str):
     cfg = load_master_config(_resolve_config_path(config_path))
-    conn = connect(cfg.db_path)
+    conn = connect(cfg.db_path, tracer=query_tracer(cfg))
     init_db(conn)
-    plugins = load_plugins(cfg.plugins)
-    return cfg, conn, plugins
+    return cfg, conn
+
+
+def _get_arena(config_path: str) -> Arena:
+    # Separate CLI invocations share token buckets through the database.
+    return Arena(_resolve_config_path(config_path), rate_limit_store="sqlite")
 
 
 agent_app = typer.Typer(help="Agent operations")
 challenge_app = typer.Typer(help="Challenge operations")
 plugins_app = typer.Typer(help="Plugin operations")
+audit_app = typer.Typer(help="Audit log operations")
+arena_app = typer.Typer(help="Reset the arena between rounds")
+profile_app = typer.Typer(help="Profiling reports")
+assets_app = typer.Typer(help="Pack challenge files into one asset pack and extract them again")
+word_change_app = typer.Typer(help="Word-change puzzle tools")
+words_app = typer.Typer(help="The compact English word list used to validate words")
 app.add_typer(agent_app, name="agent")
 app.add_typer(challenge_app, name="challenge")
 app.add_typer(plugins_app, name="plugins")
+app.add_typer(audit_app, name="audit")
+app.add_typer(arena_app, name="arena")
+app.add_typer(profile_app, name="profile")
+app.add_typer(assets_app, name="assets")
+app.add_typer(word_change_app, name="word-change")
+app.add_typer(words_app, name="words")
 
 
 @agent_app.command("register")
@@ -88,14 +145,47 @@ def agent_register(
     name: str = typer.Option(..., "--name", "-n", help="Agent display name (unique)"),
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, conn, _ = _get_env(config)
+    with _get_arena(config) as arena:
+        try:
+            arena.register_agent(name)
+        except ArenaError as e:
+            console.print(f"❌ {e}")
+            raise typer.Exit(code=e.exit_code)
+    console.print(f"✅ Registered agent: [bold]{name}[/bold]")
+
+
+@agent_app.command("import")
+def agent_import(
+    source: str = typer.Argument(..., help="CSV or JSONL file of agents ('-' for stdin)"),
+    fmt: str = typer.Option(None, "--format", help="csv or jsonl (default: from the file extension)"),
+    chunk_size: int = typer.Option(500, "--chunk-size", min=1, max=5000, help="Agents per transaction"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    try:
+        fmt = fmt or detect_format(source)
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8", newline="")
     try:
-        conn.execute("INSERT INTO agents(name) VALUES (?)", (name,))
-        conn.commit()
-        console.print(f"✅ Registered agent: [bold]{name}[/bold]")
-        append_audit({"event": "agent_register", "agent": name})
-    except Exception as e:
-        console.print(f"❌ Could not register agent '{name}': {e}")
+        with _get_arena(config) as arena:
+            report = arena.import_agents(iter_agent_records(stream, fmt), chunk_size=chunk_size)
+    except (OSError, ValueError) as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    console.print(
+        f"✅ Registered {len(report.created)} agents; {len(report.conflicts)} conflicts, {len(report.invalid)} invalid rows."
+    )
+    for name in report.conflicts[:20]:
+        console.print(f"  conflict: {name}")
+    if len(report.conflicts) > 20:
+        console.print(f"  ... and {len(report.conflicts) - 20} more conflicts")
+    for problem in report.invalid[:20]:
+        console.print(f"  ❌ {problem}")
+    if report.invalid:
         raise typer.Exit(code=1)
 
 
@@ -103,8 +193,8 @@ def agent_register(
 def agent_list(
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, conn, _ = _get_env(config)
-    rows = fetch_all(conn, "SELECT id, name, created_at FROM agents ORDER BY id ASC")
+    with _get_arena(config) as arena:
+        rows = arena.list_agents()
     if not rows:
         console.print("No agents registered yet.")
         return
@@ -120,9 +210,49 @@ def agent_list(
     console.print(table)
 
 
+@agent_app.command("history")
+def agent_history(
+    name: str = typer.Option(..., "--name", "-n", help="Agent display name (unique)"),
+    resolution: str = typer.Option("1h", "--resolution", "-r", help="Bucket size, e.g. 1m or 1h (see leaderboard.history_resolutions)"),
+    since: str = typer.Option(None, "--since", help="ISO timestamp or relative age like 24h"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    try:
+        seconds = parse_duration(resolution)
+        start = parse_time(since) if since else None
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    with _get_arena(config) as arena:
+        try:
+            points = arena.score_history(name, seconds, since=start)
+        except ArenaError as e:
+            console.print(f"❌ {e}")
+            raise typer.Exit(code=e.exit_code)
+    if not points:
+        console.print(f"No score history for {name}.")
+        return
+    table = Table(title=f"Score history: {name} ({resolution} buckets, UTC)")
+    table.add_column("Bucket")
+    table.add_column("Score", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("Runs", justify="right")
+    previous = None
+    for p in points:
+        change = "" if previous is None else f"{p['score'] - previous:+d}"
+        table.add_row(p["bucket"], str(p["score"]), change, str(p["runs"]))
+        previous = p["score"]
+    console.print(table)
+
+
 @agent_app.command("clear-score")
 def agent_clear_score(
-    name: str = typer.Option(..., "--name", "-n", help="Agent display name (unique)"),
+    name: str = typer.Option(None, "--name", "-n", help="Agent display name (unique)"),
+    all_agents: bool = typer.Option(
+        False,
+        "--all",
+        help="Clear every agent's runs in one statement and compact the database.",
+    ),
     hard: bool = typer.Option(
         False,
         "--hard",
@@ -130,37 +260,65 @@ def agent_clear_score(
     ),
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, conn, _ = _get_env(config)
-    agent_row = fetch_one(conn, "SELECT id, name FROM agents WHERE name = ?", (name,))
-    if not agent_row:
-        console.print(f"âŒ Unknown agent '{name}'.")
-        raise typer.Exit(code=2)
-
-    conn.execute("DELETE FROM runs WHERE agent_id = ?", (int(agent_row["id"]),))
-    if hard:
-        conn.execute("DELETE FROM agents WHERE id = ?", (int(agent_row["id"]),))
-    conn.commit()
+    if all_agents == bool(name):
+        console.print("❌ Pass either --name or --all.")
+        raise typer.Exit(code=1)
+    with _get_arena(config) as arena:
+        if all_agents:
+            count = arena.clear_all_scores()
+            console.print(f"✅ Cleared {count} runs for all agents.")
+            return
+        try:
+            arena.clear_score(name, hard=hard)
+        except UnknownAgent:
+            console.print(f"âŒ Unknown agent '{name}'.")
+            raise typer.Exit(code=2)
     if hard:
         console.print(f"âœ… Cleared scores and removed agent: [bold]{name}[/bold]")
-        append_audit({"event": "agent_clear_score_hard", "agent": name})
     else:
         console.print(f"âœ… Cleared scores for agent: [bold]{name}[/bold]")
-        append_audit({"event": "agent_clear_score", "agent": name})
+
+
+@arena_app.command("snapshot")
+def arena_snapshot(
+    out: str = typer.Option(None, "--out", "-o", help="Template file (default: <db>.template.db)"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    with _get_arena(config) as arena:
+        path = arena.snapshot(out)
+    console.print(f"✅ Wrote arena template: {path}")
+
+
+@arena_app.command("restore")
+def arena_restore(
+    source: str = typer.Option(None, "--from", help="Template file (default: <db>.template.db)"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask for confirmation."),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    if not yes:
+        typer.confirm("Replace the database (all runs and agents) with the template?", abort=True)
+    with _get_arena(config) as arena:
+        try:
+            agents = arena.restore(source)
+        except ArenaError as e:
+            console.print(f"❌ {e}")
+            raise typer.Exit(code=e.exit_code)
+    console.print(f"✅ Restored arena with {len(agents)} agents.")
 
 
 @challenge_app.command("list")
 def challenge_list(
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, _, plugins = _get_env(config)
+    with _get_arena(config) as arena:
+        challenges = arena.list_challenges()
     table = Table(title="Labyrinth Challenges")
     table.add_column("ID", style="bold")
     table.add_column("Name")
     table.add_column("GUID")
     table.add_column("Enabled")
-    for pid, p in plugins.items():
-        guid = p.instance.get_display_guid(p.cfg)
-        table.add_row(pid, getattr(p.instance, "name", pid), guid, "yes")
+    for c in challenges:
+        table.add_row(c["id"], c["name"], c["guid"], "yes")
     console.print(table)
 
 
@@ -168,45 +326,135 @@ def challenge_list(
 def plugins_list(
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, _, plugins = _get_env(config)
+    with _get_arena(config) as arena:
+        challenges = arena.list_challenges()
     table = Table(title="Labyrinth Plugins")
     table.add_column("ID", style="bold")
     table.add_column("Name")
     table.add_column("GUID")
     table.add_column("Path")
-    for pid, p in plugins.items():
-        guid = p.instance.get_display_guid(p.cfg)
-        table.add_row(pid, getattr(p.instance, "name", pid), guid, p.spec.path)
+    for c in challenges:
+        table.add_row(c["id"], c["name"], c["guid"], c["path"])
     console.print(table)
 
 
+def _not_modified(response: CachedResponse, etag: bool, if_none_match: str | None) -> bool:
+    """Print the ETag if asked; True (after saying so) when the caller's copy is current."""
+    if etag or if_none_match:
+        console.print(f"ETag: {response.etag}", highlight=False)
+    if response.matches(if_none_match):
+        console.print("Not modified.")
+        return True
+    return False
+
+
+@challenge_app.command("find-guid")
+def challenge_find_guid(
+    guid: str = typer.Argument(..., help="A challenge's secret GUID"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    """Print the id of the challenge this GUID solves."""
+    with _get_arena(config) as arena:
+        challenge_id = arena.challenge_for_guid(guid)
+    if challenge_id is None:
+        console.print("❌ No enabled challenge has that GUID.")
+        raise typer.Exit(code=2)
+    typer.echo(challenge_id)
+
+
 @challenge_app.command("info")
 def challenge_info(
     challenge_id: str = typer.Argument(..., help="Challenge id"),
+    etag: bool = typer.Option(False, "--etag", help="Print the response ETag first."),
+    if_none_match: str = typer.Option(None, "--if-none-match", help="Skip the body if this ETag is current."),
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, _, plugins = _get_env(config)
-    if challenge_id not in plugins:
-        console.print(f"❌ Unknown challenge: {challenge_id}")
-        raise typer.Exit(code=2)
-    p = plugins[challenge_id]
-    instructions = p.instance.get_instructions(p.cfg)
-    console.print(f"[bold]{challenge_id}[/bold]: {getattr(p.instance, 'name', challenge_id)}\n")
-    console.print(instructions)
+    with _get_arena(config) as arena:
+        try:
+            response = arena.instructions_response(challenge_id)
+        except ArenaError as e:
+            console.print(f"❌ {e}")
+            raise typer.Exit(code=e.exit_code)
+    if _not_modified(response, etag, if_none_match):
+        return
+    info = json.loads(response.body)
+    console.print(f"[bold]{challenge_id}[/bold]: {info['name']}\n")
+    console.print(info["instructions"])
 
 
 @challenge_app.command("manifest")
 def challenge_manifest(
     challenge_id: str = typer.Argument(..., help="Challenge id"),
+    etag: bool = typer.Option(False, "--etag", help="Print the response ETag first."),
+    if_none_match: str = typer.Option(None, "--if-none-match", help="Skip the body if this ETag is current."),
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, _, plugins = _get_env(config)
-    if challenge_id not in plugins:
-        console.print(f"âŒ Unknown challenge: {challenge_id}")
-        raise typer.Exit(code=2)
-    p = plugins[challenge_id]
-    manifest = p.instance.get_manifest(p.cfg)
-    console.print_json(data=manifest)
+    with _get_arena(config) as arena:
+        try:
+            response = arena.manifest_response(challenge_id)
+        except ArenaError as e:
+            console.print(f"âŒ {e}")
+            raise typer.Exit(code=e.exit_code)
+    if _not_modified(response, etag, if_none_match):
+        return
+    console.print_json(response.body.decode("utf-8"))
+
+
+def _duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+@challenge_app.command("stats")
+def challenge_stats_command(
+    challenge_id: str = typer.Argument(None, help="Challenge id (default: all with runs)"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    with _get_arena(config) as arena:
+        try:
+            rows = arena.challenge_stats(challenge_id)
+        except ArenaError as e:
+            console.print(f"❌ {e}")
+            raise typer.Exit(code=e.exit_code)
+        points = {c["id"]: c["points"] for c in arena.list_challenges()}
+    if not rows:
+        console.print("No runs recorded yet.")
+        return
+    table = Table(title="Challenge stats")
+    table.add_column("Challenge", style="bold")
+    table.add_column("Points", justify="right")
+    table.add_column("Runs", justify="right")
+    table.add_column("Success", justify="right")
+    table.add_column("Solved by", justify="right")
+    table.add_column("Tries to solve", justify="right")
+    table.add_column("Time to solve", justify="right")
+    for r in rows:
+        mean = r.mean_attempts_to_solve
+        table.add_row(
+            r.challenge_id,
+            str(points.get(r.challenge_id, "-")),
+            str(r.attempts),
+            f"{r.success_rate:.0%}",
+            f"{r.solvers}/{r.agents}",
+            "-" if mean is None else f"{mean:.1f}",
+            _duration(r.median_solve_seconds),
+        )
+    console.print(table)
+
+
+@challenge_app.command("stats-backfill")
+def challenge_stats_backfill(
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    with _get_arena(config) as arena:
+        runs = arena.backfill_stats()
+    console.print(f"✅ Rebuilt challenge stats from {runs} runs.")
 
 
 @challenge_app.command("submit")
@@ -214,73 +462,27 @@ def challenge_submit(
     challenge_id: str = typer.Argument(..., help="Challenge id"),
     agent: str = typer.Option(..., "--agent", "-a", help="Agent name"),
     json_payload: str = typer.Option(..., "--json", help="Submission JSON string"),
+    idempotency_key: str = typer.Option(
+        None,
+        "--idempotency-key",
+        help="Retry-safe key: repeating it returns the first result without re-running or re-scoring.",
+    ),
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, conn, plugins = _get_env(config)
-    if challenge_id not in plugins:
-        console.print(f"❌ Unknown challenge: {challenge_id}")
-        raise typer.Exit(code=2)
-
-    agent_row = fetch_one(conn, "SELECT id, name FROM agents WHERE name = ?", (agent,))
-    if not agent_row:
-        console.print(f"❌ Unknown agent '{agent}'. Register first: labyrinth agent register --name \"{agent}\"")
-        raise typer.Exit(code=3)
-
-    try:
-        submission = json.loads(json_payload)
-        if not isinstance(submission, dict):
-            raise ValueError("submission must be a JSON object")
-    except Exception as e:
-        console.print(f"❌ Invalid JSON payload: {e}")
-        raise typer.Exit(code=4)
-
-    # Repeat detection (Phase 0: only award points once per agent+challenge if plugin config says on_repeat=0)
-    p = plugins[challenge_id]
-    points_cfg = p.cfg.get("challenge", {}).get("points", {})
-    on_repeat = int(points_cfg.get("on_repeat", 0))
-    on_success = int(points_cfg.get("on_success", 0))
-
-    prior = fetch_one(
-        conn,
-        "SELECT id FROM runs WHERE agent_id = ? AND challenge_id = ? AND status = 'success' LIMIT 1",
-        (int(agent_row["id"]), challenge_id),
-    )
-
-    result = p.instance.submit(agent, submission, p.cfg)
-
-    points_awarded = result.points
-    if result.status == "fail":
-        points_awarded = -abs(on_success)
-    elif prior and on_repeat == 0:
-        points_awarded = 0
-
-    conn.execute(
-        "INSERT INTO runs(agent_id, challenge_id, status, points, evidence_json) VALUES (?,?,?,?,?)",
-        (
-            int(agent_row["id"]),
-            challenge_id,
-            result.status,
-            int(points_awarded),
-            json.dumps(result.evidence or {}, ensure_ascii=False),
-        ),
-    )
-    conn.commit()
-
-    append_audit(
-        {
-            "event": "challenge_submit",
-            "agent": agent,
-            "challenge_id": challenge_id,
-            "status": result.status,
-            "points": points_awarded,
-            "message": result.message,
-        }
-    )
+    with _get_arena(config) as arena:
+        try:
+            result = arena.submit(challenge_id, agent, json_payload, idempotency_key=idempotency_key)
+        except UnknownAgent:
+            console.print(f"❌ Unknown agent '{agent}'. Register first: labyrinth agent register --name \"{agent}\"")
+            raise typer.Exit(code=UnknownAgent.exit_code)
+        except ArenaError as e:
+            console.print(f"❌ {e}")
+            raise typer.Exit(code=e.exit_code)
 
     if result.status == "success":
-        console.print(f"🏁 [bold green]SUCCESS[/bold green] +{points_awarded} points: {result.message}")
+        console.print(f"🏁 [bold green]SUCCESS[/bold green] +{result.points} points: {result.message}")
     else:
-        console.print(f"🧱 [bold red]FAIL[/bold red] +{points_awarded} points: {result.message}")
+        console.print(f"🧱 [bold red]FAIL[/bold red] +{result.points} points: {result.message}")
         raise typer.Exit(code=5)
 
 
@@ -288,8 +490,8 @@ def challenge_submit(
 def show_leaderboard(
     config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
 ):
-    _, conn, _ = _get_env(config)
-    rows = lb(conn)
+    with _get_arena(config) as arena:
+        rows = arena.leaderboard()
 
     table = Table(title="Labyrinth Leaderboard")
     table.add_column("Rank", justify="right")
@@ -300,3 +502,370 @@ def show_leaderboard(
         table.add_row(str(i), r["agent"], str(r["points"]))
 
     console.print(table)
+
+
+@app.command("loadtest")
+def loadtest_command(
+    agents: int = typer.Option(10, "--agents", "-n", help="Simulated agents"),
+    ops: int = typer.Option(20, "--ops", help="Submissions per agent (after register and scorecard)"),
+    mode: str = typer.Option("thread", "--mode", help="thread, asyncio or process"),
+    correct: float = typer.Option(0.5, "--correct", help="Share of submissions that try to be correct"),
+    seed: int = typer.Option(0, "--seed"),
+    workers: int = typer.Option(None, "--workers", help="Processes for --mode process (default: CPU count)"),
+    db: str = typer.Option(None, "--db", help="Keep the load-test database here (default: a temporary file)"),
+    no_rate_limit: bool = typer.Option(False, "--no-rate-limit", help="Disable the configured rate limit"),
+    trace: bool = typer.Option(False, "--trace", help="Time every SQL statement, even if db.trace is off"),
+    top_queries: int = typer.Option(10, "--top-queries", help="Statements to list when tracing"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    try:
+        report = run_loadtest(
+            _resolve_config_path(config),
+            agents=agents,
+            ops=ops,
+            mode=mode,
+            correct_ratio=correct,
+            seed=seed,
+            db_path=db,
+            rate_limit=not no_rate_limit,
+            workers=workers,
+            trace=trace,
+        )
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(code=1)
+
+    console.print(
+        f"{len(report.samples)} calls by {report.agents} agents ({report.mode}) in {report.seconds:.2f}s: "
+        f"[bold]{report.throughput:,.0f} calls/s[/bold]"
+    )
+    console.print(
+        "latency ms: "
+        + ", ".join(f"p{p}={report.percentile(p):.2f}" for p in (50, 90, 99))
+        + f", max={report.percentile(100):.2f}"
+    )
+    console.print("outcomes: " + ", ".join(f"{k}={v}" for k, v in report.outcomes.most_common()))
+
+    table = Table(title="Latency by operation")
+    table.add_column("Operation", style="bold")
+    table.add_column("Calls", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    for op, count in report.by_operation().items():
+        table.add_row(op, str(count), f"{report.percentile(50, op):.2f}", f"{report.percentile(99, op):.2f}")
+    console.print(table)
+
+    if report.query_stats:
+        table = Table(title=f"SQL statements by total time (top {top_queries} of {len(report.query_stats)})")
+        table.add_column("Statement")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total ms", justify="right")
+        table.add_column("Mean ms", justify="right")
+        table.add_column("Max ms", justify="right")
+        table.add_column("Rows", justify="right")
+        for q in report.query_stats[:top_queries]:
+            table.add_row(
+                q["sql"],
+                str(q["calls"]),
+                f"{q['total_ms']:.1f}",
+                f"{q['total_ms'] / q['calls']:.3f}",
+                f"{q['max_ms']:.2f}",
+                "-" if q["rows"] is None else str(q["rows"]),
+            )
+        console.print(table)
+
+    if report.lock_errors:
+        console.print(f"❌ {report.lock_errors} calls failed with SQLite lock errors.")
+        raise typer.Exit(code=1)
+
+
+@app.command("validate")
+def validate(
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Worker processes (default: CPU count)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Recheck every plugin, ignoring cached results."),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    reports = validate_tree(_resolve_config_path(config), jobs=jobs, use_cache=not no_cache)
+
+    table = Table(title="Labyrinth Plugin Validation")
+    table.add_column("ID", style="bold")
+    table.add_column("Status")
+    table.add_column("Problems")
+    for r in reports:
+        status = "[green]ok[/green]" if r.ok else "[red]error[/red]"
+        if r.cached:
+            status += " (cached)"
+        if not r.enabled:
+            status += " (disabled)"
+        table.add_row(r.id, status, "\n".join(r.errors))
+    console.print(table)
+
+    failed = [r for r in reports if not r.ok]
+    if failed:
+        console.print(f"❌ {len(failed)} of {len(reports)} plugins have problems.")
+        raise typer.Exit(code=1)
+    console.print(f"✅ All {len(reports)} plugins are valid.")
+
+
+@audit_app.command("query")
+def audit_query(
+    event: str = typer.Option(None, "--event", help="Only events of this type (e.g. challenge_submit)"),
+    agent: str = typer.Option(None, "--agent", "-a", help="Only events for this agent"),
+    challenge_id: str = typer.Option(None, "--challenge", "-c", help="Only events for this challenge"),
+    status: str = typer.Option(None, "--status", help="Only submits with this status (success/fail)"),
+    since: str = typer.Option(None, "--since", help="ISO time or age like 30m, 1h, 2d"),
+    until: str = typer.Option(None, "--until", help="ISO time or age like 30m, 1h, 2d (exclusive)"),
+    limit: int = typer.Option(0, "--limit", help="Stop after this many events (0 = no limit)"),
+    path: str = typer.Option(DEFAULT_AUDIT_PATH, "--path", help="Path to the live audit log"),
+):
+    try:
+        start = parse_time(since) if since else None
+        end = parse_time(until) if until else None
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    records = iter_audit(path, event=event, agent=agent, challenge_id=challenge_id, since=start, until=end)
+    shown = 0
+    for record in records:
+        if status is not None and record.get("status") != status:
+            continue
+        typer.echo(json.dumps(record, ensure_ascii=False))
+        shown += 1
+        if limit and shown >= limit:
+            break
+
+
+@audit_app.command("index")
+def audit_index(
+    path: str = typer.Option(DEFAULT_AUDIT_PATH, "--path", help="Path to the live audit log"),
+):
+    added = build_audit_index(path)
+    console.print(f"✅ Indexed audit log: {added} new offset entries.")
+
+
+@audit_app.command("replay")
+def audit_replay(
+    path: str = typer.Option(DEFAULT_AUDIT_PATH, "--path", help="Path to the live audit log"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask for confirmation."),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    cfg, conn = _get_db(config)
+    if not yes:
+        typer.confirm("Replace all runs with the ones recorded in the audit log?", abort=True)
+    counts = replay_audit(conn, iter_audit(path), engine=engine_for(cfg.leaderboard))
+    console.print(
+        f"✅ Replayed {counts['events']} events: {counts['runs']} runs, "
+        f"{counts['agents']} agents created, {counts['clears']} clears."
+    )
+
+
+@profile_app.command("summarize")
+def profile_summarize(
+    paths: list[str] = typer.Argument(None, help=f"Profile files or directories (default: {DEFAULT_PROFILE_DIR})"),
+    top: int = typer.Option(20, "--top", help="Functions to show; also the per-run cutoff for 'hot'"),
+):
+    files = profile_files(paths or [DEFAULT_PROFILE_DIR])
+    if not files:
+        console.print("No profile files found.")
+        raise typer.Exit(code=1)
+    count, rows = summarize(files, top=top)
+
+    table = Table(title=f"Hot functions across {count} profiles")
+    table.add_column("Function", style="bold")
+    table.add_column("Hot in", justify="right")
+    table.add_column("Seen in", justify="right")
+    table.add_column("Calls", justify="right")
+    table.add_column("Own s (mean)", justify="right")
+    table.add_column("Cum s (mean)", justify="right")
+    for r in rows:
+        table.add_row(
+            r.function,
+            f"{r.hot_runs}/{count}",
+            str(r.runs),
+            str(r.calls),
+            f"{r.mean_tottime:.4f}",
+            f"{r.mean_cumtime:.4f}",
+        )
+    console.print(table)
+
+
+def _asset_plugins(config: str, plugin_ids: list[str] | None) -> tuple[Path, list]:
+    path = _resolve_config_path(config)
+    cfg = load_master_config(path)
+    specs = cfg.plugins
+    if plugin_ids:
+        unknown = sorted(set(plugin_ids) - {s.id for s in specs})
+        if unknown:
+            console.print(f"❌ Unknown plugin: {', '.join(unknown)}")
+            raise typer.Exit(code=2)
+        specs = [s for s in specs if s.id in plugin_ids]
+    return Path(path).resolve().parent, specs
+
+
+@assets_app.command("pack")
+def assets_pack(
+    prune: bool = typer.Option(False, "--prune", help="Delete the loose files once they are packed."),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    root, specs = _asset_plugins(config, None)
+    stats = build_pack(root, [Path(s.path) for s in specs])
+    console.print(
+        f"✅ Packed {stats.files} files ({stats.blobs} distinct, {stats.bytes} bytes) into {root / PACK_NAME}"
+    )
+    if prune:
+        pack = open_pack(root / PACK_NAME)
+        assert pack is not None
+        removed = prune_loose(root, pack)
+        console.print(f"✅ Removed {removed} loose files; 'labyrinth assets unpack' restores them.")
+
+
+@assets_app.command("unpack")
+def assets_unpack(
+    plugin_ids: list[str] = typer.Argument(None, help="Plugins to extract (default: all)"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    root, specs = _asset_plugins(config, plugin_ids)
+    try:
+        pack = open_pack(root / PACK_NAME)
+    except AssetPackError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    if pack is None:
+        console.print(f"❌ No asset pack at {root / PACK_NAME}; run 'labyrinth assets pack' first.")
+        raise typer.Exit(code=1)
+    written = 0
+    for spec in specs:
+        try:
+            prefix = Path(spec.path).resolve().relative_to(root).as_posix()
+        except ValueError:
+            continue
+        written += pack.extract(root, prefix)
+    console.print(f"✅ Extracted {written} files.")
+
+
+@assets_app.command("images")
+def assets_images(
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    """Index image quiz images: size, dimensions, sha256 and a preview, cached by content hash."""
+    with _get_arena(config) as arena:
+        index = image_index(arena.config.root)
+        table = Table(title="Image quiz assets")
+        table.add_column("Challenge", style="bold")
+        table.add_column("Image")
+        table.add_column("Size", justify="right")
+        table.add_column("Bytes", justify="right")
+        table.add_column("SHA-256")
+        count = 0
+        for pid, p in arena.plugins.items():
+            image_paths = getattr(p.instance, "image_paths", None)
+            if image_paths is None:
+                continue
+            for label, info in image_manifest(index, image_paths(p.cfg, Path(p.spec.path))).items():
+                table.add_row(pid, label, f"{info['width']}x{info['height']}", str(info["bytes"]), info["sha256"][:12])
+                count += 1
+        index.save()
+        problems = arena.verify_assets()
+    console.print(table)
+    for pid, found in problems.items():
+        for problem in found:
+            console.print(f"❌ {pid}: {problem}")
+    if problems:
+        raise typer.Exit(code=1)
+    console.print(f"✅ Indexed {count} images in {Path(arena.config.root) / IMAGE_CACHE_DIR}")
+
+
+@word_change_app.command("generate")
+def word_change_generate(
+    count: int = typer.Option(10, "--count", min=1, help="Puzzles to generate"),
+    length: int = typer.Option(4, "--length", min=2, help="Word length"),
+    min_steps: int = typer.Option(4, "--min-steps", min=1),
+    max_steps: int = typer.Option(7, "--max-steps", min=1),
+    min_zipf: float = typer.Option(DEFAULT_MIN_ZIPF, "--min-zipf", help="Only use words at least this common"),
+    max_solutions: int = typer.Option(None, "--max-solutions", help="Skip puzzles with more shortest chains"),
+    workers: int = typer.Option(None, "--workers", min=1, help="Worker processes (default: CPU count)"),
+    seed: int = typer.Option(0, "--seed"),
+    out: Path = typer.Option(Path("word_change_generated"), "--out", help="Folder for the plugin folders"),
+    prefix: str = typer.Option("word_change_gen_", "--prefix", help="Plugin id prefix"),
+    config: str = typer.Option("labyrinth.yaml", "--config", help="Path to master config"),
+):
+    """Generate word-change puzzles whose shortest solution is exactly the step count."""
+    if min_steps > max_steps:
+        console.print("❌ --min-steps is greater than --max-steps")
+        raise typer.Exit(code=1)
+    # Skip the start/end pairs of the configured word_change plugins.
+    existing = []
+    path = Path(_resolve_config_path(config))
+    if path.exists():
+        for spec in load_master_config(path).plugins:
+            if spec.kind == "word_change" and Path(spec.config_path).exists():
+                wc = load_yaml(spec.config_path).get("word_change", {})
+                existing.append((str(wc.get("start", "")), str(wc.get("end", ""))))
+
+    started = time.perf_counter()
+    puzzles = generate_puzzles(
+        count, length, (min_steps, max_steps), min_zipf, max_solutions, workers, seed, exclude=existing
+    )
+    elapsed = time.perf_counter() - started
+
+    entries = []
+    for n, puzzle in enumerate(puzzles, start=1):
+        plugin_id = f"{prefix}{n:0{max(3, len(str(count)))}d}"
+        folder = out / plugin_id
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "config.yaml").write_text(
+            plugin_config(puzzle, plugin_id, f"Change a Word {plugin_id[len(prefix):]}"), encoding="utf-8"
+        )
+        entries.append(
+            f'  - id: "{plugin_id}"\n'
+            '    kind: "word_change"\n'
+            f'    path: "{folder.as_posix()}"\n'
+            "    enabled: true\n"
+            f'    config_path: "{(folder / "config.yaml").as_posix()}"\n'
+        )
+    out.mkdir(parents=True, exist_ok=True)
+    (out / "plugins.yaml").write_text("plugins:\n" + "".join(entries), encoding="utf-8")
+
+    by_difficulty: dict[str, int] = {}
+    for puzzle in puzzles:
+        by_difficulty[puzzle.difficulty] = by_difficulty.get(puzzle.difficulty, 0) + 1
+    rate = len(puzzles) / elapsed * 60 if elapsed else 0.0
+    console.print(
+        f"✅ Generated {len(puzzles)} puzzles in {elapsed:.2f}s ({rate:,.0f}/min): "
+        + ", ".join(f"{k} {v}" for k, v in sorted(by_difficulty.items()))
+    )
+    console.print(f"Add the entries in {out / 'plugins.yaml'} to your master config's plugins list.")
+    if len(puzzles) < count:
+        console.print(f"❌ Only {len(puzzles)} of {count} distinct puzzles exist for these settings.")
+        raise typer.Exit(code=1)
+
+
+@words_app.command("build")
+def words_build(
+    out: Path = typer.Option(DEFAULT_WORDLIST, "--out", help="Where to write the word list"),
+    min_zipf: float = typer.Option(0.0, "--min-zipf", help="Leave out words rarer than this"),
+    max_length: int = typer.Option(None, "--max-length", min=1, help="Leave out longer words"),
+):
+    """Build the word list from wordfreq (the only command that needs wordfreq)."""
+    count = build_wordlist(out, wordfreq_entries(min_zipf, max_length))
+    console.print(f"✅ Wrote {count} words ({out.stat().st_size} bytes) to {out}")
+
+
+@words_app.command("lookup")
+def words_lookup(
+    words: list[str] = typer.Argument(..., help="Words to look up"),
+    path: Path = typer.Option(DEFAULT_WORDLIST, "--path", help="Word list to read"),
+):
+    """Show whether each word is known, and its Zipf frequency."""
+    try:
+        wordlist = WordList(path)
+    except (OSError, WordListError) as e:
+        console.print(f"❌ {e}; run 'labyrinth words build' first.")
+        raise typer.Exit(code=1)
+    table = Table(title=str(path))
+    table.add_column("Word", style="bold")
+    table.add_column("Zipf", justify="right")
+    for word in words:
+        zipf = wordlist.zipf(word)
+        table.add_row(word, f"{zipf:.1f}" if zipf else "unknown")
+    console.print(table)
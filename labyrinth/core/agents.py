@@ -0,0 +1,88 @@
+"""Reading agent records for bulk registration (``labyrinth agent import``).
+
+CSV input needs a ``name`` column; every other non-empty column becomes metadata. A
+``meta`` cell holding a JSON object is merged in like JSONL's; any other text in it is
+kept as a plain ``meta`` value.
+JSONL input has one object per line with a ``name`` key; a ``meta`` object and any
+other keys become metadata. Metadata is stored in ``agents.meta_json``.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass(frozen=True)
+class AgentRecord:
+    line: int
+    name: str
+    meta: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ImportReport:
+    created: list[str] = field(default_factory=list)
+    conflicts: list[str] = field(default_factory=list)  # already registered or repeated in the input
+    invalid: list[str] = field(default_factory=list)  # "line N: reason"
+
+
+def detect_format(filename: str) -> str:
+    lower = filename.lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of {filename!r}; pass --format {' or '.join(FORMATS)}")
+
+
+def _record(line: int, raw: dict[str, Any]) -> AgentRecord | str:
+    name = raw.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return f"line {line}: missing name"
+    meta = {k: v for k, v in raw.items() if k not in ("name", "meta") and v not in (None, "")}
+    nested = raw.get("meta")
+    if isinstance(nested, dict):
+        meta.update(nested)
+    elif nested not in (None, ""):
+        return f"line {line}: meta must be an object"
+    return AgentRecord(line=line, name=name.strip(), meta=meta)
+
+
+def _csv_meta(text: str | None) -> dict[str, Any] | None:
+    if not text:
+        return None
+    try:
+        nested = json.loads(text)
+    except ValueError:
+        nested = None
+    return nested if isinstance(nested, dict) else {"meta": text}
+
+
+def iter_agent_records(lines: Iterable[str], fmt: str) -> Iterator[AgentRecord | str]:
+    """Yield an AgentRecord per input row, or a "line N: reason" string for a bad one."""
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        if not reader.fieldnames or "name" not in reader.fieldnames:
+            yield "line 1: CSV header has no 'name' column"
+            return
+        for row in reader:
+            if "meta" in row:
+                row["meta"] = _csv_meta(row["meta"])
+            yield _record(reader.line_num, row)
+    elif fmt == "jsonl":
+        for n, text in enumerate(lines, start=1):
+            if not text.strip():
+                continue
+            try:
+                raw = json.loads(text)
+            except ValueError as e:
+                yield f"line {n}: {e}"
+                continue
+            yield _record(n, raw) if isinstance(raw, dict) else f"line {n}: expected a JSON object"
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {FORMATS}")
@@ -0,0 +1,615 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from labyrinth.core.agents import AgentRecord, ImportReport
+from labyrinth.core.audit import DEFAULT_AUDIT_PATH, append_audit, append_audit_many
+from labyrinth.core.config import LabyrinthConfig, load_master_config
+from labyrinth.core import idempotency
+from labyrinth.core.db import QueryTracer, connect, fetch_all, fetch_one, init_db
+from labyrinth.core.models import CachedResponse, ChallengeResult
+from labyrinth.core.ratelimit import MemoryRateLimiter, SqliteRateLimiter
+from labyrinth.core.registry import LoadedPlugin, SubmissionBusy, build_guid_index, find_challenge_by_guid, load_plugins
+from labyrinth.core.stats import (
+    ChallengeStats,
+    backfill_stats,
+    challenge_stats,
+    ensure_stats,
+    forget_agent,
+    record_attempt,
+)
+from labyrinth.core.scoring import (
+    engine_for,
+    ensure_scores,
+    leaderboard as lb,
+    recompute_scores,
+    record_run,
+    score_history,
+)
+
+
+class ArenaError(Exception):
+    """Base class for errors surfaced by Arena; ``exit_code`` is what the CLI exits with."""
+
+    exit_code = 1
+
+
+class UnknownChallenge(ArenaError):
+    exit_code = 2
+
+
+class UnknownAgent(ArenaError):
+    exit_code = 3
+
+
+class InvalidSubmission(ArenaError):
+    exit_code = 4
+
+
+class AssetIntegrityError(ArenaError):
+    """A challenge's files are missing or differ from the ones indexed at build time."""
+
+    exit_code = 7
+
+
+class ChallengeBusy(ArenaError):
+    """The plugin could not run the submission now; it was not recorded and can be retried."""
+
+    exit_code = 8
+
+
+class RateLimited(ArenaError):
+    exit_code = 6
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _check_same_request(stored: idempotency.StoredResult, key: str, challenge_id: str, req_hash: str) -> None:
+    """A stored result only answers the request it was stored for."""
+    if stored.request_hash != req_hash:
+        raise InvalidSubmission(
+            f"idempotency_key '{key}' was already used for a different submission"
+            + ("" if stored.challenge_id == challenge_id else f" to '{stored.challenge_id}'")
+        )
+
+
+def query_tracer(config: LabyrinthConfig) -> QueryTracer | None:
+    trace = config.query_trace
+    if not trace.enabled:
+        return None
+    return QueryTracer(slow_ms=trace.slow_query_ms, slow_log=trace.slow_query_log)
+
+
+class Arena:
+    """In-process access to a Labyrinth: config, plugins, database and audit log.
+
+    One Arena holds its resources across calls and is safe to share between threads.
+    Methods return plain data (dicts, lists, ``ChallengeResult``) and raise ``ArenaError``
+    subclasses instead of printing.
+
+    ``rate_limit_store`` picks where token buckets live: ``"memory"`` for a long-lived
+    process, ``"sqlite"`` when separate processes (the CLI) must share them.
+    ``clock`` (seconds since the epoch) is used for idempotency key expiry. An already
+    loaded ``LabyrinthConfig`` may be passed instead of a path, e.g. to point at another DB.
+    """
+
+    def __init__(
+        self,
+        config_path: str | Path | LabyrinthConfig = "labyrinth.yaml",
+        *,
+        audit_path: str = DEFAULT_AUDIT_PATH,
+        rate_limit_store: str = "memory",
+        clock=time.time,
+    ):
+        if isinstance(config_path, LabyrinthConfig):
+            self.config: LabyrinthConfig = config_path
+        else:
+            self.config = load_master_config(config_path)
+        self.audit_path = audit_path
+        self._clock = clock
+        self._lock = threading.RLock()
+        self.tracer = query_tracer(self.config)
+        self.conn = connect(self.config.db_path, check_same_thread=False, tracer=self.tracer)
+        init_db(self.conn)
+        self.scoring = engine_for(self.config.leaderboard)
+        ensure_scores(self.conn, self.scoring)
+        ensure_stats(self.conn)
+        if rate_limit_store == "sqlite":
+            self.rate_limiter: Any = SqliteRateLimiter(self.conn, self.config.rate_limit)
+        else:
+            self.rate_limiter = MemoryRateLimiter(self.config.rate_limit)
+        self._enabled_ids = {spec.id for spec in self.config.plugins if spec.enabled}
+        self._plugins: dict[str, LoadedPlugin] | None = None
+        self._guid_index: Mapping[bytes, str] = {}  # secret GUID digest -> challenge id, built with the plugins
+        # (kind, challenge id) -> rendered manifest or instructions; plugin configs never change after load.
+        self._responses: dict[tuple[str, str], CachedResponse] = {}
+        # name -> id; dropped on register and hard clear, rebuilt from the database on a miss.
+        self._agent_ids: dict[str, int] = {}
+        self.asset_problems: dict[str, list[str]] = {}
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> "Arena":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def plugins(self) -> dict[str, LoadedPlugin]:
+        """Loaded on first use so cheap calls (and throttled submits) never import plugins.
+
+        Loading also checks each challenge's indexed asset files (see ``verify_assets``).
+        """
+        if self._plugins is None:
+            with self._lock:
+                if self._plugins is None:
+                    plugins = load_plugins(self.config.plugins)
+                    for pid, p in plugins.items():
+                        p.instance.arena = self
+                        if self.config.state_dir:
+                            p.instance.state_dir = Path(self.config.state_dir) / pid
+                    self.asset_problems = self._verify_assets(plugins)
+                    self._guid_index = build_guid_index(plugins)
+                    self._plugins = plugins
+        return self._plugins
+
+    def _verify_assets(self, plugins: dict[str, LoadedPlugin]) -> dict[str, list[str]]:
+        root = Path(self.config.root)
+        problems = {pid: p.instance.verify_assets(p.cfg, root) for pid, p in plugins.items()}
+        return {pid: found for pid, found in problems.items() if found}
+
+    def verify_assets(self) -> dict[str, list[str]]:
+        """Challenges whose asset files are missing or changed since they were indexed."""
+        with self._lock:
+            self.asset_problems = self._verify_assets(self.plugins)
+            self._responses.clear()  # image manifests describe the files just checked
+            return self.asset_problems
+
+    def _audit(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            append_audit(event, self.audit_path)
+
+    def _plugin(self, challenge_id: str) -> LoadedPlugin:
+        if challenge_id not in self._enabled_ids:
+            raise UnknownChallenge(f"Unknown challenge: {challenge_id}")
+        plugin = self.plugins[challenge_id]
+        if challenge_id in self.asset_problems:
+            raise AssetIntegrityError(
+                f"Assets of {challenge_id} failed the integrity check: " + "; ".join(self.asset_problems[challenge_id])
+            )
+        return plugin
+
+    # --- agents ----------------------------------------------------------------
+
+    def register_agent(self, name: str) -> dict[str, Any]:
+        with self._lock:
+            try:
+                cur = self.conn.execute("INSERT INTO agents(name) VALUES (?)", (name,))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                raise ArenaError(f"Could not register agent '{name}': {e}") from e
+            self._agent_ids.pop(name, None)
+        self._audit({"event": "agent_register", "agent": name})
+        return {"id": int(cur.lastrowid), "name": name}
+
+    def import_agents(self, records: Iterable[AgentRecord | str], chunk_size: int = 500) -> ImportReport:
+        """Register agents in chunks of ``chunk_size``, each chunk in one transaction.
+
+        ``records`` are AgentRecords or "line N: reason" strings for unusable input rows.
+        Names that are already registered, or repeated in the input, are reported as
+        conflicts and left unchanged.
+        """
+        report = ImportReport()
+        seen: set[str] = set()
+        chunk: list[AgentRecord] = []
+
+        def flush() -> None:
+            if not chunk:
+                return
+            with self._lock:
+                conn = self.conn
+                if conn.in_transaction:
+                    conn.commit()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    marks = ",".join("?" * len(chunk))
+                    taken = {
+                        r[0] for r in conn.execute(f"SELECT name FROM agents WHERE name IN ({marks})", [a.name for a in chunk])
+                    }
+                    fresh = [a for a in chunk if a.name not in taken]
+                    conn.executemany(
+                        "INSERT INTO agents(name, meta_json) VALUES (?, ?)",
+                        [(a.name, json.dumps(a.meta, ensure_ascii=False) if a.meta else None) for a in fresh],
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                for a in fresh:
+                    self._agent_ids.pop(a.name, None)
+            report.conflicts.extend(a.name for a in chunk if a.name in taken)
+            report.created.extend(a.name for a in fresh)
+            with self._lock:
+                append_audit_many(({"event": "agent_register", "agent": a.name} for a in fresh), self.audit_path)
+            chunk.clear()
+
+        for record in records:
+            if isinstance(record, str):
+                report.invalid.append(record)
+            elif record.name in seen:
+                report.conflicts.append(record.name)
+            else:
+                seen.add(record.name)
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    flush()
+        flush()
+        return report
+
+    def list_agents(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = fetch_all(self.conn, "SELECT id, name, created_at FROM agents ORDER BY id ASC")
+        return [{"id": int(r["id"]), "name": r["name"], "created_at": r["created_at"]} for r in rows]
+
+    def agent_id(self, name: str) -> int:
+        cached = self._agent_ids.get(name)
+        if cached is not None:
+            return cached
+        with self._lock:
+            row = fetch_one(self.conn, "SELECT id, name FROM agents WHERE name = ?", (name,))
+            if not row:
+                raise UnknownAgent(f"Unknown agent '{name}'.")
+            self._agent_ids[name] = int(row["id"])
+        return int(row["id"])
+
+    def clear_score(self, name: str, hard: bool = False) -> None:
+        with self._lock:
+            agent_id = self.agent_id(name)
+            solved = fetch_one(self.conn, "SELECT 1 FROM runs WHERE agent_id = ? AND status = 'success' LIMIT 1", (agent_id,))
+            self.conn.execute("DELETE FROM runs WHERE agent_id = ?", (agent_id,))
+            self.conn.execute("DELETE FROM scores WHERE agent_id = ?", (agent_id,))
+            self.conn.execute("DELETE FROM score_history WHERE agent_id = ?", (agent_id,))
+            forget_agent(self.conn, agent_id)
+            self.conn.execute("DELETE FROM idempotency WHERE agent_id = ?", (agent_id,))
+            if hard:
+                self.conn.execute("DELETE FROM agents WHERE id = ?", (agent_id,))
+                self._agent_ids.pop(name, None)
+            self.conn.commit()
+            if solved and self.scoring.cross_agent:
+                # Other agents may have been decayed against this agent's first solve.
+                recompute_scores(self.conn, self.scoring)
+        self._reset_plugins(name)
+        self._audit({"event": "agent_clear_score_hard" if hard else "agent_clear_score", "agent": name})
+
+    def agent_points_by_challenge(self, name: str) -> dict[str, int]:
+        """Points per challenge under the configured score mode."""
+        with self._lock:
+            agent_id = self.agent_id(name)
+            rows = fetch_all(
+                self.conn,
+                "SELECT challenge_id, value FROM scores WHERE agent_id = ?",
+                (agent_id,),
+            )
+        return {r["challenge_id"]: int(round(r["value"])) for r in rows}
+
+    def score_history(self, name: str, resolution: int, since: str | None = None) -> list[dict[str, Any]]:
+        """Cumulative score at the end of each ``resolution``-second bucket the agent submitted in."""
+        resolutions = self.config.leaderboard.history_resolutions
+        if resolution not in resolutions:
+            raise ArenaError(
+                f"No score history at {resolution}s; configured resolutions: {', '.join(f'{r}s' for r in resolutions)}"
+            )
+        with self._lock:
+            return score_history(self.conn, self.agent_id(name), resolution, since)
+
+    # --- rounds ----------------------------------------------------------------
+
+    @property
+    def default_template_path(self) -> Path:
+        return Path(self.config.db_path).with_suffix(".template.db")
+
+    def _reset_plugins(self, agent_name: str | None = None) -> None:
+        for p in self.plugins.values():
+            p.instance.reset(p.cfg, agent_name)
+
+    def _truncate_runs(self, conn: sqlite3.Connection) -> int:
+        # Unqualified DELETEs let SQLite drop the table pages wholesale.
+        count = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        for table in ("runs", "scores", "score_history", "challenge_stats", "challenge_progress", "idempotency"):
+            conn.execute(f"DELETE FROM {table}")
+        return int(count)
+
+    def clear_all_scores(self) -> int:
+        """Delete every run and score (agents stay), compact the file and reset plugin state."""
+        with self._lock:
+            conn = self.conn
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                count = self._truncate_runs(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            conn.execute("VACUUM")
+        self._reset_plugins()
+        self._audit({"event": "arena_clear_all", "runs": count})
+        return count
+
+    def snapshot(self, path: str | Path | None = None) -> Path:
+        """Write a template of this arena (schema and agents, no runs) with the backup API."""
+        target = Path(path) if path else self.default_template_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.unlink(missing_ok=True)
+        dst = sqlite3.connect(tmp)
+        try:
+            with self._lock:
+                if self.conn.in_transaction:
+                    self.conn.commit()
+                self.conn.backup(dst)
+            self._truncate_runs(dst)
+            dst.execute("DELETE FROM rate_limits")
+            dst.commit()
+            dst.execute("VACUUM")
+        finally:
+            dst.close()
+        os.replace(tmp, target)
+        return target
+
+    def restore(self, path: str | Path | None = None) -> list[str]:
+        """Replace the live database with a snapshot in one backup step. Returns the agents it holds."""
+        source = Path(path) if path else self.default_template_path
+        if not source.exists():
+            raise ArenaError(f"Snapshot not found: {source}")
+        src = sqlite3.connect(f"file:{source.resolve()}?mode=ro", uri=True)
+        try:
+            with self._lock:
+                if self.conn.in_transaction:
+                    self.conn.commit()
+                src.backup(self.conn)
+                self._agent_ids.clear()
+                # Buckets belong to the replaced agents, not the restored ones.
+                self.rate_limiter.reset()
+                init_db(self.conn)
+                ensure_scores(self.conn, self.scoring)
+        finally:
+            src.close()
+        self._reset_plugins()
+        agents = [a["name"] for a in self.list_agents()]
+        self._audit({"event": "arena_restore", "snapshot": str(source), "agents": agents})
+        return agents
+
+    # --- challenges ------------------------------------------------------------
+
+    def challenge_for_guid(self, guid: str) -> str | None:
+        """The enabled challenge whose secret GUID this is, or None; one dict lookup."""
+        self.plugins  # the index is built with them
+        return find_challenge_by_guid(self._guid_index, guid)
+
+    def list_challenges(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "id": pid,
+                "name": getattr(p.instance, "name", pid),
+                "guid": p.meta.display_guid,
+                "points": p.meta.on_success,
+                "path": p.spec.path,
+            }
+            for pid, p in self.plugins.items()
+        ]
+
+    def challenge_stats(self, challenge_id: str | None = None) -> list[ChallengeStats]:
+        """Difficulty numbers per challenge (only challenges with at least one run)."""
+        if challenge_id is not None and challenge_id not in self._enabled_ids:
+            raise UnknownChallenge(f"Unknown challenge: {challenge_id}")
+        with self._lock:
+            return challenge_stats(self.conn, challenge_id)
+
+    def backfill_stats(self) -> int:
+        """Rebuild the challenge stats from every recorded run; returns the runs read."""
+        with self._lock:
+            return backfill_stats(self.conn)
+
+    def _response(self, kind: str, challenge_id: str) -> CachedResponse:
+        p = self._plugin(challenge_id)
+        cached = self._responses.get((kind, challenge_id))
+        if cached is None:
+            with self._lock:
+                cached = self._responses.get((kind, challenge_id))
+                if cached is None:
+                    if kind == "manifest":
+                        payload: Any = p.instance.get_manifest(p.cfg)
+                    else:
+                        payload = {
+                            "id": challenge_id,
+                            "name": getattr(p.instance, "name", challenge_id),
+                            "instructions": p.instance.get_instructions(p.cfg),
+                        }
+                    cached = self._responses[(kind, challenge_id)] = CachedResponse.render(payload)
+        return cached
+
+    def manifest_response(self, challenge_id: str) -> CachedResponse:
+        """The challenge manifest as JSON bytes with an ETag, rendered once per Arena."""
+        return self._response("manifest", challenge_id)
+
+    def instructions_response(self, challenge_id: str) -> CachedResponse:
+        """``{"id", "name", "instructions"}`` as JSON bytes with an ETag, rendered once per Arena."""
+        return self._response("instructions", challenge_id)
+
+    def manifest(self, challenge_id: str) -> dict[str, Any]:
+        return json.loads(self.manifest_response(challenge_id).body)
+
+    def instructions(self, challenge_id: str) -> str:
+        return json.loads(self.instructions_response(challenge_id).body)["instructions"]
+
+    def submit(
+        self,
+        challenge_id: str,
+        agent_name: str,
+        submission: dict[str, Any] | str,
+        idempotency_key: str | None = None,
+    ) -> ChallengeResult:
+        """Run a submission and record it. The returned result carries the points awarded.
+
+        The key comes from ``idempotency_key`` or the submission's ``idempotency_key`` field
+        (which is not passed to the plugin). A repeated key returns the stored result.
+        """
+        if challenge_id not in self._enabled_ids:
+            raise UnknownChallenge(f"Unknown challenge: {challenge_id}")
+
+        agent_id = self.agent_id(agent_name)
+
+        if isinstance(submission, str):
+            try:
+                submission = json.loads(submission)
+            except ValueError as e:
+                raise InvalidSubmission(f"Invalid JSON payload: {e}") from e
+        if not isinstance(submission, dict):
+            raise InvalidSubmission("Invalid JSON payload: submission must be a JSON object")
+
+        key = idempotency_key
+        if "idempotency_key" in submission:
+            submission = dict(submission)
+            in_payload = submission.pop("idempotency_key")
+            key = key or in_payload
+        if key is not None and (not isinstance(key, str) or not key or len(key) > idempotency.MAX_KEY_LENGTH):
+            raise InvalidSubmission(
+                f"idempotency_key must be a non-empty string of at most {idempotency.MAX_KEY_LENGTH} characters"
+            )
+        req_hash = idempotency.request_hash(challenge_id, submission) if key else ""
+        if key:
+            stored = self._stored_result(agent_id, agent_name, key, challenge_id, req_hash)
+            if stored is not None:
+                return stored
+
+        # Throttle before any plugin code is loaded or run.
+        with self._lock:
+            retry_after = self.rate_limiter.acquire(agent_name, challenge_id)
+        if retry_after > 0:
+            raise RateLimited(f"Rate limited: retry '{challenge_id}' in {retry_after:.2f}s.", retry_after)
+
+        p = self._plugin(challenge_id)
+        try:
+            result = p.instance.submit(agent_name, submission, p.cfg)
+        except SubmissionBusy as e:
+            raise ChallengeBusy(f"{e} Nothing was recorded; retry '{challenge_id}'.") from e
+
+        submitted_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            conn = self.conn
+            if conn.in_transaction:
+                conn.commit()
+            # The repeat check, run insert and score update must not interleave with other processes.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if key:
+                    # A concurrent retry with the same key may have finished first.
+                    raced = idempotency.lookup(conn, agent_id, key, self._clock(), self.config.idempotency_ttl_seconds)
+                    if raced is not None:
+                        conn.rollback()
+                        _check_same_request(raced, key, challenge_id, req_hash)
+                        return raced.result
+                # Repeat detection (Phase 0: only award points once per agent+challenge if plugin config says on_repeat=0)
+                prior = fetch_one(
+                    conn,
+                    "SELECT id FROM runs WHERE agent_id = ? AND challenge_id = ? AND status = 'success' LIMIT 1",
+                    (agent_id, challenge_id),
+                )
+                points_awarded = result.points
+                if result.status == "fail":
+                    points_awarded = -abs(p.meta.on_success)
+                elif prior and p.meta.on_repeat == 0:
+                    points_awarded = 0
+
+                conn.execute(
+                    "INSERT INTO runs(agent_id, challenge_id, status, points, submitted_at, evidence_json) VALUES (?,?,?,?,?,?)",
+                    (
+                        agent_id,
+                        challenge_id,
+                        result.status,
+                        int(points_awarded),
+                        submitted_at,
+                        json.dumps(result.evidence or {}, ensure_ascii=False),
+                    ),
+                )
+                record_run(conn, self.scoring, agent_id, challenge_id, result.status, int(points_awarded), submitted_at)
+                record_attempt(conn, agent_id, challenge_id, result.status, submitted_at)
+                awarded = ChallengeResult(
+                    status=result.status,
+                    points=int(points_awarded),
+                    message=result.message,
+                    evidence=result.evidence,
+                )
+                if key:
+                    idempotency.store(
+                        conn,
+                        agent_id,
+                        key,
+                        challenge_id,
+                        req_hash,
+                        awarded,
+                        self._clock(),
+                        self.config.idempotency_ttl_seconds,
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        self._audit(
+            {
+                "event": "challenge_submit",
+                "agent": agent_name,
+                "challenge_id": challenge_id,
+                "status": result.status,
+                "points": points_awarded,
+                "message": result.message,
+                **({"idempotency_key": key} if key else {}),
+            }
+        )
+        return awarded
+
+    def _stored_result(
+        self, agent_id: int, agent_name: str, key: str, challenge_id: str, req_hash: str
+    ) -> ChallengeResult | None:
+        with self._lock:
+            stored = idempotency.lookup(self.conn, agent_id, key, self._clock(), self.config.idempotency_ttl_seconds)
+        if stored is None:
+            return None
+        _check_same_request(stored, key, challenge_id, req_hash)
+        self._audit(
+            {
+                "event": "challenge_submit_repeat",
+                "agent": agent_name,
+                "challenge_id": challenge_id,
+                "idempotency_key": key,
+            }
+        )
+        return stored.result
+
+    def query_stats(self) -> list[dict[str, Any]]:
+        """Per-statement SQL counters since this Arena opened (empty unless db.trace is enabled)."""
+        return self.tracer.stats() if self.tracer is not None else []
+
+    # --- scoring ---------------------------------------------------------------
+
+    def leaderboard(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return lb(self.conn, self.config.leaderboard.tie_break)
@@ -0,0 +1,250 @@
+"""Content-addressed asset pack for challenge files.
+
+Challenges such as the quizzes and treasure hunts ship many tiny files under
+``files/`` and ``answers/``. ``build_pack`` stores them in one file next to the
+master config::
+
+    b"LABYPAK1" | index offset (u64) | index length (u64) | blobs ... | index (JSON)
+
+Each distinct file content is stored once and named by its sha256. The index maps
+root-relative paths to those blobs. ``AssetPack`` maps the file into memory and
+serves reads as slices. ``AssetStore`` is what plugins use: it reads a path from the
+pack when the pack has it and falls back to the loose file otherwise. ``extract``
+writes the loose layout back for agents that browse the files themselves.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+PACK_NAME = "labyrinth_assets.pack"
+MAGIC = b"LABYPAK1"
+_HEADER = struct.Struct("<8sQQ")
+# Subfolders of a plugin that hold challenge content, plus top-level content files.
+ASSET_DIRS = ("files", "answers")
+ASSET_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".txt")
+
+
+class AssetPackError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class PackStats:
+    files: int
+    blobs: int
+    bytes: int
+
+
+def asset_files(plugin_dir: Path) -> Iterator[Path]:
+    """Loose files of one plugin that belong in the pack."""
+    if not plugin_dir.is_dir():
+        return
+    for p in sorted(plugin_dir.iterdir()):
+        if p.is_file() and p.suffix.lower() in ASSET_SUFFIXES:
+            yield p
+    for name in ASSET_DIRS:
+        base = plugin_dir / name
+        if base.is_dir():
+            yield from sorted(p for p in base.rglob("*") if p.is_file())
+
+
+def build_pack(root: Path, plugin_dirs: Iterable[Path], out: Path | None = None) -> PackStats:
+    """Pack the asset files of ``plugin_dirs`` (which must sit under ``root``)."""
+    root = Path(root).resolve()
+    out = Path(out) if out is not None else root / PACK_NAME
+    files: dict[str, str] = {}
+    blobs: dict[str, list[int]] = {}
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(_HEADER.pack(MAGIC, 0, 0))
+            for plugin_dir in plugin_dirs:
+                for p in asset_files(Path(plugin_dir).resolve()):
+                    data = p.read_bytes()
+                    digest = hashlib.sha256(data).hexdigest()
+                    if digest not in blobs:
+                        blobs[digest] = [f.tell(), len(data)]
+                        f.write(data)
+                    files[p.relative_to(root).as_posix()] = digest
+            index = json.dumps({"version": 1, "blobs": blobs, "files": files}, sort_keys=True).encode("utf-8")
+            index_offset = f.tell()
+            f.write(index)
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, index_offset, len(index)))
+        os.replace(tmp, out)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return PackStats(files=len(files), blobs=len(blobs), bytes=sum(size for _, size in blobs.values()))
+
+
+class AssetPack:
+    """Read-only, memory-mapped view of a pack file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, offset, length = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise AssetPackError(f"{self.path} is not an asset pack")
+            index = json.loads(self._mm[offset : offset + length])
+        except (struct.error, ValueError) as e:
+            self._mm.close()
+            raise AssetPackError(f"{self.path}: unreadable asset pack ({e})") from e
+        self._blobs: dict[str, list[int]] = index["blobs"]
+        self.files: dict[str, str] = index["files"]
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "AssetPack":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.files
+
+    def keys(self, prefix: str = "") -> list[str]:
+        """Packed paths under ``prefix`` (a root-relative folder, or "" for all)."""
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        return sorted(k for k in self.files if k.startswith(prefix))
+
+    def sha256(self, key: str) -> str:
+        return self.files[key]
+
+    def view(self, key: str) -> memoryview:
+        """Zero-copy view of one file; only valid while the pack is open."""
+        offset, size = self._blobs[self.files[key]]
+        return memoryview(self._mm)[offset : offset + size]
+
+    def read(self, key: str) -> bytes:
+        offset, size = self._blobs[self.files[key]]
+        return self._mm[offset : offset + size]
+
+    def verify(self) -> list[str]:
+        """Packed paths whose blob no longer matches its sha256."""
+        bad = {d for d, (o, s) in self._blobs.items() if hashlib.sha256(self._mm[o : o + s]).hexdigest() != d}
+        return sorted(k for k, d in self.files.items() if d in bad)
+
+    def extract(self, root: Path, prefix: str = "") -> int:
+        """Write packed files under ``prefix`` to their place below ``root``.
+
+        Files already on disk with the same content are left alone. Returns the number written.
+        """
+        written = 0
+        for key in self.keys(prefix):
+            dest = Path(root) / key
+            if dest.is_file() and dest.stat().st_size == self._blobs[self.files[key]][1]:
+                if hashlib.sha256(dest.read_bytes()).hexdigest() == self.files[key]:
+                    continue
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(dest.name + ".tmp")
+            tmp.write_bytes(self.view(key))
+            os.replace(tmp, dest)
+            written += 1
+        return written
+
+
+_open_packs: dict[Path, tuple[tuple[int, int], AssetPack]] = {}
+
+
+def open_pack(path: str | Path) -> AssetPack | None:
+    """Shared pack for ``path``, reopened when the file changes; None if there is none."""
+    path = Path(path).resolve()
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _open_packs.pop(path, None)
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _open_packs.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    pack = AssetPack(path)
+    _open_packs[path] = (stamp, pack)
+    return pack
+
+
+class AssetStore:
+    """Challenge files below ``root``, read from the pack when packed and from disk otherwise."""
+
+    def __init__(self, root: str | Path, pack: AssetPack | None = None):
+        self.root = Path(root).resolve()
+        self.pack = pack
+
+    def _key(self, path: str | Path) -> str | None:
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(self.root)
+            except ValueError:
+                return None  # outside the tree; only the loose file can exist
+        return path.as_posix()
+
+    def _packed(self, path: str | Path) -> str | None:
+        key = self._key(path)
+        if self.pack is not None and key is not None and key in self.pack:
+            return key
+        return None
+
+    def exists(self, path: str | Path) -> bool:
+        return self._packed(path) is not None or (self.root / path).is_file()
+
+    def read_bytes(self, path: str | Path) -> bytes:
+        key = self._packed(path)
+        if key is not None:
+            return self.pack.read(key)  # type: ignore[union-attr]
+        return (self.root / path).read_bytes()
+
+    def read_text(self, path: str | Path) -> str:
+        return self.read_bytes(path).decode("utf-8", errors="ignore")
+
+    def files(self, folder: str | Path) -> list[Path]:
+        """Files below ``folder``; the pack's listing when it holds any, else a directory walk."""
+        key = self._key(folder)
+        packed = self.pack.keys(key) if self.pack is not None and key is not None else []
+        if packed:
+            return [self.root / k for k in packed]
+        base = self.root / folder
+        if not base.is_dir():
+            return []
+        return sorted(p for p in base.rglob("*") if p.is_file())
+
+    def find_text(self, folder: str | Path, needle: str) -> list[Path]:
+        """Files below ``folder`` whose text contains ``needle``."""
+        if not needle:
+            return []
+        return [p for p in self.files(folder) if needle in self.read_text(p)]
+
+
+def asset_store(root: str | Path) -> AssetStore:
+    return AssetStore(root, open_pack(Path(root) / PACK_NAME))
+
+
+def prune_loose(root: Path, pack: AssetPack, prefix: str = "") -> int:
+    """Delete loose files identical to their packed copy, then any folders left empty."""
+    root = Path(root).resolve()
+    removed = 0
+    dirs: set[Path] = set()
+    for key in pack.keys(prefix):
+        p = root / key
+        if p.is_file() and hashlib.sha256(p.read_bytes()).hexdigest() == pack.sha256(key):
+            p.unlink()
+            removed += 1
+            dirs.update(parent for parent in p.parents if parent != root and root in parent.parents)
+    for d in sorted(dirs, key=lambda d: len(d.parts), reverse=True):
+        if d.is_dir() and not any(d.iterdir()):
+            d.rmdir()
+    return removed
@@ -1,14 +1,318 @@
 from __future__ import annotations
 
+import bisect
+import gzip
+import hashlib
 import json
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
-from datetime import datetime
+from typing import Any, BinaryIO, Iterable, Iterator
 
+from labyrinth.core.config import LeaderboardConfig
+from labyrinth.core.scoring import ScoreEngine, engine_for, recompute_scores
+from labyrinth.core.stats import backfill_stats
 
-def append_audit(event: dict[str, Any], path: str = "./labyrinth_audit.jsonl") -> None:
+
+DEFAULT_AUDIT_PATH = "./labyrinth_audit.jsonl"
+INDEX_EVERY = 1000
+INDEX_HEAD_BYTES = 4096
+
+
+def append_audit(event: dict[str, Any], path: str = DEFAULT_AUDIT_PATH) -> None:
     event = dict(event)
     event["ts"] = datetime.utcnow().isoformat() + "Z"
     p = Path(path)
     with p.open("a", encoding="utf-8") as f:
         f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def append_audit_many(events: Iterable[dict[str, Any]], path: str = DEFAULT_AUDIT_PATH) -> None:
+    """Append several events with one open and write."""
+    ts = datetime.utcnow().isoformat() + "Z"
+    lines = [json.dumps({**event, "ts": ts}, ensure_ascii=False) + "\n" for event in events]
+    if lines:
+        with Path(path).open("a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+
+# --- reading -----------------------------------------------------------------
+
+
+def ts_key(ts: str) -> str:
+    """Sortable form of an audit timestamp (isoformat drops zero microseconds)."""
+    ts = ts.rstrip("Z")
+    head, _, frac = ts.partition(".")
+    return f"{head}.{frac.ljust(6, '0')[:6]}"
+
+
+_RELATIVE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd])$")
+_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_time(value: str, now: datetime | None = None) -> str:
+    """Turn an ISO timestamp or a relative age like ``1h``/``30m`` into a ts_key.
+
+    Timestamps with an offset are converted to UTC, which is what the log records.
+    """
+    value = value.strip()
+    match = _RELATIVE_RE.match(value)
+    if match:
+        now = now or datetime.utcnow()
+        delta = timedelta(**{_UNITS[match.group(2)]: float(match.group(1))})
+        return ts_key((now - delta).isoformat())
+    dt = datetime.fromisoformat(value.rstrip("Z"))
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts_key(dt.isoformat())
+
+
+def audit_segments(path: str | Path) -> list[Path]:
+    """Rotated segments (``.N`` / ``.N.gz``, oldest first) followed by the live log."""
+    live = Path(path)
+    rotated: list[tuple[int, Path]] = []
+    prefix = live.name + "."
+    if live.parent.exists():
+        for p in live.parent.iterdir():
+            if not p.name.startswith(prefix):
+                continue
+            suffix = p.name[len(prefix):]
+            if suffix.endswith(".gz"):
+                suffix = suffix[:-3]
+            if suffix.isdigit():
+                rotated.append((int(suffix), p))
+    segments = [p for _, p in sorted(rotated, reverse=True)]
+    if live.exists():
+        segments.append(live)
+    return segments
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + ".idx")
+
+
+def _identity(segment: Path, size: int) -> dict[str, Any]:
+    """What ties an index to one file: device, inode and a hash of its first bytes."""
+    st = segment.stat()
+    head = min(size, INDEX_HEAD_BYTES)
+    with segment.open("rb") as f:
+        digest = hashlib.sha256(f.read(head)).hexdigest()
+    return {"dev": st.st_dev, "ino": st.st_ino, "head": head, "head_sha256": digest}
+
+
+def _read_index(segment: Path) -> dict[str, Any] | None:
+    idx_path = _index_path(segment)
+    if not idx_path.exists():
+        return None
+    try:
+        data = json.loads(idx_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    size = int(data.get("size", 0))
+    if size > segment.stat().st_size:
+        return None  # truncated since indexing
+    # A rotated-away or rewritten log can regrow past the old size; its offsets mean nothing.
+    identity = data.get("identity")
+    if not isinstance(identity, dict) or _identity(segment, int(identity.get("head", 0))) != identity:
+        return None
+    return data
+
+
+def build_audit_index(path: str | Path, every: int = INDEX_EVERY) -> int:
+    """Write ``<segment>.idx`` sidecars (ts_key -> byte offset) for uncompressed segments.
+
+    Existing indexes are extended from where they stopped. Returns the number of entries added.
+    """
+    added = 0
+    for segment in audit_segments(path):
+        if segment.suffix == ".gz":
+            continue
+        data = _read_index(segment) or {"size": 0, "every": every, "entries": []}
+        entries: list[list[Any]] = data["entries"]
+        offset = int(data["size"])
+        count = int(data.get("count", 0))
+        with segment.open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                if count % every == 0:
+                    try:
+                        entries.append([ts_key(json.loads(line)["ts"]), offset])
+                        added += 1
+                    except (ValueError, KeyError):
+                        pass
+                count += 1
+                offset += len(line)
+        data.update({"size": offset, "count": count, "entries": entries, "identity": _identity(segment, offset)})
+        _index_path(segment).write_text(json.dumps(data), encoding="utf-8")
+    return added
+
+
+def _open_segment(segment: Path) -> BinaryIO:
+    if segment.suffix == ".gz":
+        return gzip.open(segment, "rb")  # type: ignore[return-value]
+    return segment.open("rb")
+
+
+def _seek_offset(segment: Path, since: str | None) -> int:
+    if since is None or segment.suffix == ".gz":
+        return 0
+    data = _read_index(segment)
+    if not data or not data["entries"]:
+        return 0
+    keys = [e[0] for e in data["entries"]]
+    pos = bisect.bisect_left(keys, since) - 1
+    return int(data["entries"][pos][1]) if pos >= 0 else 0
+
+
+def _needle(field: str, value: str) -> bytes:
+    return f'"{field}": {json.dumps(value, ensure_ascii=False)}'.encode("utf-8")
+
+
+def iter_audit(
+    path: str | Path = DEFAULT_AUDIT_PATH,
+    event: str | None = None,
+    agent: str | None = None,
+    challenge_id: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream audit events across all segments, oldest first.
+
+    ``since``/``until`` are ts_key strings (see ``parse_time``); ``until`` is exclusive.
+    """
+    wanted = {"event": event, "agent": agent, "challenge_id": challenge_id}
+    filters = {k: v for k, v in wanted.items() if v is not None}
+    needles = [_needle(k, v) for k, v in filters.items()]
+    for segment in audit_segments(path):
+        with _open_segment(segment) as f:
+            offset = _seek_offset(segment, since)
+            if offset:
+                f.seek(offset)
+            for line in f:
+                # Cheap substring check before paying for json.loads.
+                if needles and not all(n in line for n in needles):
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if any(record.get(k) != v for k, v in filters.items()):
+                    continue
+                if since is not None or until is not None:
+                    key = ts_key(str(record.get("ts", "")))
+                    if since is not None and key < since:
+                        continue
+                    if until is not None and key >= until:
+                        continue
+                yield record
+
+
+# --- replay ------------------------------------------------------------------
+
+
+def _sql_ts(ts: str | None) -> str | None:
+    if not ts:
+        return None
+    return ts_key(ts)[:19].replace("T", " ")
+
+
+def replay_audit(
+    conn: sqlite3.Connection,
+    events: Iterable[dict[str, Any]],
+    batch_size: int = 5000,
+    engine: ScoreEngine | None = None,
+) -> dict[str, int]:
+    """Rebuild ``runs`` (and any missing agents) from audit events in one transaction.
+
+    Existing runs are discarded, and so are stored idempotency results, which would
+    otherwise replay submissions the rebuilt runs no longer hold. Agents seen in the
+    log are created if missing and agents removed with a hard clear are deleted again.
+    ``arena_clear_all`` drops every run so far and ``arena_restore`` also keeps only
+    the agents the snapshot held.
+    Scores are then recomputed with ``engine`` (the default ``sum`` mode if not given)
+    and the challenge stats rebuilt.
+    """
+    counts = {"events": 0, "agents": 0, "runs": 0, "clears": 0}
+    agent_ids: dict[str, int] = {
+        row[1]: int(row[0]) for row in conn.execute("SELECT id, name FROM agents")
+    }
+    pending: list[tuple[Any, ...]] = []
+
+    def flush() -> None:
+        if pending:
+            conn.executemany(
+                "INSERT INTO runs(agent_id, challenge_id, status, points, submitted_at, evidence_json) "
+                "VALUES (?,?,?,?,COALESCE(?, datetime('now')),?)",
+                pending,
+            )
+            counts["runs"] += len(pending)
+            pending.clear()
+
+    def ensure_agent(name: str, ts: str | None) -> int:
+        if name not in agent_ids:
+            cur = conn.execute(
+                "INSERT INTO agents(name, created_at) VALUES (?, COALESCE(?, datetime('now')))",
+                (name, _sql_ts(ts)),
+            )
+            agent_ids[name] = int(cur.lastrowid)
+            counts["agents"] += 1
+        return agent_ids[name]
+
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM runs")
+        conn.execute("DELETE FROM idempotency")
+        for record in events:
+            counts["events"] += 1
+            kind = record.get("event")
+            if kind in ("arena_clear_all", "arena_restore"):
+                flush()
+                counts["clears"] += 1
+                conn.execute("DELETE FROM runs")
+                if kind == "arena_restore":
+                    keep = set(record.get("agents") or ())
+                    for gone in [n for n in agent_ids if n not in keep]:
+                        conn.execute("DELETE FROM agents WHERE id = ?", (agent_ids.pop(gone),))
+                    for kept in sorted(keep):
+                        ensure_agent(kept, record.get("ts"))
+                continue
+            name = record.get("agent")
+            if not isinstance(name, str):
+                continue
+            ts = record.get("ts")
+            if kind == "agent_register":
+                ensure_agent(name, ts)
+            elif kind == "challenge_submit":
+                pending.append(
+                    (
+                        ensure_agent(name, ts),
+                        str(record.get("challenge_id", "")),
+                        str(record.get("status", "fail")),
+                        int(record.get("points", 0)),
+                        _sql_ts(ts),
+                        json.dumps({"replayed": True, "message": record.get("message")}, ensure_ascii=False),
+                    )
+                )
+                if len(pending) >= batch_size:
+                    flush()
+            elif kind in ("agent_clear_score", "agent_clear_score_hard"):
+                flush()
+                counts["clears"] += 1
+                agent_id = agent_ids.get(name)
+                if agent_id is None:
+                    continue
+                conn.execute("DELETE FROM runs WHERE agent_id = ?", (agent_id,))
+                if kind == "agent_clear_score_hard":
+                    conn.execute("DELETE FROM agents WHERE id = ?", (agent_id,))
+                    del agent_ids[name]
+        flush()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    recompute_scores(conn, engine or engine_for(LeaderboardConfig()))
+    backfill_stats(conn)
+    return counts
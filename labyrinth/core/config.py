@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 import yaml
@@ -12,12 +13,64 @@ class PluginSpec:
     path: str
     enabled: bool
     config_path: str
+    kind: str | None = None
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    enabled: bool = False
+    capacity: float = 10.0
+    refill_per_second: float = 1.0
+    # challenge id -> (capacity, refill_per_second)
+    overrides: dict[str, tuple[float, float]] = field(default_factory=dict)
+
+    def limits_for(self, challenge_id: str) -> tuple[float, float]:
+        return self.overrides.get(challenge_id, (self.capacity, self.refill_per_second))
+
+
+@dataclass(frozen=True)
+class LeaderboardConfig:
+    score_mode: str = "sum"
+    tie_break: str = "earliest"
+    # Used by score_mode "decay": a solve is worth half as much this long after the first solve.
+    decay_half_life_hours: float = 24.0
+    # Used by score_mode "penalized": points lost per failed attempt before the solve.
+    attempt_penalty: float = 2.0
+    # Bucket sizes, in seconds, of the per-agent cumulative score history.
+    history_resolutions: tuple[int, ...] = (60, 3600)
+
+    def signature(self) -> str:
+        """Everything that changes stored scores and history (tie_break only changes ordering)."""
+        if self.score_mode == "decay":
+            mode = f"decay:{self.decay_half_life_hours:g}"
+        elif self.score_mode == "penalized":
+            mode = f"penalized:{self.attempt_penalty:g}"
+        else:
+            mode = self.score_mode
+        return f"{mode}|history:{','.join(map(str, self.history_resolutions))}"
+
+
+@dataclass(frozen=True)
+class QueryTraceConfig:
+    enabled: bool = False
+    # Statements at or over this many milliseconds go to slow_query_log with their query plan.
+    slow_query_ms: float = 50.0
+    slow_query_log: str = "./labyrinth_slow_queries.jsonl"
 
 
 @dataclass(frozen=True)
 class LabyrinthConfig:
     db_path: str
     plugins: list[PluginSpec]
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    leaderboard: LeaderboardConfig = field(default_factory=LeaderboardConfig)
+    # How long a submission's idempotency_key keeps returning the stored result.
+    idempotency_ttl_seconds: float = 86400.0
+    query_trace: QueryTraceConfig = field(default_factory=QueryTraceConfig)
+    # Folder of the master config; relative asset paths in plugin configs start here.
+    root: str = "."
+    # Where plugins keep per-agent files (``<state_dir>/<plugin id>``); None keeps them in each plugin's folder.
+    state_dir: str | None = None
 
 
 def load_yaml(path: str | Path) -> dict[str, Any]:
@@ -28,6 +81,98 @@ def load_yaml(path: str | Path) -> dict[str, Any]:
         return yaml.safe_load(f) or {}
 
 
+def _load_rate_limit(raw: dict[str, Any]) -> RateLimitConfig:
+    if not raw:
+        return RateLimitConfig()
+    capacity = float(raw.get("capacity", 10))
+    refill = float(raw.get("refill_per_second", 1))
+    overrides: dict[str, tuple[float, float]] = {}
+    for challenge_id, item in (raw.get("challenges") or {}).items():
+        item = item or {}
+        overrides[str(challenge_id)] = (
+            float(item.get("capacity", capacity)),
+            float(item.get("refill_per_second", refill)),
+        )
+    return RateLimitConfig(
+        enabled=bool(raw.get("enabled", True)),
+        capacity=capacity,
+        refill_per_second=refill,
+        overrides=overrides,
+    )
+
+
+_DURATION_RE = re.compile(r"^(\d+)\s*([smhd]?)$")
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(value: str | int) -> int:
+    """Seconds in a duration such as ``90``, ``30s``, ``1m``, ``1h`` or ``1d``."""
+    match = _DURATION_RE.match(str(value).strip().lower())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid duration {value!r}; use a positive number with s, m, h or d")
+    return int(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def _load_leaderboard(raw: dict[str, Any]) -> LeaderboardConfig:
+    defaults = LeaderboardConfig()
+    resolutions = raw.get("history_resolutions")
+    return LeaderboardConfig(
+        score_mode=str(raw.get("score_mode", defaults.score_mode)).lower(),
+        tie_break=str(raw.get("tie_break", defaults.tie_break)).lower(),
+        decay_half_life_hours=float(raw.get("decay_half_life_hours", defaults.decay_half_life_hours)),
+        attempt_penalty=float(raw.get("attempt_penalty", defaults.attempt_penalty)),
+        history_resolutions=(
+            tuple(sorted({parse_duration(r) for r in resolutions}))
+            if resolutions is not None
+            else defaults.history_resolutions
+        ),
+    )
+
+
+def _load_query_trace(raw: dict[str, Any], root: Path) -> QueryTraceConfig:
+    if not raw:
+        return QueryTraceConfig()
+    defaults = QueryTraceConfig()
+    log = str(raw.get("slow_query_log", defaults.slow_query_log))
+    if not Path(log).is_absolute():
+        log = str((root / log).resolve())
+    return QueryTraceConfig(
+        enabled=bool(raw.get("enabled", True)),
+        slow_query_ms=float(raw.get("slow_query_ms", defaults.slow_query_ms)),
+        slow_query_log=log,
+    )
+
+
+def plugin_spec_from_item(item: dict[str, Any], root: Path) -> PluginSpec:
+    plugin_path = item.get("path")
+    if not plugin_path:
+        module = item.get("module", "")
+        if isinstance(module, str) and module:
+            mod_path = module.split(":", 1)[0]
+            # Convert "labyrinth.plugins.foo.plugin" -> "labyrinth/plugins/foo"
+            parts = mod_path.split(".")
+            if len(parts) >= 3:
+                plugin_path = str(Path(*parts[:-1]))
+    config_path = item["config_path"]
+    if not Path(config_path).is_absolute():
+        config_path = str((root / config_path).resolve())
+    kind = item.get("kind")
+    if not plugin_path and kind:
+        # Declarative plugins have no module; their folder is the config's folder.
+        plugin_path = str(Path(config_path).parent)
+    if not plugin_path:
+        raise KeyError("path")
+    if not Path(plugin_path).is_absolute():
+        plugin_path = str((root / plugin_path).resolve())
+    return PluginSpec(
+        id=item["id"],
+        path=plugin_path,
+        enabled=bool(item.get("enabled", True)),
+        config_path=config_path,
+        kind=str(kind) if kind else None,
+    )
+
+
 def load_master_config(path: str | Path) -> LabyrinthConfig:
     master_path = Path(path).resolve()
     raw = load_yaml(master_path)
@@ -35,32 +180,18 @@ def load_master_config(path: str | Path) -> LabyrinthConfig:
     if not Path(db_path).is_absolute():
         db_path = str((master_path.parent / db_path).resolve())
 
-    plugins_raw = raw.get("plugins", [])
-    plugins: list[PluginSpec] = []
-    for item in plugins_raw:
-        plugin_path = item.get("path")
-        if not plugin_path:
-            module = item.get("module", "")
-            if isinstance(module, str) and module:
-                mod_path = module.split(":", 1)[0]
-                # Convert "labyrinth.plugins.foo.plugin" -> "labyrinth/plugins/foo"
-                parts = mod_path.split(".")
-                if len(parts) >= 3:
-                    plugin_path = str(Path(*parts[:-1]))
-        if not plugin_path:
-            raise KeyError("path")
-        if not Path(plugin_path).is_absolute():
-            plugin_path = str((master_path.parent / plugin_path).resolve())
-        config_path = item["config_path"]
-        if not Path(config_path).is_absolute():
-            config_path = str((master_path.parent / config_path).resolve())
-        plugins.append(
-            PluginSpec(
-                id=item["id"],
-                path=plugin_path,
-                enabled=bool(item.get("enabled", True)),
-                config_path=config_path,
-            )
-        )
+    plugins = [plugin_spec_from_item(item, master_path.parent) for item in raw.get("plugins", [])]
+    state_dir = raw.get("state_dir")
+    if state_dir:
+        state_dir = str((master_path.parent / state_dir).resolve())
 
-    return LabyrinthConfig(db_path=db_path, plugins=plugins)
+    return LabyrinthConfig(
+        db_path=db_path,
+        plugins=plugins,
+        rate_limit=_load_rate_limit(raw.get("rate_limit") or {}),
+        leaderboard=_load_leaderboard(raw.get("leaderboard") or {}),
+        idempotency_ttl_seconds=float((raw.get("idempotency") or {}).get("ttl_seconds", 86400)),
+        query_trace=_load_query_trace(raw.get("db", {}).get("trace") or {}, master_path.parent),
+        root=str(master_path.parent),
+        state_dir=state_dir or None,
+    )
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import json
 import sqlite3
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -26,12 +30,194 @@ CREATE TABLE IF NOT EXISTS runs (
 
 CREATE INDEX IF NOT EXISTS idx_runs_agent ON runs(agent_id);
 CREATE INDEX IF NOT EXISTS idx_runs_challenge ON runs(challenge_id);
+
+CREATE TABLE IF NOT EXISTS rate_limits (
+  agent TEXT NOT NULL,
+  challenge_id TEXT NOT NULL,
+  tokens REAL NOT NULL,
+  updated_at REAL NOT NULL,
+  PRIMARY KEY(agent, challenge_id)
+) WITHOUT ROWID;
+
+-- Per (agent, challenge) aggregate maintained by the configured score engine.
+CREATE TABLE IF NOT EXISTS scores (
+  agent_id INTEGER NOT NULL,
+  challenge_id TEXT NOT NULL,
+  value REAL NOT NULL DEFAULT 0,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  fails INTEGER NOT NULL DEFAULT 0,
+  solved_at TEXT,
+  updated_at TEXT,
+  PRIMARY KEY(agent_id, challenge_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_scores_challenge ON scores(challenge_id, solved_at);
+
+-- Stored submit results by (agent, idempotency key); rows expire after the configured TTL.
+CREATE TABLE IF NOT EXISTS idempotency (
+  agent_id INTEGER NOT NULL,
+  key TEXT NOT NULL,
+  challenge_id TEXT NOT NULL,
+  request_hash TEXT NOT NULL,
+  result_json TEXT NOT NULL,
+  created_at REAL NOT NULL,
+  PRIMARY KEY(agent_id, key)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_created ON idempotency(created_at);
+
+-- Cumulative score of an agent at the end of each time bucket (resolution in seconds).
+CREATE TABLE IF NOT EXISTS score_history (
+  agent_id INTEGER NOT NULL,
+  resolution INTEGER NOT NULL,
+  bucket TEXT NOT NULL,
+  score REAL NOT NULL,
+  runs INTEGER NOT NULL,
+  PRIMARY KEY(agent_id, resolution, bucket)
+) WITHOUT ROWID;
+
+-- Per-challenge totals behind `challenge stats`, kept in step with runs (see core/stats.py).
+CREATE TABLE IF NOT EXISTS challenge_stats (
+  challenge_id TEXT PRIMARY KEY,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  successes INTEGER NOT NULL DEFAULT 0,
+  agents INTEGER NOT NULL DEFAULT 0,
+  solvers INTEGER NOT NULL DEFAULT 0,
+  attempts_to_solve INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS challenge_progress (
+  challenge_id TEXT NOT NULL,
+  agent_id INTEGER NOT NULL,
+  first_at TEXT NOT NULL,
+  attempts INTEGER NOT NULL,
+  successes INTEGER NOT NULL,
+  attempts_to_solve INTEGER,
+  solve_seconds REAL,
+  PRIMARY KEY(challenge_id, agent_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_progress_solve ON challenge_progress(challenge_id, solve_seconds);
+CREATE INDEX IF NOT EXISTS idx_progress_agent ON challenge_progress(agent_id);
+
+CREATE TABLE IF NOT EXISTS score_state (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+) WITHOUT ROWID;
 """
 
 
-def connect(db_path: str) -> sqlite3.Connection:
+class QueryTracer:
+    """Per-statement timing and row counters for traced connections.
+
+    Statements slower than ``slow_ms`` are appended to ``slow_log`` (JSON lines) with
+    their ``EXPLAIN QUERY PLAN``. Safe to share between connections and threads.
+    """
+
+    def __init__(self, slow_ms: float | None = None, slow_log: str | Path | None = None):
+        self.slow_ms = slow_ms
+        self.slow_log = Path(slow_log) if slow_log else None
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def _entry(self, key: str) -> dict[str, Any]:
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = {"sql": key, "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": None}
+        return entry
+
+    def record(self, conn: sqlite3.Connection, sql: str, params: Any, seconds: float, rows: int | None) -> None:
+        """Count one statement; ``rows`` is None when the row count is not known."""
+        key = " ".join(sql.split())
+        ms = seconds * 1000
+        with self._lock:
+            entry = self._entry(key)
+            entry["calls"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            if rows is not None:
+                entry["rows"] = (entry["rows"] or 0) + rows
+        if self.slow_ms is not None and self.slow_log is not None and ms >= self.slow_ms:
+            self._log_slow(conn, key, sql, params, ms, rows)
+
+    def _log_slow(self, conn: sqlite3.Connection, key: str, sql: str, params: Any, ms: float, rows: int | None) -> None:
+        plan: list[str] | None = None
+        if params is not None:
+            try:
+                # Bypass tracing so the EXPLAIN itself is not recorded.
+                cur = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params)
+                plan = [str(r[-1]) for r in cur.fetchall()]
+            except sqlite3.Error:
+                plan = None
+        record = {
+            "ts": datetime.utcnow().isoformat() + "Z",
+            "ms": round(ms, 3),
+            "rows": rows,
+            "sql": key,
+            "plan": plan,
+        }
+        with self._lock:
+            self.slow_log.parent.mkdir(parents=True, exist_ok=True)
+            with self.slow_log.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Counters per statement, most total time first."""
+        with self._lock:
+            rows = [dict(e) for e in self._stats.values()]
+        return sorted(rows, key=lambda e: e["total_ms"], reverse=True)
+
+    def merge(self, stats: list[dict[str, Any]]) -> None:
+        """Add counters from another tracer's ``stats()``, e.g. one in a worker process."""
+        with self._lock:
+            for other in stats:
+                entry = self._entry(other["sql"])
+                entry["calls"] += other["calls"]
+                entry["total_ms"] += other["total_ms"]
+                entry["max_ms"] = max(entry["max_ms"], other["max_ms"])
+                if other["rows"] is not None:
+                    entry["rows"] = (entry["rows"] or 0) + other["rows"]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class TracedConnection(sqlite3.Connection):
+    """A connection whose execute/executemany report to ``tracer`` (when set)."""
+
+    tracer: QueryTracer | None = None
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:  # type: ignore[override]
+        if self.tracer is None:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        cur = super().execute(sql, parameters)
+        # rowcount is -1 for queries: their rows are fetched later, outside this timing.
+        rows = cur.rowcount if cur.rowcount >= 0 else None
+        self.tracer.record(self, sql, parameters, time.perf_counter() - start, rows)
+        return cur
+
+    def executemany(self, sql: str, parameters: Any, /) -> sqlite3.Cursor:  # type: ignore[override]
+        if self.tracer is None:
+            return super().executemany(sql, parameters)
+        start = time.perf_counter()
+        cur = super().executemany(sql, parameters)
+        self.tracer.record(self, sql, None, time.perf_counter() - start, cur.rowcount if cur.rowcount >= 0 else None)
+        return cur
+
+
+def connect(
+    db_path: str,
+    check_same_thread: bool = True,
+    tracer: QueryTracer | None = None,
+) -> sqlite3.Connection:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    if tracer is None:
+        conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=check_same_thread, factory=TracedConnection)
+        conn.tracer = tracer
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -42,12 +228,23 @@ def init_db(conn: sqlite3.Connection) -> None:
 
 
 def fetch_one(conn: sqlite3.Connection, sql: str, params: tuple[Any, ...] = ()) -> Any | None:
-    cur = conn.execute(sql, params)
-    row = cur.fetchone()
+    tracer = getattr(conn, "tracer", None)
+    if tracer is None:
+        cur = conn.execute(sql, params)
+        return cur.fetchone()
+    # Time the fetch as well as the execute, and count the rows actually read.
+    start = time.perf_counter()
+    row = sqlite3.Connection.execute(conn, sql, params).fetchone()
+    tracer.record(conn, sql, params, time.perf_counter() - start, 0 if row is None else 1)
     return row
 
 
 def fetch_all(conn: sqlite3.Connection, sql: str, params: tuple[Any, ...] = ()) -> list[Any]:
-    cur = conn.execute(sql, params)
-    rows = cur.fetchall()
+    tracer = getattr(conn, "tracer", None)
+    if tracer is None:
+        cur = conn.execute(sql, params)
+        return list(cur.fetchall())
+    start = time.perf_counter()
+    rows = sqlite3.Connection.execute(conn, sql, params).fetchall()
+    tracer.record(conn, sql, params, time.perf_counter() - start, len(rows))
     return list(rows)
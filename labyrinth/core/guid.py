@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from labyrinth.core.assets import asset_store
+from labyrinth.core.models import ChallengeResult
+from labyrinth.core.registry import BaseChallengePlugin, find_guid_in_files
+
+
+class GuidChallenge(BaseChallengePlugin):
+    def get_instructions(self, cfg: dict[str, Any]) -> str:
+        return cfg.get("prompts", {}).get("instructions", "").strip()
+
+    def validate_config(self, cfg: dict[str, Any], plugin_dir: Path, root: Path) -> list[str]:
+        errors = super().validate_config(cfg, plugin_dir, root)
+        secret = self.get_secret_guid(cfg)
+        if not secret:
+            errors.append("challenge.guid is missing")
+        elif asset_store(root).files(plugin_dir / "files") and not find_guid_in_files(plugin_dir / "files", secret, root):
+            errors.append("challenge.guid does not appear in any file under files/")
+        return errors
+
+    def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
+        if not self.validate_guid(submission, cfg):
+            return ChallengeResult(
+                status="fail",
+                points=0,
+                message="Invalid or missing challenge_guid.",
+            )
+
+        points_cfg = cfg.get("challenge", {}).get("points", {})
+        on_success = int(points_cfg.get("on_success", 0))
+        template = str(cfg.get("prompts", {}).get("success_message", "")).strip()
+        if template:
+            message = template.format(agent=agent_name)
+        else:
+            message = f"{self.name} solved for {agent_name}."
+        return ChallengeResult(
+            status="success",
+            points=on_success,
+            message=message,
+        )
@@ -0,0 +1,85 @@
+"""Idempotency keys for submissions.
+
+A submission may carry an ``idempotency_key``. The first submit with a key stores
+its result under (agent, key). Repeats within ``ttl_seconds`` get that stored result
+back; the plugin does not run again and no new run is recorded.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from typing import Any
+
+from labyrinth.core.models import ChallengeResult
+
+
+MAX_KEY_LENGTH = 200
+
+
+@dataclass(frozen=True)
+class StoredResult:
+    challenge_id: str
+    request_hash: str
+    result: ChallengeResult
+
+
+def request_hash(challenge_id: str, submission: dict[str, Any]) -> str:
+    payload = json.dumps([challenge_id, submission], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def lookup(conn: sqlite3.Connection, agent_id: int, key: str, now: float, ttl: float) -> StoredResult | None:
+    row = conn.execute(
+        "SELECT challenge_id, request_hash, result_json FROM idempotency "
+        "WHERE agent_id = ? AND key = ? AND created_at >= ?",
+        (agent_id, key, now - ttl),
+    ).fetchone()
+    if not row:
+        return None
+    data = json.loads(row[2])
+    return StoredResult(
+        challenge_id=row[0],
+        request_hash=row[1],
+        result=ChallengeResult(
+            status=data["status"],
+            points=int(data["points"]),
+            message=data["message"],
+            evidence=data.get("evidence"),
+        ),
+    )
+
+
+def store(
+    conn: sqlite3.Connection,
+    agent_id: int,
+    key: str,
+    challenge_id: str,
+    req_hash: str,
+    result: ChallengeResult,
+    now: float,
+    ttl: float,
+) -> None:
+    """Save ``result`` under (agent, key) and drop expired keys. Does not commit."""
+    conn.execute("DELETE FROM idempotency WHERE created_at < ?", (now - ttl,))
+    conn.execute(
+        "INSERT OR REPLACE INTO idempotency(agent_id, key, challenge_id, request_hash, result_json, created_at) "
+        "VALUES (?,?,?,?,?,?)",
+        (
+            agent_id,
+            key,
+            challenge_id,
+            req_hash,
+            json.dumps(
+                {
+                    "status": result.status,
+                    "points": result.points,
+                    "message": result.message,
+                    "evidence": result.evidence,
+                },
+                ensure_ascii=False,
+            ),
+            now,
+        ),
+    )
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+from labyrinth.core.assets import asset_store
+from labyrinth.core.images import image_index, image_manifest
 from labyrinth.core.models import ChallengeResult
 from labyrinth.core.registry import BaseChallengePlugin
 
@@ -39,6 +42,49 @@ class ImageQuizChallenge(BaseChallengePlugin):
             "Find the correct answer image, then submit its GUID."
         )
 
+    def image_paths(self, cfg: dict[str, Any], plugin_dir: Path) -> dict[str, Path | str]:
+        """The prompt image and each option's answer image, by label."""
+        iq = ImageQuizDefinition.from_config(cfg)
+        paths: dict[str, Path | str] = {"prompt": iq.prompt_image} if iq.prompt_image else {}
+        paths.update({o: plugin_dir / "answers" / f"{o}.png" for o in iq.options})
+        return paths
+
+    def get_manifest(self, cfg: dict[str, Any]) -> dict[str, Any]:
+        manifest = self.build_manifest(cfg)
+        if self.arena is not None and self.plugin_dir is not None:
+            index = image_index(self.arena.config.root)
+            manifest["images"] = image_manifest(index, self.image_paths(cfg, self.plugin_dir))
+            index.save()
+        return manifest
+
+    def verify_assets(self, cfg: dict[str, Any], root: Path) -> list[str]:
+        if self.plugin_dir is None:
+            return []
+        index = image_index(root)
+        problems = [p for p in map(index.check, self.image_paths(cfg, self.plugin_dir).values()) if p]
+        index.save()
+        return problems
+
+    def validate_config(self, cfg: dict[str, Any], plugin_dir: Path, root: Path) -> list[str]:
+        errors = super().validate_config(cfg, plugin_dir, root)
+        iq = ImageQuizDefinition.from_config(cfg)
+        if not iq.question:
+            errors.append("image_quiz.question is missing")
+        if not iq.prompt_image:
+            errors.append("image_quiz.prompt_image is missing")
+        assets = asset_store(root)
+        if iq.prompt_image and not assets.exists(iq.prompt_image):
+            errors.append(f"prompt image not found: {iq.prompt_image}")
+        missing = [o for o in iq.options if not assets.exists(plugin_dir / "answers" / f"{o}.png")]
+        if missing:
+            errors.append(f"no answer image for options: {', '.join(missing)}")
+        secret = self.get_secret_guid(cfg)
+        if not secret:
+            errors.append("challenge.guid is missing")
+        elif secret not in iq.options:
+            errors.append("challenge.guid is not one of image_quiz.options")
+        return errors
+
     def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
         if not self.validate_guid(submission, cfg):
             return ChallengeResult(
@@ -0,0 +1,292 @@
+"""Image metadata and previews for image quizzes.
+
+``ImageIndex`` keeps, in ``.labyrinth_images/`` next to the master config:
+
+- ``index.json``: per content hash the image's byte size, dimensions and preview, and
+  per file path the (size, mtime) or packed sha256 it had when it was last hashed;
+- ``previews/<sha256>.png``: the image scaled to fit ``PREVIEW_SIZE`` pixels.
+
+Metadata is keyed by content hash, so an unchanged image is never decoded twice and
+an edited one is described anew. ``check`` compares what a file looks like now with
+the recorded stamp, so verifying images does not read them.
+
+Only 8-bit, non-interlaced PNGs get previews; the project has no imaging dependency.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from labyrinth.core.assets import AssetStore, asset_store
+
+
+IMAGE_CACHE_DIR = ".labyrinth_images"
+PREVIEW_SIZE = 64
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG colour type -> samples per pixel
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+# --- PNG -----------------------------------------------------------------------
+
+
+def png_dimensions(data: bytes) -> tuple[int, int]:
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        raise ValueError("not a PNG file")
+    width, height = struct.unpack(">II", data[16:24])
+    return width, height
+
+
+def _chunks(data: bytes) -> Iterator[tuple[bytes, bytes]]:
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos : pos + 8])
+        yield kind, data[pos + 8 : pos + 8 + length]
+        pos += 12 + length
+
+
+def _unfilter(ftype: int, line: bytearray, prev: bytearray, bpp: int) -> None:
+    if ftype == 0:
+        return
+    for i in range(len(line)):
+        a = line[i - bpp] if i >= bpp else 0
+        b = prev[i]
+        if ftype == 1:
+            pred = a
+        elif ftype == 2:
+            pred = b
+        elif ftype == 3:
+            pred = (a + b) >> 1
+        elif ftype == 4:
+            c = prev[i - bpp] if i >= bpp else 0
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            pred = a if pa <= pb and pa <= pc else b if pb <= pc else c
+        else:
+            raise ValueError(f"bad PNG filter type {ftype}")
+        line[i] = (line[i] + pred) & 0xFF
+
+
+def decode_png(data: bytes) -> tuple[int, int, int, list[bytearray]]:
+    """(width, height, channels, rows) of an 8-bit, non-interlaced PNG; palettes become RGB(A)."""
+    width, height = png_dimensions(data)
+    depth, color, _, _, interlace = data[24:29]
+    if depth != 8 or interlace or color not in _CHANNELS:
+        raise ValueError(f"unsupported PNG (bit depth {depth}, colour type {color}, interlace {interlace})")
+    idat = bytearray()
+    palette = trns = b""
+    for kind, body in _chunks(data):
+        if kind == b"IDAT":
+            idat += body
+        elif kind == b"PLTE":
+            palette = body
+        elif kind == b"tRNS":
+            trns = body
+        elif kind == b"IEND":
+            break
+    raw = zlib.decompress(bytes(idat))
+    bpp = _CHANNELS[color]
+    stride = width * bpp
+    rows: list[bytearray] = []
+    prev = bytearray(stride)
+    for y in range(height):
+        pos = y * (stride + 1)
+        line = bytearray(raw[pos + 1 : pos + 1 + stride])
+        _unfilter(raw[pos], line, prev, bpp)
+        rows.append(line)
+        prev = line
+    if color != 3:
+        return width, height, bpp, rows
+    channels = 4 if trns else 3
+    colours = []
+    for i in range(len(palette) // 3):
+        rgb = palette[3 * i : 3 * i + 3]
+        colours.append(rgb + bytes([trns[i] if i < len(trns) else 255]) if trns else rgb)
+    return width, height, channels, [bytearray(b"".join(colours[i] for i in line)) for line in rows]
+
+
+def encode_png(width: int, height: int, channels: int, rows: list[bytearray]) -> bytes:
+    color = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    raw = b"".join(b"\x00" + bytes(row) for row in rows)
+    return (
+        PNG_SIGNATURE
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+def thumbnail(data: bytes, size: int = PREVIEW_SIZE) -> bytes:
+    """The PNG box-filtered down to fit ``size`` x ``size`` (never scaled up)."""
+    width, height, channels, rows = decode_png(data)
+    scale = max(width, height) / size
+    if scale <= 1:
+        return encode_png(width, height, channels, rows)
+    tw, th = max(1, round(width / scale)), max(1, round(height / scale))
+    out: list[bytearray] = []
+    for ty in range(th):
+        y0 = ty * height // th
+        y1 = max(y0 + 1, (ty + 1) * height // th)
+        line = bytearray()
+        for tx in range(tw):
+            x0 = tx * width // tw
+            x1 = max(x0 + 1, (tx + 1) * width // tw)
+            n = (y1 - y0) * (x1 - x0)
+            for ch in range(channels):
+                total = sum(rows[y][x * channels + ch] for y in range(y0, y1) for x in range(x0, x1))
+                line.append(total // n)
+        out.append(line)
+    return encode_png(tw, th, channels, out)
+
+
+# --- index -----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    path: str  # relative to the master config's folder
+    sha256: str
+    bytes: int
+    width: int
+    height: int
+    preview: str  # relative path of the preview PNG; "" if none could be made
+
+
+class ImageIndex:
+    def __init__(self, root: str | Path, store: AssetStore | None = None):
+        self.root = Path(root).resolve()
+        self.dir = self.root / IMAGE_CACHE_DIR
+        self._store = store
+        try:
+            data = json.loads((self.dir / "index.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.images: dict[str, dict[str, Any]] = data.get("images", {})
+        self.files: dict[str, list[Any]] = data.get("files", {})
+        self._dirty = False
+
+    @property
+    def store(self) -> AssetStore:
+        return self._store or asset_store(self.root)
+
+    def _key(self, path: str | Path) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(self.root)
+            except ValueError:
+                pass  # outside the tree; recorded by absolute path
+        return path.as_posix()
+
+    def _stamp(self, key: str) -> list[Any] | None:
+        """Identifies a file's content without reading it: the packed sha256, else size and mtime."""
+        pack = self.store.pack
+        if pack is not None and key in pack:
+            return ["pack", pack.sha256(key)]
+        try:
+            st = (self.root / key).stat()
+        except FileNotFoundError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def _analyse(self, sha: str, data: bytes) -> dict[str, Any]:
+        try:
+            width, height = png_dimensions(data)
+        except ValueError:
+            width = height = 0
+        preview = ""
+        try:
+            small = thumbnail(data)
+        except (ValueError, zlib.error):
+            pass
+        else:
+            target = self.dir / "previews" / f"{sha}.png"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(small)
+            preview = target.relative_to(self.root).as_posix()
+        return {"bytes": len(data), "width": width, "height": height, "preview": preview}
+
+    def describe(self, path: str | Path) -> ImageInfo:
+        """Metadata for one image, hashing and decoding it only if it is new or changed."""
+        key = self._key(path)
+        stamp = self._stamp(key)
+        if stamp is None:
+            raise FileNotFoundError(key)
+        record = self.files.get(key)
+        if record is not None and record[:2] == stamp and record[2] in self.images:
+            sha = record[2]
+        else:
+            data = self.store.read_bytes(key)
+            sha = hashlib.sha256(data).hexdigest()
+            if sha not in self.images:
+                self.images[sha] = self._analyse(sha, data)
+            self.files[key] = [*stamp, sha]
+            self._dirty = True
+        return ImageInfo(path=key, sha256=sha, **self.images[sha])
+
+    def check(self, path: str | Path) -> str | None:
+        """Why ``path`` no longer matches the index, or None.
+
+        Unindexed files pass. Packing a file keeps it valid: the pack's sha256 is compared
+        with the indexed one. Otherwise a changed stamp (a new mtime, or a file unpacked
+        again) makes this read and hash the file, e.g. after a copy that did not keep
+        timestamps.
+        """
+        key = self._key(path)
+        stamp = self._stamp(key)
+        if stamp is None:
+            return f"{key}: missing"
+        record = self.files.get(key)
+        if record is None or record[:2] == stamp:
+            return None
+        if stamp[0] == "pack":
+            # The pack records each file's sha256, so packing needs no read.
+            sha = stamp[1]
+        else:
+            sha = hashlib.sha256(self.store.read_bytes(key)).hexdigest()
+        if sha != record[2]:
+            return f"{key}: changed since the image index was built"
+        self.files[key] = [*stamp, record[2]]
+        self._dirty = True
+        return None
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.dir / f"index.json.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps({"images": self.images, "files": self.files}, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.dir / "index.json")
+        self._dirty = False
+
+
+_indexes: dict[Path, ImageIndex] = {}
+
+
+def image_index(root: str | Path) -> ImageIndex:
+    """The index for ``root`` shared by every plugin in this process."""
+    root = Path(root).resolve()
+    if root not in _indexes:
+        _indexes[root] = ImageIndex(root)
+    return _indexes[root]
+
+
+def image_manifest(index: ImageIndex, paths: dict[str, Path | str]) -> dict[str, dict[str, Any]]:
+    """Manifest entries for the images in ``paths`` (label -> path) that exist."""
+    entries: dict[str, dict[str, Any]] = {}
+    for label, path in paths.items():
+        try:
+            entries[label] = asdict(index.describe(path))
+        except FileNotFoundError:
+            continue
+    return entries
@@ -0,0 +1,218 @@
+"""Simulated agents against an Arena.
+
+Each agent registers, pulls its scorecard and then sends a mix of correct and incorrect
+submissions (from each plugin's ``sample_submission``) to random enabled challenges.
+Agents run as threads sharing one Arena, as asyncio tasks sharing one Arena, or in
+worker processes with one Arena (and one SQLite connection) each. The report gives
+throughput, latency percentiles and a count of SQLite lock errors.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from labyrinth.core.arena import Arena, ChallengeBusy, RateLimited
+from labyrinth.core.config import LabyrinthConfig, QueryTraceConfig, RateLimitConfig, load_master_config
+
+
+MODES = ("thread", "asyncio", "process")
+
+# (operation, milliseconds, outcome)
+Sample = tuple[str, float, str]
+
+
+@dataclass
+class LoadtestReport:
+    mode: str
+    agents: int
+    seconds: float
+    samples: list[Sample] = field(default_factory=list)
+    query_stats: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def outcomes(self) -> Counter:
+        return Counter(outcome for _, _, outcome in self.samples)
+
+    @property
+    def lock_errors(self) -> int:
+        return self.outcomes["locked"]
+
+    @property
+    def throughput(self) -> float:
+        return len(self.samples) / self.seconds if self.seconds else 0.0
+
+    def percentile(self, pct: float, op: str | None = None) -> float:
+        values = sorted(ms for name, ms, _ in self.samples if op is None or name == op)
+        if not values:
+            return 0.0
+        rank = max(0, min(len(values) - 1, round(pct / 100 * len(values) + 0.5) - 1))
+        return values[rank]
+
+    def by_operation(self) -> dict[str, int]:
+        return dict(Counter(name for name, _, _ in self.samples).most_common())
+
+
+def _outcome(fn: Callable[[], Any]) -> str:
+    try:
+        result = fn()
+    except RateLimited:
+        return "throttled"
+    except ChallengeBusy:
+        return "busy"
+    except Exception as e:
+        if "database is locked" in str(e) or "database is busy" in str(e):
+            return "locked"
+        return f"error:{type(e).__name__}"
+    return getattr(result, "status", "ok")
+
+
+def _timed(samples: list[Sample], op: str, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    outcome = _outcome(fn)
+    samples.append((op, (time.perf_counter() - start) * 1000, outcome))
+
+
+def agent_operations(arena: Arena, name: str, ops: int, correct_ratio: float, seed: int) -> Iterator[tuple[str, Callable[[], Any]]]:
+    """The calls one simulated agent makes, in order, as (operation, thunk) pairs."""
+    rng = random.Random(seed)
+    plugins = arena.plugins
+    yield "register", lambda: arena.register_agent(name)
+    if "scorecard" in plugins:
+        card = plugins["scorecard"]
+        payload = card.instance.sample_submission(card.cfg, True, rng)
+        yield "scorecard", lambda: arena.submit("scorecard", name, payload)
+    challenge_ids = sorted(pid for pid in plugins if pid != "scorecard")
+    for _ in range(ops):
+        cid = rng.choice(challenge_ids)
+        p = plugins[cid]
+        payload = p.instance.sample_submission(p.cfg, rng.random() < correct_ratio, rng)
+        yield cid, lambda cid=cid, payload=payload: arena.submit(cid, name, payload)
+
+
+def run_agent(arena: Arena, name: str, ops: int, correct_ratio: float, seed: int) -> list[Sample]:
+    samples: list[Sample] = []
+    for op, fn in agent_operations(arena, name, ops, correct_ratio, seed):
+        _timed(samples, op, fn)
+    return samples
+
+
+async def _run_agent_async(arena: Arena, name: str, ops: int, correct_ratio: float, seed: int) -> list[Sample]:
+    samples: list[Sample] = []
+    for op, fn in agent_operations(arena, name, ops, correct_ratio, seed):
+        await asyncio.to_thread(_timed, samples, op, fn)
+    return samples
+
+
+async def _run_all_async(arena: Arena, names: list[str], ops: int, correct_ratio: float, seed: int) -> list[list[Sample]]:
+    return await asyncio.gather(
+        *(_run_agent_async(arena, name, ops, correct_ratio, seed + i) for i, name in enumerate(names))
+    )
+
+
+_worker_arena: Arena | None = None
+
+
+def _init_worker(config: LabyrinthConfig, audit_path: str) -> None:
+    global _worker_arena
+    _worker_arena = Arena(config, audit_path=audit_path, rate_limit_store="sqlite")
+    _worker_arena.plugins  # load before the clock matters
+    if _worker_arena.tracer is not None:
+        _worker_arena.tracer.reset()
+
+
+def _process_agent(name: str, ops: int, correct_ratio: float, seed: int) -> tuple[list[Sample], list[dict[str, Any]]]:
+    """The agent's samples and the SQL counters of its calls, which the parent merges."""
+    assert _worker_arena is not None
+    samples = run_agent(_worker_arena, name, ops, correct_ratio, seed)
+    tracer = _worker_arena.tracer
+    if tracer is None:
+        return samples, []
+    stats = tracer.stats()
+    tracer.reset()  # a worker runs one agent at a time, so these were all this agent's
+    return samples, stats
+
+
+def loadtest(
+    config_path: str | Path,
+    agents: int = 10,
+    ops: int = 20,
+    mode: str = "thread",
+    correct_ratio: float = 0.5,
+    seed: int = 0,
+    db_path: str | None = None,
+    rate_limit: bool = True,
+    workers: int | None = None,
+    trace: bool = False,
+) -> LoadtestReport:
+    """Run ``agents`` simulated agents making ``ops`` submissions each.
+
+    Uses a throwaway database unless ``db_path`` is given; the configured one is never touched.
+    Plugin state (such as breadcrumb sessions) always goes to a throwaway folder.
+    ``trace`` turns on SQL tracing (without a slow query log) when ``db.trace`` is off.
+    The report's ``query_stats`` then covers every agent's statements, from all worker
+    processes.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; choose from {MODES}")
+    tmp = tempfile.TemporaryDirectory(prefix="labyrinth-loadtest-")
+    if db_path is None:
+        db_path = str(Path(tmp.name) / "loadtest.db")
+    config = load_master_config(config_path)
+    query_trace = config.query_trace
+    if trace and not query_trace.enabled:
+        query_trace = QueryTraceConfig(enabled=True, slow_query_log="")
+    config = replace(
+        config,
+        db_path=str(db_path),
+        rate_limit=config.rate_limit if rate_limit else RateLimitConfig(),
+        state_dir=str(Path(tmp.name) / "state"),
+        query_trace=query_trace,
+    )
+    audit_path = str(Path(str(db_path)).with_suffix(".audit.jsonl"))
+    run_id = uuid.uuid4().hex[:8]
+    names = [f"loadtest-{run_id}-{i}" for i in range(agents)]
+
+    arena = Arena(config, audit_path=audit_path)
+    try:
+        arena.plugins  # load plugins before timing
+        if arena.tracer is not None:
+            arena.tracer.reset()  # count only the agents' statements
+        start = time.perf_counter()
+        if mode == "thread":
+            with ThreadPoolExecutor(max_workers=agents) as pool:
+                futures = [pool.submit(run_agent, arena, name, ops, correct_ratio, seed + i) for i, name in enumerate(names)]
+                results = [f.result() for f in futures]
+        elif mode == "asyncio":
+            results = asyncio.run(_run_all_async(arena, names, ops, correct_ratio, seed))
+        else:
+            pool_size = workers or min(agents, os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=pool_size, initializer=_init_worker, initargs=(config, audit_path)) as pool:
+                futures = [pool.submit(_process_agent, name, ops, correct_ratio, seed + i) for i, name in enumerate(names)]
+                results = []
+                for f in futures:
+                    agent_samples, stats = f.result()
+                    results.append(agent_samples)
+                    if arena.tracer is not None:
+                        arena.tracer.merge(stats)
+        seconds = time.perf_counter() - start
+
+        report = LoadtestReport(
+            mode=mode,
+            agents=agents,
+            seconds=seconds,
+            samples=[s for agent_samples in results for s in agent_samples],
+            query_stats=arena.query_stats(),
+        )
+    finally:
+        arena.close()
+        tmp.cleanup()
+    return report
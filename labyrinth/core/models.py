@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass
 from typing import Any
 
@@ -16,3 +18,23 @@ class ChallengeResult:
     points: int
     message: str
     evidence: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A pre-rendered JSON payload with a strong ETag derived from its bytes."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def render(cls, payload: Any) -> "CachedResponse":
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """True when an If-None-Match value names this ETag, i.e. the client's copy is current."""
+        if not if_none_match:
+            return False
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or any(t.removeprefix("W/") == self.etag for t in tags)
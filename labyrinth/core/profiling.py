@@ -0,0 +1,138 @@
+"""Per-command profiling.
+
+``labyrinth --profile DIR ...`` (or ``LABYRINTH_PROFILE=DIR``) runs the command under
+cProfile and writes ``<DIR>/<time>-<pid>-<command>.prof``. With ``--profile-memory``
+(or ``LABYRINTH_PROFILE_MEMORY=1``) tracemalloc also runs and the top allocation
+sites go to a matching ``.mem.txt``. ``summarize`` aggregates many ``.prof`` files
+to show the functions that are hot run after run.
+"""
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+
+PROFILE_ENV = "LABYRINTH_PROFILE"
+PROFILE_MEMORY_ENV = "LABYRINTH_PROFILE_MEMORY"
+DEFAULT_PROFILE_DIR = ".labyrinth_profiles"
+TOP_ALLOCATIONS = 25
+
+
+def resolve_profile_dir(value: str | None) -> str | None:
+    """``--profile``/``LABYRINTH_PROFILE`` value to an output directory; "1" means the default."""
+    value = (value or "").strip()
+    if not value or value == "0":
+        return None
+    return DEFAULT_PROFILE_DIR if value == "1" else value
+
+
+class Profiler:
+    """cProfile (and optionally tracemalloc) around one command; ``stop`` writes the reports."""
+
+    def __init__(self, out_dir: str | Path, label: str, memory: bool = False):
+        self.out_dir = Path(out_dir)
+        self.label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label) or "labyrinth"
+        self.memory = memory
+        self._profile = cProfile.Profile()
+        self._started_tracemalloc = False
+        self.paths: list[Path] = []
+
+    def start(self) -> "Profiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._profile.enable()
+        return self
+
+    def stop(self) -> list[Path]:
+        self._profile.disable()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        base = stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self.label}"
+        n = 1
+        while (self.out_dir / f"{stem}.prof").exists():
+            n += 1
+            stem = f"{base}-{n}"
+        prof_path = self.out_dir / f"{stem}.prof"
+        self._profile.dump_stats(prof_path)
+        self.paths.append(prof_path)
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            lines = [f"current={current} peak={peak} bytes", ""]
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                lines.append(str(stat))
+            mem_path = self.out_dir / f"{stem}.mem.txt"
+            mem_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            self.paths.append(mem_path)
+        return self.paths
+
+    def __enter__(self) -> "Profiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+@dataclass
+class HotFunction:
+    function: str
+    runs: int = 0  # profiles the function appears in
+    hot_runs: int = 0  # profiles where it is in the top N by own time
+    tottime: float = 0.0
+    cumtime: float = 0.0
+    calls: int = 0
+
+    @property
+    def mean_tottime(self) -> float:
+        return self.tottime / self.runs if self.runs else 0.0
+
+    @property
+    def mean_cumtime(self) -> float:
+        return self.cumtime / self.runs if self.runs else 0.0
+
+
+def profile_files(paths: Iterable[str | Path]) -> list[Path]:
+    files: list[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(sorted(p.glob("*.prof")))
+        elif p.exists():
+            files.append(p)
+    return files
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-ins such as {method 'execute' of 'sqlite3.Connection' objects}
+    path = Path(filename)
+    return f"{path.parent.name}/{path.name}:{line}({name})"
+
+
+def summarize(files: Iterable[Path], top: int = 20) -> tuple[int, list[HotFunction]]:
+    """Aggregate profiles; rank by how often a function is hot, then by total own time."""
+    table: dict[str, HotFunction] = {}
+    count = 0
+    for path in files:
+        stats = pstats.Stats(str(path)).stats  # type: ignore[attr-defined]
+        count += 1
+        ranked = sorted(stats.items(), key=lambda kv: kv[1][2], reverse=True)
+        hot = {func for func, _ in ranked[:top]}
+        for func, (_, ncalls, tottime, cumtime, _) in stats.items():
+            entry = table.setdefault(_label(func), HotFunction(_label(func)))
+            entry.runs += 1
+            entry.hot_runs += func in hot
+            entry.tottime += tottime
+            entry.cumtime += cumtime
+            entry.calls += ncalls
+    ranked_entries = sorted(table.values(), key=lambda h: (h.hot_runs, h.tottime), reverse=True)
+    return count, ranked_entries[:top]
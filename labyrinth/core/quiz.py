@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+from labyrinth.core.assets import asset_store
 from labyrinth.core.models import ChallengeResult
-from labyrinth.core.registry import BaseChallengePlugin
+from labyrinth.core.registry import BaseChallengePlugin, find_guid_in_files
 
 
 @dataclass(frozen=True)
@@ -36,6 +38,23 @@ class QuizChallenge(BaseChallengePlugin):
             "Find the file named after the correct answer, read the GUID inside, and submit it."
         )
 
+    def validate_config(self, cfg: dict[str, Any], plugin_dir: Path, root: Path) -> list[str]:
+        errors = super().validate_config(cfg, plugin_dir, root)
+        quiz = QuizDefinition.from_config(cfg)
+        if not quiz.question:
+            errors.append("quiz.question is missing")
+        if len(quiz.options) < 2:
+            errors.append("quiz.options needs at least two options")
+        secret = self.get_secret_guid(cfg)
+        if not secret:
+            errors.append("challenge.guid is missing")
+        files_dir = plugin_dir / "files"
+        if secret and asset_store(root).files(files_dir):
+            matches = find_guid_in_files(files_dir, secret, root)
+            if len(matches) != 1:
+                errors.append(f"challenge.guid found in {len(matches)} answer files, expected exactly 1")
+        return errors
+
     def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
         if not self.validate_guid(submission, cfg):
             return ChallengeResult(
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from labyrinth.core.config import RateLimitConfig
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def _take(tokens: float, rate: float) -> tuple[float, float]:
+    """Spend one token. Returns (remaining tokens, retry_after seconds; 0 when allowed)."""
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    if rate <= 0:
+        return tokens, float("inf")
+    return tokens, (1.0 - tokens) / rate
+
+
+class MemoryRateLimiter:
+    """Token buckets keyed by (agent, challenge) held in process memory (server/library mode)."""
+
+    def __init__(self, cfg: RateLimitConfig, clock: Callable[[], float] = time.monotonic):
+        self.cfg = cfg
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple[str, str], tuple[float, float]] = {}
+
+    def acquire(self, agent_name: str, challenge_id: str) -> float:
+        if not self.cfg.enabled:
+            return 0.0
+        capacity, rate = self.cfg.limits_for(challenge_id)
+        key = (agent_name, challenge_id)
+        with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, retry_after = _take(_refill(tokens, updated, now, capacity, rate), rate)
+            self._buckets[key] = (tokens, now)
+        return retry_after
+
+    def reset(self) -> None:
+        """Forget every bucket (the agents they belonged to were replaced)."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class SqliteRateLimiter:
+    """Token buckets kept in the ``rate_limits`` table so separate CLI processes share them."""
+
+    def __init__(self, conn: sqlite3.Connection, cfg: RateLimitConfig, clock: Callable[[], float] = time.time):
+        self.conn = conn
+        self.cfg = cfg
+        self._clock = clock
+
+    def acquire(self, agent_name: str, challenge_id: str) -> float:
+        if not self.cfg.enabled:
+            return 0.0
+        capacity, rate = self.cfg.limits_for(challenge_id)
+        conn = self.conn
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self._clock()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limits WHERE agent = ? AND challenge_id = ?",
+                (agent_name, challenge_id),
+            ).fetchone()
+            tokens, updated = (float(row[0]), float(row[1])) if row else (capacity, now)
+            tokens, retry_after = _take(_refill(tokens, updated, now, capacity, rate), rate)
+            conn.execute(
+                """
+                INSERT INTO rate_limits(agent, challenge_id, tokens, updated_at) VALUES (?,?,?,?)
+                ON CONFLICT(agent, challenge_id) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at
+                """,
+                (agent_name, challenge_id, tokens, now),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return retry_after
+
+    def reset(self) -> None:
+        """Forget every bucket (the agents they belonged to were replaced)."""
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("DELETE FROM rate_limits")
+        self.conn.commit()
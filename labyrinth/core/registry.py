@@ -1,16 +1,63 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+import random
+import uuid
 from dataclasses import dataclass
 from importlib import import_module, util as import_util
 from pathlib import Path
-from typing import Any, Protocol
+from types import MappingProxyType
+from typing import Any, Mapping, Protocol
 
+from labyrinth.core.assets import AssetStore, asset_store
 from labyrinth.core.config import PluginSpec, load_yaml
 
 
+class SubmissionBusy(Exception):
+    """Raised by a plugin's ``submit`` when it cannot run the submission right now.
+
+    Nothing happened, so the Arena records no run and the caller may simply retry.
+    """
+
+
+def guid_digest(guid: str) -> bytes:
+    return hashlib.sha256(guid.strip().encode("utf-8")).digest()
+
+
+@dataclass(frozen=True)
+class ChallengeMeta:
+    """Per-challenge values derived from the config once, at load time."""
+
+    id: str
+    name: str
+    display_guid: str
+    secret_digest: bytes  # empty when the challenge has no secret GUID
+    on_success: int
+    on_repeat: int
+
+    @classmethod
+    def from_plugin(cls, plugin_id: str, instance: Any, cfg: dict[str, Any]) -> "ChallengeMeta":
+        challenge = cfg.get("challenge", {})
+        points_cfg = challenge.get("points", {})
+        secret = instance.get_secret_guid(cfg)
+        return cls(
+            id=plugin_id,
+            name=str(challenge.get("name", getattr(instance, "name", plugin_id))),
+            display_guid=instance.get_display_guid(cfg),
+            secret_digest=guid_digest(secret) if secret else b"",
+            on_success=int(points_cfg.get("on_success", 0)),
+            on_repeat=int(points_cfg.get("on_repeat", 0)),
+        )
+
+
 class BaseChallengePlugin:
     id: str
     name: str
+    meta: ChallengeMeta | None = None
+    arena: Any = None  # the owning Arena, when loaded through one
+    plugin_dir: Path | None = None
+    state_dir: Path | None = None  # set by the Arena from LabyrinthConfig.state_dir
 
     def build_manifest(self, cfg: dict[str, Any]) -> dict[str, Any]:
         challenge = cfg.get("challenge", {})
@@ -42,9 +89,15 @@ class BaseChallengePlugin:
         return str(cfg.get("challenge", {}).get("guid_display", self.get_secret_guid(cfg))).strip()
 
     def validate_guid(self, submission: dict[str, Any], cfg: dict[str, Any]) -> bool:
-        expected = self.get_secret_guid(cfg)
         provided = submission.get("challenge_guid")
-        return bool(expected) and isinstance(provided, str) and provided.strip() == expected
+        if not isinstance(provided, str):
+            return False
+        if self.meta is not None:
+            expected = self.meta.secret_digest
+        else:
+            secret = self.get_secret_guid(cfg)
+            expected = guid_digest(secret) if secret else b""
+        return bool(expected) and hmac.compare_digest(guid_digest(provided), expected)
 
     def get_instructions(self, cfg: dict[str, Any]) -> str:
         raise NotImplementedError
@@ -52,10 +105,47 @@ class BaseChallengePlugin:
     def get_manifest(self, cfg: dict[str, Any]) -> dict[str, Any]:
         return self.build_manifest(cfg)
 
+    def verify_assets(self, cfg: dict[str, Any], root: Path) -> list[str]:
+        """Problems with files this challenge serves to agents; should not read the files."""
+        return []
+
+    def reset(self, cfg: dict[str, Any], agent_name: str | None = None) -> None:
+        """Forget per-agent state kept outside the database (every agent's if ``agent_name`` is None)."""
+
+    def sample_submission(self, cfg: dict[str, Any], correct: bool, rng: random.Random) -> dict[str, Any]:
+        """A payload a simulated agent could send (used by loadtest); ``correct`` asks for a solving one."""
+        if correct and self.get_secret_guid(cfg):
+            return {"challenge_guid": self.get_secret_guid(cfg)}
+        return {"challenge_guid": str(uuid.UUID(int=rng.getrandbits(128)))}
+
+    def validate_config(self, cfg: dict[str, Any], plugin_dir: Path, root: Path) -> list[str]:
+        """Return problems with this plugin's config; ``root`` is the master config's folder."""
+        errors: list[str] = []
+        challenge = cfg.get("challenge")
+        if not isinstance(challenge, dict):
+            return ["missing 'challenge' section"]
+        if challenge.get("id") not in (None, self.id):
+            errors.append(f"challenge.id '{challenge.get('id')}' does not match plugin id '{self.id}'")
+        try:
+            int(challenge.get("points", {}).get("on_success", 0))
+            int(challenge.get("points", {}).get("on_repeat", 0))
+        except (TypeError, ValueError, AttributeError):
+            errors.append("challenge.points values must be integers")
+        return errors
+
     def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> Any:
         raise NotImplementedError
 
 
+def find_guid_in_files(files_dir: Path, guid: str, root: Path | None = None) -> list[Path]:
+    """Files under ``files_dir`` whose text contains ``guid``.
+
+    With ``root`` the files are read through the asset pack next to it, if there is one.
+    """
+    store = asset_store(root) if root is not None else AssetStore(Path.cwd())
+    return store.find_text(files_dir, guid)
+
+
 class ChallengePlugin(Protocol):
     id: str
     name: str
@@ -70,6 +160,17 @@ class LoadedPlugin:
     spec: PluginSpec
     instance: ChallengePlugin
     cfg: dict[str, Any]
+    meta: ChallengeMeta
+
+
+# Declarative plugin kinds: a plugin whose master entry (or own config) sets
+# ``kind`` is served by the shared core class instead of its own plugin.py.
+PLUGIN_KINDS: dict[str, str] = {
+    "guid": "labyrinth.core.guid:GuidChallenge",
+    "quiz": "labyrinth.core.quiz:QuizChallenge",
+    "image_quiz": "labyrinth.core.image_quiz:ImageQuizChallenge",
+    "word_change": "labyrinth.core.word_change:WordChangeChallenge",
+}
 
 
 def _load_module_from_file(module_name: str, file_path: Path):
@@ -81,20 +182,72 @@ def _load_module_from_file(module_name: str, file_path: Path):
     return module
 
 
+def _resolve_kind(kind: str, classes: dict[str, type]) -> type:
+    cls = classes.get(kind)
+    if cls is not None:
+        return cls
+    target = PLUGIN_KINDS.get(kind)
+    if target is None:
+        raise ValueError(f"Unknown plugin kind '{kind}'. Expected one of: {', '.join(sorted(PLUGIN_KINDS))}")
+    module_name, class_name = target.split(":", 1)
+    cls = getattr(import_module(module_name), class_name)
+    classes[kind] = cls
+    return cls
+
+
+def _instantiate_kind(spec: PluginSpec, kind: str, cfg: dict[str, Any], classes: dict[str, type]):
+    cls = _resolve_kind(kind, classes)
+    instance = cls()
+    instance.id = spec.id
+    instance.name = cfg.get("challenge", {}).get("name", spec.id)
+    return instance
+
+
+def _instantiate_module(spec: PluginSpec):
+    plugin_dir = Path(spec.path)
+    plugin_file = plugin_dir / "plugin.py"
+    if not plugin_file.exists():
+        raise FileNotFoundError(f"Plugin file not found: {plugin_file}")
+    module = _load_module_from_file(f"labyrinth.plugins.{spec.id}", plugin_file)
+    cls = getattr(module, "Plugin", None)
+    if cls is None:
+        raise AttributeError(f"Plugin class 'Plugin' not found in {plugin_file}")
+    return cls()  # type: ignore[call-arg]
+
+
+def load_plugin(spec: PluginSpec, classes: dict[str, type] | None = None) -> LoadedPlugin:
+    cfg = load_yaml(spec.config_path)
+    kind = spec.kind or cfg.get("kind")
+    if kind:
+        instance = _instantiate_kind(spec, str(kind), cfg, classes if classes is not None else {})
+    else:
+        instance = _instantiate_module(spec)
+    meta = ChallengeMeta.from_plugin(spec.id, instance, cfg)
+    instance.meta = meta
+    instance.plugin_dir = Path(spec.path)
+    return LoadedPlugin(spec=spec, instance=instance, cfg=cfg, meta=meta)
+
+
 def load_plugins(specs: list[PluginSpec]) -> dict[str, LoadedPlugin]:
     loaded: dict[str, LoadedPlugin] = {}
+    classes: dict[str, type] = {}
     for spec in specs:
         if not spec.enabled:
             continue
-        plugin_dir = Path(spec.path)
-        plugin_file = plugin_dir / "plugin.py"
-        if not plugin_file.exists():
-            raise FileNotFoundError(f"Plugin file not found: {plugin_file}")
-        module = _load_module_from_file(f"labyrinth.plugins.{spec.id}", plugin_file)
-        cls = getattr(module, "Plugin", None)
-        if cls is None:
-            raise AttributeError(f"Plugin class 'Plugin' not found in {plugin_file}")
-        instance = cls()  # type: ignore[call-arg]
-        cfg = load_yaml(spec.config_path)
-        loaded[spec.id] = LoadedPlugin(spec=spec, instance=instance, cfg=cfg)
+        loaded[spec.id] = load_plugin(spec, classes)
     return loaded
+
+
+def build_guid_index(plugins: Mapping[str, LoadedPlugin]) -> Mapping[bytes, str]:
+    """Map each secret GUID digest to its challenge id."""
+    index: dict[bytes, str] = {}
+    for pid, p in plugins.items():
+        if p.meta.secret_digest:
+            index.setdefault(p.meta.secret_digest, pid)
+    return MappingProxyType(index)
+
+
+def find_challenge_by_guid(index: Mapping[bytes, str], guid: str) -> str | None:
+    if not isinstance(guid, str) or not guid.strip():
+        return None
+    return index.get(guid_digest(guid))
@@ -1,17 +1,255 @@
+"""Leaderboard scoring.
+
+Each ``score_mode`` is a ``ScoreEngine`` that folds one run at a time into a
+per-(agent, challenge) row of the ``scores`` table. Submits update that row in the
+same transaction as the run insert, so the leaderboard sums ``scores`` instead of
+scanning ``runs``. ``ensure_scores`` rebuilds the table from ``runs`` once whenever the
+configured mode differs from the one the stored scores were built with.
+
+``score_history`` keeps each agent's cumulative score at the end of every time bucket,
+one series per configured resolution. It is updated with the scores and rebuilt with them.
+"""
 from __future__ import annotations
 
-from labyrinth.core.db import fetch_all
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
+from labyrinth.core.config import LeaderboardConfig
+from labyrinth.core.db import fetch_all, fetch_one
 
-def leaderboard(conn) -> list[dict]:
-    rows = fetch_all(
+
+@dataclass
+class ScoreCell:
+    value: float = 0.0
+    attempts: int = 0
+    fails: int = 0
+    solved_at: str | None = None
+    updated_at: str | None = None
+
+
+class ScoreEngine:
+    """``sum``: every run's awarded points count, penalties included."""
+
+    mode = "sum"
+    # True when an agent's value depends on other agents' runs, so removing one agent's
+    # runs changes everyone else's scores.
+    cross_agent = False
+
+    def __init__(self, cfg: LeaderboardConfig):
+        self.cfg = cfg
+
+    def fold(self, cell: ScoreCell, status: str, points: int, ts: str, first_solved_at: str | None) -> float:
+        """New value of ``cell`` after a run; counters are updated by the caller afterwards."""
+        return cell.value + points
+
+
+class BestEngine(ScoreEngine):
+    """``best``: the highest single run per challenge."""
+
+    mode = "best"
+
+    def fold(self, cell, status, points, ts, first_solved_at):
+        return float(points) if cell.attempts == 0 else max(cell.value, points)
+
+
+class FirstSolveEngine(ScoreEngine):
+    """``first_solve``: only the first successful run per challenge; failures cost nothing."""
+
+    mode = "first_solve"
+
+    def fold(self, cell, status, points, ts, first_solved_at):
+        if status == "success" and cell.solved_at is None:
+            return float(points)
+        return cell.value
+
+
+class DecayEngine(FirstSolveEngine):
+    """``decay``: the first solve, halved every ``decay_half_life_hours`` after anyone first solved it."""
+
+    mode = "decay"
+    cross_agent = True  # decay runs from the challenge's first solve by anyone
+
+    def fold(self, cell, status, points, ts, first_solved_at):
+        if status != "success" or cell.solved_at is not None:
+            return cell.value
+        if first_solved_at is None:
+            return float(points)
+        hours = max(0.0, (_parse_ts(ts) - _parse_ts(first_solved_at)).total_seconds() / 3600)
+        return points * 0.5 ** (hours / self.cfg.decay_half_life_hours)
+
+
+class PenalizedEngine(FirstSolveEngine):
+    """``penalized``: the first solve, minus ``attempt_penalty`` per failed attempt before it."""
+
+    mode = "penalized"
+
+    def fold(self, cell, status, points, ts, first_solved_at):
+        if status != "success" or cell.solved_at is not None:
+            return cell.value
+        return max(0.0, points - self.cfg.attempt_penalty * cell.fails)
+
+
+SCORE_ENGINES: dict[str, type[ScoreEngine]] = {
+    cls.mode: cls for cls in (ScoreEngine, BestEngine, FirstSolveEngine, DecayEngine, PenalizedEngine)
+}
+
+# tie_break -> ORDER BY terms applied after total points.
+TIE_BREAKS: dict[str, str] = {
+    "earliest": "COALESCE(MAX(s.updated_at), a.created_at) ASC",
+    "registered": "a.created_at ASC",
+    "fewest_attempts": "COALESCE(SUM(s.attempts), 0) ASC",
+    "name": "a.name ASC",
+}
+
+
+def engine_for(cfg: LeaderboardConfig) -> ScoreEngine:
+    if cfg.score_mode not in SCORE_ENGINES:
+        raise ValueError(f"Unknown leaderboard.score_mode {cfg.score_mode!r}; choose from {sorted(SCORE_ENGINES)}")
+    if cfg.tie_break not in TIE_BREAKS:
+        raise ValueError(f"Unknown leaderboard.tie_break {cfg.tie_break!r}; choose from {sorted(TIE_BREAKS)}")
+    return SCORE_ENGINES[cfg.score_mode](cfg)
+
+
+def _parse_ts(ts: str) -> datetime:
+    return datetime.fromisoformat(ts)
+
+
+def _apply(engine: ScoreEngine, cell: ScoreCell, status: str, points: int, ts: str, first_solved_at: str | None) -> None:
+    value = engine.fold(cell, status, points, ts, first_solved_at)
+    if value != cell.value or cell.updated_at is None:
+        cell.updated_at = ts
+    cell.value = value
+    cell.attempts += 1
+    if status == "success":
+        cell.solved_at = cell.solved_at or ts
+    else:
+        cell.fails += 1
+
+
+def history_bucket(ts: str, resolution: int) -> str:
+    """Start of the ``resolution``-second bucket holding ``ts`` (UTC, SQLite datetime format)."""
+    epoch = int(_parse_ts(ts).replace(tzinfo=timezone.utc).timestamp())
+    return datetime.fromtimestamp(epoch - epoch % resolution, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+_HISTORY_UPSERT = """
+INSERT INTO score_history(agent_id, resolution, bucket, score, runs) VALUES (?,?,?,?,?)
+ON CONFLICT(agent_id, resolution, bucket) DO UPDATE SET score = excluded.score, runs = runs + excluded.runs
+"""
+
+
+def record_run(
+    conn: sqlite3.Connection,
+    engine: ScoreEngine,
+    agent_id: int,
+    challenge_id: str,
+    status: str,
+    points: int,
+    ts: str,
+) -> None:
+    """Fold one new run into ``scores``. Runs inside the caller's transaction; does not commit."""
+    row = fetch_one(
         conn,
+        "SELECT value, attempts, fails, solved_at, updated_at FROM scores WHERE agent_id = ? AND challenge_id = ?",
+        (agent_id, challenge_id),
+    )
+    cell = ScoreCell(*row) if row else ScoreCell()
+    first = fetch_one(conn, "SELECT MIN(solved_at) FROM scores WHERE challenge_id = ?", (challenge_id,))
+    _apply(engine, cell, status, points, ts, first[0] if first else None)
+    conn.execute(
         """
-        SELECT a.name as agent_name, COALESCE(SUM(r.points), 0) AS total_points
+        INSERT INTO scores(agent_id, challenge_id, value, attempts, fails, solved_at, updated_at) VALUES (?,?,?,?,?,?,?)
+        ON CONFLICT(agent_id, challenge_id) DO UPDATE SET
+          value = excluded.value, attempts = excluded.attempts, fails = excluded.fails,
+          solved_at = excluded.solved_at, updated_at = excluded.updated_at
+        """,
+        (agent_id, challenge_id, cell.value, cell.attempts, cell.fails, cell.solved_at, cell.updated_at),
+    )
+    total = fetch_one(conn, "SELECT SUM(value) FROM scores WHERE agent_id = ?", (agent_id,))[0]
+    conn.executemany(
+        _HISTORY_UPSERT,
+        [(agent_id, res, history_bucket(ts, res), total, 1) for res in engine.cfg.history_resolutions],
+    )
+
+
+def recompute_scores(conn: sqlite3.Connection, engine: ScoreEngine) -> int:
+    """Rebuild ``scores`` and ``score_history`` from every run in order and remember which mode built them."""
+    cells: dict[tuple[int, str], ScoreCell] = {}
+    first_solved: dict[str, str] = {}
+    totals: dict[int, float] = {}
+    history: dict[tuple[int, int, str], list[float]] = {}
+    runs = 0
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cur = conn.execute("SELECT agent_id, challenge_id, status, points, submitted_at FROM runs ORDER BY id")
+        for agent_id, challenge_id, status, points, ts in cur:
+            cell = cells.setdefault((agent_id, challenge_id), ScoreCell())
+            before = cell.value
+            _apply(engine, cell, status, int(points), ts, first_solved.get(challenge_id))
+            totals[agent_id] = totals.get(agent_id, 0.0) + cell.value - before
+            for res in engine.cfg.history_resolutions:
+                point = history.setdefault((agent_id, res, history_bucket(ts, res)), [0.0, 0])
+                point[0] = totals[agent_id]
+                point[1] += 1
+            if status == "success":
+                first_solved.setdefault(challenge_id, ts)
+            runs += 1
+        conn.execute("DELETE FROM scores")
+        conn.executemany(
+            "INSERT INTO scores(agent_id, challenge_id, value, attempts, fails, solved_at, updated_at) VALUES (?,?,?,?,?,?,?)",
+            [
+                (agent_id, challenge_id, c.value, c.attempts, c.fails, c.solved_at, c.updated_at)
+                for (agent_id, challenge_id), c in cells.items()
+            ],
+        )
+        conn.execute("DELETE FROM score_history")
+        conn.executemany(
+            "INSERT INTO score_history(agent_id, resolution, bucket, score, runs) VALUES (?,?,?,?,?)",
+            [(agent_id, res, bucket, score, n) for (agent_id, res, bucket), (score, n) in history.items()],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO score_state(key, value) VALUES ('score_mode', ?)",
+            (engine.cfg.signature(),),
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return runs
+
+
+def ensure_scores(conn: sqlite3.Connection, engine: ScoreEngine) -> bool:
+    """Recompute ``scores`` if it was built with another mode (or never built). Returns True if it did."""
+    row = fetch_one(conn, "SELECT value FROM score_state WHERE key = 'score_mode'")
+    if row and row[0] == engine.cfg.signature():
+        return False
+    recompute_scores(conn, engine)
+    return True
+
+
+def leaderboard(conn, tie_break: str = "earliest") -> list[dict]:
+    rows = fetch_all(
+        conn,
+        f"""
+        SELECT a.name as agent_name, COALESCE(SUM(s.value), 0) AS total_points
         FROM agents a
-        LEFT JOIN runs r ON r.agent_id = a.id
+        LEFT JOIN scores s ON s.agent_id = a.id
         GROUP BY a.id
-        ORDER BY total_points DESC, a.created_at ASC
+        ORDER BY ROUND(total_points) DESC, {TIE_BREAKS[tie_break]}, a.id ASC
         """,
     )
-    return [{"agent": r["agent_name"], "points": int(r["total_points"])} for r in rows]
+    return [{"agent": r["agent_name"], "points": int(round(r["total_points"]))} for r in rows]
+
+
+def score_history(conn, agent_id: int, resolution: int, since: str | None = None) -> list[dict]:
+    """Cumulative score per bucket, oldest first; ``since`` is a SQLite datetime string."""
+    rows = fetch_all(
+        conn,
+        "SELECT bucket, score, runs FROM score_history WHERE agent_id = ? AND resolution = ? AND bucket >= ? "
+        "ORDER BY bucket",
+        (agent_id, resolution, history_bucket(since, resolution) if since else ""),
+    )
+    return [{"bucket": r["bucket"], "score": int(round(r["score"])), "runs": int(r["runs"])} for r in rows]
@@ -0,0 +1,194 @@
+"""Per-challenge difficulty numbers kept in step with ``runs``.
+
+``challenge_progress`` holds one row per (challenge, agent): when the agent first tried
+the challenge, how many runs and successes it has, and how many attempts and seconds
+its first solve took. ``challenge_stats`` holds the per-challenge totals. Submits update
+both in the run's transaction with ``record_attempt``. ``backfill_stats`` rebuilds them
+from ``runs`` in a single pass. ``ensure_stats`` runs that pass once for a database
+created before the tables existed.
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+
+from labyrinth.core.db import fetch_all, fetch_one
+
+
+@dataclass
+class Progress:
+    first_at: str
+    attempts: int = 0
+    successes: int = 0
+    attempts_to_solve: int | None = None
+    solve_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class ChallengeStats:
+    challenge_id: str
+    attempts: int
+    successes: int
+    agents: int
+    solvers: int
+    attempts_to_solve: int  # summed over solvers, the solving run included
+    median_solve_seconds: float | None
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.attempts if self.attempts else 0.0
+
+    @property
+    def solve_rate(self) -> float:
+        return self.solvers / self.agents if self.agents else 0.0
+
+    @property
+    def mean_attempts_to_solve(self) -> float | None:
+        return self.attempts_to_solve / self.solvers if self.solvers else None
+
+
+def _fold(progress: Progress | None, status: str, ts: str) -> tuple[Progress, bool]:
+    """Progress after one more run, and whether that run was the first solve."""
+    p = progress or Progress(first_at=ts)
+    p.attempts += 1
+    first_solve = status == "success" and p.attempts_to_solve is None
+    if status == "success":
+        p.successes += 1
+    if first_solve:
+        p.attempts_to_solve = p.attempts
+        p.solve_seconds = max(0.0, (datetime.fromisoformat(ts) - datetime.fromisoformat(p.first_at)).total_seconds())
+    return p, first_solve
+
+
+_PROGRESS_UPSERT = """
+INSERT OR REPLACE INTO challenge_progress(challenge_id, agent_id, first_at, attempts, successes, attempts_to_solve, solve_seconds)
+VALUES (?,?,?,?,?,?,?)
+"""
+
+
+def record_attempt(conn: sqlite3.Connection, agent_id: int, challenge_id: str, status: str, ts: str) -> None:
+    """Fold one new run into the stats. Runs inside the caller's transaction; does not commit."""
+    row = fetch_one(
+        conn,
+        "SELECT first_at, attempts, successes, attempts_to_solve, solve_seconds FROM challenge_progress "
+        "WHERE challenge_id = ? AND agent_id = ?",
+        (challenge_id, agent_id),
+    )
+    progress, first_solve = _fold(Progress(*row) if row else None, status, ts)
+    conn.execute(
+        _PROGRESS_UPSERT,
+        (challenge_id, agent_id, progress.first_at, progress.attempts, progress.successes,
+         progress.attempts_to_solve, progress.solve_seconds),
+    )
+    conn.execute(
+        """
+        INSERT INTO challenge_stats(challenge_id, attempts, successes, agents, solvers, attempts_to_solve)
+        VALUES (?, 1, ?, ?, ?, ?)
+        ON CONFLICT(challenge_id) DO UPDATE SET
+          attempts = attempts + 1, successes = successes + excluded.successes, agents = agents + excluded.agents,
+          solvers = solvers + excluded.solvers, attempts_to_solve = attempts_to_solve + excluded.attempts_to_solve
+        """,
+        (challenge_id, int(status == "success"), int(row is None), int(first_solve),
+         progress.attempts if first_solve else 0),
+    )
+
+
+def forget_agent(conn: sqlite3.Connection, agent_id: int) -> None:
+    """Take an agent's runs out of the stats (its runs are being deleted). Does not commit."""
+    rows = conn.execute(
+        "SELECT challenge_id, attempts, successes, attempts_to_solve FROM challenge_progress WHERE agent_id = ?",
+        (agent_id,),
+    ).fetchall()
+    conn.executemany(
+        """
+        UPDATE challenge_stats SET attempts = attempts - ?, successes = successes - ?, agents = agents - 1,
+          solvers = solvers - ?, attempts_to_solve = attempts_to_solve - ?
+        WHERE challenge_id = ?
+        """,
+        [(attempts, successes, int(ats is not None), ats or 0, cid) for cid, attempts, successes, ats in rows],
+    )
+    conn.execute("DELETE FROM challenge_progress WHERE agent_id = ?", (agent_id,))
+
+
+def backfill_stats(conn: sqlite3.Connection) -> int:
+    """Rebuild the stats from ``runs`` in one ordered pass; returns the number of runs read."""
+    progress: dict[tuple[str, int], Progress] = {}
+    totals: dict[str, list[int]] = {}  # challenge -> [attempts, successes, agents, solvers, attempts_to_solve]
+    runs = 0
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for agent_id, challenge_id, status, ts in conn.execute(
+            "SELECT agent_id, challenge_id, status, submitted_at FROM runs ORDER BY id"
+        ):
+            key = (challenge_id, agent_id)
+            t = totals.setdefault(challenge_id, [0, 0, 0, 0, 0])
+            t[2] += key not in progress
+            progress[key], first_solve = _fold(progress.get(key), status, ts)
+            t[0] += 1
+            t[1] += status == "success"
+            if first_solve:
+                t[3] += 1
+                t[4] += progress[key].attempts
+            runs += 1
+        conn.execute("DELETE FROM challenge_progress")
+        conn.execute("DELETE FROM challenge_stats")
+        conn.executemany(
+            _PROGRESS_UPSERT,
+            [(cid, aid, p.first_at, p.attempts, p.successes, p.attempts_to_solve, p.solve_seconds)
+             for (cid, aid), p in progress.items()],
+        )
+        conn.executemany(
+            "INSERT INTO challenge_stats(challenge_id, attempts, successes, agents, solvers, attempts_to_solve) "
+            "VALUES (?,?,?,?,?,?)",
+            [(cid, *t) for cid, t in totals.items()],
+        )
+        conn.execute("INSERT OR REPLACE INTO score_state(key, value) VALUES ('challenge_stats', '1')")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return runs
+
+
+def ensure_stats(conn: sqlite3.Connection) -> bool:
+    """Backfill once if the stats have never been built. Returns True if it did."""
+    if fetch_one(conn, "SELECT 1 FROM score_state WHERE key = 'challenge_stats'"):
+        return False
+    backfill_stats(conn)
+    return True
+
+
+def _median_solve_seconds(conn: sqlite3.Connection, challenge_id: str, solvers: int) -> float | None:
+    if not solvers:
+        return None
+    rows = conn.execute(
+        "SELECT solve_seconds FROM challenge_progress WHERE challenge_id = ? AND solve_seconds IS NOT NULL "
+        "ORDER BY solve_seconds LIMIT ? OFFSET ?",
+        (challenge_id, 2 - solvers % 2, (solvers - 1) // 2),
+    ).fetchall()
+    return sum(r[0] for r in rows) / len(rows) if rows else None
+
+
+def challenge_stats(conn: sqlite3.Connection, challenge_id: str | None = None) -> list[ChallengeStats]:
+    where, params = ("WHERE challenge_id = ?", (challenge_id,)) if challenge_id else ("", ())
+    rows = fetch_all(
+        conn,
+        f"SELECT challenge_id, attempts, successes, agents, solvers, attempts_to_solve FROM challenge_stats {where} "
+        "ORDER BY challenge_id",
+        params,
+    )
+    return [
+        ChallengeStats(
+            challenge_id=r["challenge_id"],
+            attempts=int(r["attempts"]),
+            successes=int(r["successes"]),
+            agents=int(r["agents"]),
+            solvers=int(r["solvers"]),
+            attempts_to_solve=int(r["attempts_to_solve"]),
+            median_solve_seconds=_median_solve_seconds(conn, r["challenge_id"], int(r["solvers"])),
+        )
+        for r in rows
+    ]
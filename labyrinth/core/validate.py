@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from labyrinth.core.assets import PACK_NAME, open_pack
+from labyrinth.core.config import PluginSpec, load_yaml, plugin_spec_from_item
+from labyrinth.core.registry import PLUGIN_KINDS, load_plugin
+
+
+CACHE_NAME = ".labyrinth_validate_cache.json"
+# Folders that hold runtime state rather than plugin content.
+_SKIP_DIRS = {"sessions", "__pycache__"}
+
+
+@dataclass(frozen=True)
+class PluginReport:
+    id: str
+    errors: tuple[str, ...]
+    cached: bool = False
+    enabled: bool = True
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _hash_tree(h: Any, base: Path) -> None:
+    if not base.is_dir():
+        return
+    for p in sorted(base.rglob("*")):
+        rel = p.relative_to(base)
+        if any(part in _SKIP_DIRS for part in rel.parts) or not p.is_file():
+            continue
+        h.update(str(rel).encode("utf-8"))
+        h.update(p.read_bytes())
+
+
+def _code_fingerprint() -> str:
+    h = hashlib.sha256()
+    _hash_tree(h, Path(__file__).parent)
+    return h.hexdigest()
+
+
+def plugin_fingerprint(spec: PluginSpec, code: str, root: Path | None = None) -> str:
+    """Content hash of everything a plugin's validation depends on.
+
+    With ``root``, packed asset files of the plugin count too (by their sha256 in the pack index).
+    """
+    h = hashlib.sha256()
+    h.update(code.encode("utf-8"))
+    h.update(repr(spec).encode("utf-8"))
+    config = Path(spec.config_path)
+    if config.is_file():
+        h.update(config.read_bytes())
+    _hash_tree(h, Path(spec.path))
+    pack = open_pack(root / PACK_NAME) if root is not None else None
+    if pack is not None:
+        try:
+            prefix = Path(spec.path).resolve().relative_to(root.resolve()).as_posix()
+        except ValueError:
+            prefix = None
+        for key in pack.keys(prefix) if prefix is not None else ():
+            h.update(f"{key}={pack.sha256(key)}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def check_plugin(spec: PluginSpec, root: str) -> list[str]:
+    """Load one plugin and run its validators. Runs in a worker process."""
+    try:
+        loaded = load_plugin(spec)
+        validate = getattr(loaded.instance, "validate_config", None)
+        if validate is None:
+            return []
+        return list(validate(loaded.cfg, Path(spec.path), Path(root)))
+    except Exception as e:
+        return [f"{type(e).__name__}: {e}"]
+
+
+def _entry_errors(item: Any, root: Path) -> tuple[PluginSpec | None, list[str]]:
+    if not isinstance(item, dict):
+        return None, ["plugin entry must be a mapping"]
+    if not item.get("id"):
+        return None, ["missing id"]
+    if not item.get("config_path"):
+        return None, ["missing config_path"]
+    try:
+        spec = plugin_spec_from_item(item, root)
+    except KeyError:
+        return None, ["no usable path, module or kind (module must look like 'labyrinth.plugins.<id>.plugin')"]
+    errors: list[str] = []
+    if not Path(spec.config_path).is_file():
+        errors.append(f"config_path not found: {spec.config_path}")
+    if not Path(spec.path).is_dir():
+        errors.append(f"plugin path not found: {spec.path}")
+    if spec.kind and spec.kind not in PLUGIN_KINDS:
+        errors.append(f"unknown kind '{spec.kind}'")
+    elif not spec.kind and not (Path(spec.path) / "plugin.py").is_file():
+        try:
+            declares_kind = bool(load_yaml(spec.config_path).get("kind"))
+        except Exception:
+            declares_kind = False
+        if not declares_kind:
+            errors.append("plugin.py not found and no kind declared")
+    return spec, errors
+
+
+def validate_tree(master_path: str | Path, jobs: int | None = None, use_cache: bool = True) -> list[PluginReport]:
+    """Validate every plugin entry in a master config.
+
+    Plugin checks run across a process pool; results are cached next to the master
+    config keyed by a content hash, so unchanged plugins are not rechecked.
+    """
+    master = Path(master_path).resolve()
+    root = master.parent
+    raw = load_yaml(master)
+    cache_path = root / CACHE_NAME
+    cache: dict[str, Any] = {}
+    if use_cache and cache_path.exists():
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except ValueError:
+            cache = {}
+
+    code = _code_fingerprint()
+    reports: dict[int, PluginReport] = {}
+    stale: list[tuple[int, PluginSpec, str]] = []
+    seen: set[str] = set()
+    for pos, item in enumerate(raw.get("plugins", [])):
+        spec, errors = _entry_errors(item, root)
+        pid = spec.id if spec else str(item.get("id", f"#{pos}") if isinstance(item, dict) else f"#{pos}")
+        if pid in seen:
+            errors.append("duplicate plugin id")
+        seen.add(pid)
+        if spec is None or errors:
+            reports[pos] = PluginReport(id=pid, errors=tuple(errors), enabled=bool(spec and spec.enabled))
+            continue
+        digest = plugin_fingerprint(spec, code, root)
+        hit = cache.get(spec.id)
+        if hit and hit.get("hash") == digest:
+            reports[pos] = PluginReport(id=spec.id, errors=tuple(hit["errors"]), cached=True, enabled=spec.enabled)
+        else:
+            stale.append((pos, spec, digest))
+
+    if len(stale) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(check_plugin, [s for _, s, _ in stale], [str(root)] * len(stale)))
+    else:
+        results = [check_plugin(s, str(root)) for _, s, _ in stale]
+
+    for (pos, spec, digest), errors in zip(stale, results):
+        reports[pos] = PluginReport(id=spec.id, errors=tuple(errors), enabled=spec.enabled)
+        cache[spec.id] = {"hash": digest, "errors": errors}
+
+    if use_cache:
+        cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+    return [reports[pos] for pos in sorted(reports)]
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
-from wordfreq import zipf_frequency
-
 from labyrinth.core.models import ChallengeResult
 from labyrinth.core.registry import BaseChallengePlugin
+from labyrinth.core.word_ladder import solve, word_graph
+from labyrinth.core.wordlist import word_zipf
+
+# Vocabulary for sample solutions; the validator accepts any known word, so rarer ones are fine.
+SOLVER_MIN_ZIPF = 2.0
 
 
 @dataclass(frozen=True)
@@ -43,6 +48,43 @@ class WordChangeChallenge(BaseChallengePlugin):
             f"For this challenge, use Start: {wc.start}\nEnd: {wc.end}\nSteps: {wc.steps}"
         )
 
+    def validate_config(self, cfg: dict[str, Any], plugin_dir: Path, root: Path) -> list[str]:
+        errors = super().validate_config(cfg, plugin_dir, root)
+        wc = WordChangeDefinition.from_config(cfg)
+        if not wc.start or not wc.end:
+            return errors + ["word_change.start and word_change.end are required"]
+        if len(wc.start) != len(wc.end):
+            errors.append("word_change.start and word_change.end differ in length")
+        else:
+            distance = sum(1 for a, b in zip(wc.start, wc.end) if a != b)
+            if wc.steps < distance:
+                errors.append(f"word_change.steps={wc.steps} is impossible: start and end differ in {distance} letters")
+        if wc.steps <= 0:
+            errors.append("word_change.steps must be positive")
+        for word in (wc.start, wc.end):
+            if word_zipf(word) <= 0:
+                errors.append(f"'{word}' is not a known word")
+        return errors
+
+    def sample_submission(self, cfg: dict[str, Any], correct: bool, rng: random.Random) -> dict[str, Any]:
+        # A real ladder when the solver finds one of the right length. Otherwise morph start
+        # into end one letter at a time; those strings are seldom all real words, so that
+        # exercises full chain validation but rarely solves the puzzle.
+        wc = WordChangeDefinition.from_config(cfg)
+        words = solve(word_graph(len(wc.start), SOLVER_MIN_ZIPF), wc.start, wc.end, wc.steps)
+        if words is None:
+            words = [wc.start]
+            current = list(wc.start)
+            positions = [i for i, (a, b) in enumerate(zip(wc.start, wc.end)) if a != b]
+            rng.shuffle(positions)
+            for i in positions:
+                current[i] = wc.end[i]
+                words.append("".join(current))
+            words += [wc.end] * (wc.steps + 1 - len(words))
+        if not correct:
+            words.insert(1, "X" * len(wc.start))
+        return {"challenge_guid": "-".join(words)}
+
     def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
         if not self._validate_chain(submission, cfg):
             return ChallengeResult(
@@ -78,9 +120,9 @@ class WordChangeChallenge(BaseChallengePlugin):
         if any(len(w) != length for w in words):
             return False
 
-        # Validate each word is a real word (wordfreq, non-zero Zipf)
+        # Validate each word is a real word (non-zero Zipf in the word list)
         for w in words:
-            if zipf_frequency(w.lower(), "en") <= 0:
+            if word_zipf(w) <= 0:
                 return False
 
         # Validate one-letter change per step
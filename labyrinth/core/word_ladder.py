@@ -0,0 +1,306 @@
+"""Word ladders: the graph behind word-change puzzles, a solver and a puzzle generator.
+
+Words of one length are nodes; two words are adjacent when they differ in one letter.
+Neighbours are found through wildcard buckets ("S_LK" holds SILK and SULK), so building
+a graph is linear in words x length rather than quadratic in words.
+
+``ladder`` runs a bidirectional BFS, expanding the smaller frontier one whole layer at
+a time. Where the frontiers first meet it has the exact shortest distance, one shortest
+chain, and the number of shortest chains (the sum over meeting words of the path
+counts from each side); the latter rates a puzzle's difficulty.
+
+``generate_puzzles`` picks a random start, walks out exactly ``steps`` BFS layers and
+takes an end word from the last one, so the shortest chain is exactly ``steps`` long.
+Batches run on a process pool; each worker builds the graph once.
+"""
+from __future__ import annotations
+
+import os
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Mapping
+
+from labyrinth.core.wordlist import default_wordlist, wordfreq_entries
+
+DEFAULT_MIN_ZIPF = 3.0
+DIFFICULTY_BONUS = {"easy": 0, "medium": 10, "hard": 20}
+_BATCH = 50
+
+
+@dataclass(frozen=True)
+class WordGraph:
+    words: tuple[str, ...]  # uppercase, sorted
+    index: Mapping[str, int]
+    neighbors: tuple[tuple[int, ...], ...]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+@dataclass(frozen=True)
+class Ladder:
+    distance: int
+    solutions: int  # number of distinct shortest chains
+    chain: tuple[str, ...]  # one shortest chain, start to end
+
+
+@dataclass(frozen=True)
+class Puzzle:
+    start: str
+    end: str
+    steps: int
+    solutions: int
+    difficulty: str
+
+    @property
+    def points(self) -> int:
+        return 10 * self.steps + DIFFICULTY_BONUS[self.difficulty]
+
+
+def load_words(length: int, min_zipf: float = DEFAULT_MIN_ZIPF) -> list[str]:
+    """English words of ``length`` ASCII letters with a Zipf frequency of at least ``min_zipf``."""
+    words = default_wordlist()
+    if words is not None:
+        return [w.upper() for w in words.words(length, min_zipf)]
+    return sorted(w.upper() for w, _ in wordfreq_entries(min_zipf, length) if len(w) == length)
+
+
+def build_graph(words: Iterable[str]) -> WordGraph:
+    ordered = tuple(sorted({w.upper() for w in words}))
+    buckets: dict[str, list[int]] = defaultdict(list)
+    for i, w in enumerate(ordered):
+        for p in range(len(w)):
+            buckets[f"{w[:p]}_{w[p + 1:]}"].append(i)
+    neighbors: list[set[int]] = [set() for _ in ordered]
+    for members in buckets.values():
+        if len(members) > 1:
+            for i in members:
+                neighbors[i].update(members)
+    return WordGraph(
+        words=ordered,
+        index={w: i for i, w in enumerate(ordered)},
+        neighbors=tuple(tuple(sorted(n - {i})) for i, n in enumerate(neighbors)),
+    )
+
+
+@lru_cache(maxsize=8)
+def word_graph(length: int, min_zipf: float = DEFAULT_MIN_ZIPF) -> WordGraph:
+    return build_graph(load_words(length, min_zipf))
+
+
+def _walk(parent: dict[int, int], node: int) -> list[int]:
+    path = [node]
+    while parent[path[-1]] >= 0:
+        path.append(parent[path[-1]])
+    return path
+
+
+def ladder(graph: WordGraph, start: str, end: str) -> Ladder | None:
+    """The shortest ladders from ``start`` to ``end``, or None if they are not connected."""
+    s, e = graph.index.get(start.upper()), graph.index.get(end.upper())
+    if s is None or e is None:
+        return None
+    if s == e:
+        return Ladder(distance=0, solutions=1, chain=(graph.words[s],))
+    # Per side: distance, shortest-path count and BFS parent per reached word, and the frontier.
+    dist = [{s: 0}, {e: 0}]
+    count = [{s: 1}, {e: 1}]
+    parent = [{s: -1}, {e: -1}]
+    frontier = [[s], [e]]
+    while frontier[0] and frontier[1]:
+        k = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        d, c, par = dist[k], count[k], parent[k]
+        layer: list[int] = []
+        for u in frontier[k]:
+            du = d[u]
+            for v in graph.neighbors[u]:
+                if v not in d:
+                    d[v], c[v], par[v] = du + 1, c[u], u
+                    layer.append(v)
+                elif d[v] == du + 1:
+                    c[v] += c[u]
+        frontier[k] = layer
+        other = dist[1 - k]
+        meet = [v for v in layer if v in other]
+        if meet:
+            # Every meeting word lies on a shortest chain at the same depth from each side.
+            m = min(meet, key=graph.words.__getitem__)
+            chain = _walk(parent[0], m)[::-1] + _walk(parent[1], m)[1:]
+            return Ladder(
+                distance=dist[0][m] + dist[1][m],
+                solutions=sum(count[0][v] * count[1][v] for v in meet),
+                chain=tuple(graph.words[i] for i in chain),
+            )
+    return None
+
+
+def solve(graph: WordGraph, start: str, end: str, steps: int) -> list[str] | None:
+    """A chain of exactly ``steps`` changes, padding a shorter ladder.
+
+    An odd surplus is taken by a detour through a third word of some step's bucket (A->C->B
+    instead of A->B); an even one by stepping back and forth.
+    """
+    found = ladder(graph, start, end)
+    if found is None or found.distance > steps:
+        return None
+    chain = list(found.chain)
+    if (steps - found.distance) % 2:
+        for i, (a, b) in enumerate(zip(chain, chain[1:])):
+            shared = set(graph.neighbors[graph.index[a]]) & set(graph.neighbors[graph.index[b]])
+            if shared:
+                chain.insert(i + 1, graph.words[min(shared)])
+                break
+        else:
+            return None
+    if len(chain) == 1:
+        if steps == 0:
+            return chain
+        nbrs = graph.neighbors[graph.index[chain[0]]]
+        if not nbrs:
+            return None
+        chain.append(graph.words[nbrs[0]])
+        chain.append(chain[0])
+    while len(chain) < steps + 1:
+        chain += chain[-2:]
+    return chain
+
+
+def rate(solutions: int) -> str:
+    return "hard" if solutions <= 2 else "medium" if solutions <= 12 else "easy"
+
+
+def make_puzzle(graph: WordGraph, steps: int, rng: random.Random, max_solutions: int | None = None) -> Puzzle | None:
+    """One puzzle whose shortest chain is exactly ``steps`` long, or None if this start has none."""
+    s = rng.randrange(len(graph))
+    seen, layer = {s}, [s]
+    for _ in range(steps):
+        nxt = []
+        for u in layer:
+            for v in graph.neighbors[u]:
+                if v not in seen:
+                    seen.add(v)
+                    nxt.append(v)
+        if not nxt:
+            return None
+        layer = nxt
+    e = rng.choice(layer)
+    found = ladder(graph, graph.words[s], graph.words[e])
+    assert found is not None and found.distance == steps
+    if max_solutions is not None and found.solutions > max_solutions:
+        return None
+    return Puzzle(
+        start=graph.words[s],
+        end=graph.words[e],
+        steps=steps,
+        solutions=found.solutions,
+        difficulty=rate(found.solutions),
+    )
+
+
+_worker: WordGraph | None = None
+
+
+def _init_worker(length: int, min_zipf: float) -> None:
+    global _worker
+    _worker = word_graph(length, min_zipf)
+
+
+def _batch(seed: int, size: int, steps: tuple[int, int], max_solutions: int | None) -> list[Puzzle]:
+    assert _worker is not None
+    rng = random.Random(seed)
+    puzzles = []
+    for _ in range(size * 4):  # some starts sit in components too small for the step count
+        p = make_puzzle(_worker, rng.randint(*steps), rng, max_solutions)
+        if p is not None:
+            puzzles.append(p)
+            if len(puzzles) == size:
+                break
+    return puzzles
+
+
+def generate_puzzles(
+    count: int,
+    length: int = 4,
+    steps: tuple[int, int] = (4, 7),
+    min_zipf: float = DEFAULT_MIN_ZIPF,
+    max_solutions: int | None = None,
+    workers: int | None = None,
+    seed: int = 0,
+    exclude: Iterable[tuple[str, str]] = (),
+) -> list[Puzzle]:
+    """Up to ``count`` distinct puzzles; fewer only if repeated batches find nothing new."""
+    workers = workers or os.cpu_count() or 1
+    seen = {(a.upper(), b.upper()) for a, b in exclude}
+    seen |= {(b, a) for a, b in seen}
+    puzzles: list[Puzzle] = []
+    rounds = 0
+
+    def take(batch: list[Puzzle]) -> bool:
+        new = False
+        for p in batch:
+            if len(puzzles) < count and (p.start, p.end) not in seen:
+                seen.update({(p.start, p.end), (p.end, p.start)})
+                puzzles.append(p)
+                new = True
+        return new
+
+    if workers == 1:
+        _init_worker(length, min_zipf)
+        while len(puzzles) < count and rounds < 3:
+            rounds = 0 if take(_batch(seed, _BATCH, steps, max_solutions)) else rounds + 1
+            seed += 1
+        return puzzles
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(length, min_zipf)) as pool:
+        while len(puzzles) < count and rounds < 3:
+            jobs = max(workers, -(-(count - len(puzzles)) // _BATCH))
+            futures = [pool.submit(_batch, seed + j, _BATCH, steps, max_solutions) for j in range(jobs)]
+            seed += jobs
+            found = False
+            for f in futures:
+                found = take(f.result()) or found
+            rounds = 0 if found else rounds + 1
+    return puzzles
+
+
+def plugin_config(puzzle: Puzzle, plugin_id: str, name: str) -> str:
+    """``config.yaml`` for a generated puzzle, in the layout of the shipped word_change plugins."""
+    return f"""challenge:
+  id: "{plugin_id}"
+  name: "{name}"
+  version: "0.0.1"
+  description: "Transform a word into another using valid intermediate words."
+  goal: "Change the start word into the end word using the exact number of steps."
+  points:
+    on_success: {puzzle.points}
+    on_repeat: 0
+  inputs:
+    challenge_guid: "string; submit the GUID derived from your word chain"
+  capabilities:
+    - "labyrinth challenge manifest {plugin_id}"
+    - "labyrinth challenge info {plugin_id}"
+    - "labyrinth challenge submit {plugin_id} --agent <agent_name> --json <payload>"
+
+word_change:
+  start: "{puzzle.start}"
+  end: "{puzzle.end}"
+  steps: {puzzle.steps}
+  difficulty: "{puzzle.difficulty}"
+  solutions: {puzzle.solutions}
+
+prompts:
+  instructions: |
+    Can you change the start word into the end word using the number of steps given?
+    Change only one letter per step and do not change the order of the letters.
+    Each step should produce a real word. For example, to change BEAD into TRIM in 4 steps
+    the solution would be BEAD->BEAM->TEAM->TRAM->TRIM. Generate a GUID from your solution
+    by listing your words with dashes (for example, "BEAD-BEAM-TEAM-TRAM-TRIM") and submitting
+    it for confirmation.
+
+    Start: {puzzle.start}
+    End: {puzzle.end}
+    Steps: {puzzle.steps}
+"""
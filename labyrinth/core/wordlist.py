@@ -0,0 +1,153 @@
+"""A compact English word list for word validation without wordfreq at runtime.
+
+``labyrinth words build`` writes the list from wordfreq once; lookups then only mmap
+the file. Layout (little-endian)::
+
+    header   "<8sI"   magic, number of sections
+    sections "<III"   word length, word count, byte offset of the records
+    records           per section, sorted: the lowercase word, then one byte of
+                      Zipf frequency in tenths, rounded down (1-255)
+
+Every record in a section has the same width, so a lookup is a binary search over
+the mapped bytes, with nothing parsed or loaded up front. Only ASCII alphabetic
+words are kept; those are the only ones a word-change chain can contain.
+
+``word_zipf`` uses the list shipped in ``labyrinth/data`` and falls back to
+wordfreq only if that file is missing.
+"""
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator
+
+MAGIC = b"LABYWRD1"
+_HEADER = struct.Struct("<8sI")
+_SECTION = struct.Struct("<III")
+DEFAULT_WORDLIST = Path(__file__).resolve().parents[1] / "data" / "words_en.bin"
+
+
+class WordListError(ValueError):
+    pass
+
+
+def _bucket(zipf: float) -> int:
+    return max(1, min(255, math.floor(zipf * 10)))  # floored, so a min_zipf filter never admits less common words
+
+
+def wordfreq_entries(min_zipf: float = 0.0, max_length: int | None = None) -> Iterator[tuple[str, float]]:
+    """(word, zipf) for the English words wordfreq rates above ``min_zipf`` (and above 0)."""
+    from wordfreq import get_frequency_dict
+
+    for word, freq in get_frequency_dict("en").items():
+        if not (word.isascii() and word.isalpha()) or (max_length and len(word) > max_length):
+            continue
+        zipf = round(math.log10(freq * 1e9), 2)  # as wordfreq.zipf_frequency rounds it
+        if zipf > 0 and zipf >= min_zipf:
+            yield word.lower(), zipf
+
+
+def build_wordlist(out: str | Path, entries: Iterable[tuple[str, float]]) -> int:
+    """Write a word list from (word, zipf) pairs; returns the number of words written."""
+    by_length: dict[int, dict[bytes, int]] = {}
+    for word, zipf in entries:
+        key = word.lower().encode("ascii")
+        section = by_length.setdefault(len(key), {})
+        section[key] = max(section.get(key, 0), _bucket(zipf))
+    lengths = sorted(by_length)
+    offset = _HEADER.size + _SECTION.size * len(lengths)
+    table, blobs = [], []
+    for length in lengths:
+        section = by_length[length]
+        blobs.append(b"".join(w + bytes([section[w]]) for w in sorted(section)))
+        table.append(_SECTION.pack(length, len(section), offset))
+        offset += len(blobs[-1])
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(_HEADER.pack(MAGIC, len(lengths)) + b"".join(table) + b"".join(blobs))
+    os.replace(tmp, out)
+    return sum(len(s) for s in by_length.values())
+
+
+class WordList:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            raise WordListError(f"{self.path}: not a word list")
+        magic, n = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise WordListError(f"{self.path}: not a word list")
+        self._sections: dict[int, tuple[int, int]] = {}
+        for i in range(n):
+            length, count, offset = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            if offset + count * (length + 1) > len(self._mm):
+                raise WordListError(f"{self.path}: truncated")
+            self._sections[length] = (count, offset)
+
+    def __len__(self) -> int:
+        return sum(count for count, _ in self._sections.values())
+
+    @property
+    def lengths(self) -> list[int]:
+        return sorted(self._sections)
+
+    def zipf(self, word: str) -> float:
+        """The word's Zipf frequency rounded down to a tenth, or 0.0 if it is not in the list."""
+        try:
+            key = word.lower().encode("ascii")
+        except UnicodeEncodeError:
+            return 0.0
+        if len(key) not in self._sections:
+            return 0.0
+        count, offset = self._sections[len(key)]
+        width = len(key) + 1
+        lo, hi = 0, count
+        mm = self._mm
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = offset + mid * width
+            probe = mm[start : start + width - 1]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mm[start + width - 1] / 10
+        return 0.0
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.zipf(word) > 0
+
+    def words(self, length: int, min_zipf: float = 0.0) -> Iterator[str]:
+        """Lowercase words of ``length`` letters, in order, rated at least ``min_zipf``."""
+        if length not in self._sections:
+            return
+        count, offset = self._sections[length]
+        floor = math.ceil(round(min_zipf * 10, 6))
+        width = length + 1
+        mm = self._mm
+        for start in range(offset, offset + count * width, width):
+            if mm[start + length] >= floor:
+                yield mm[start : start + length].decode("ascii")
+
+
+@lru_cache(maxsize=None)
+def default_wordlist() -> WordList | None:
+    return WordList(DEFAULT_WORDLIST) if DEFAULT_WORDLIST.is_file() else None
+
+
+def word_zipf(word: str) -> float:
+    """Zipf frequency of an English word; 0.0 for unknown words."""
+    words = default_wordlist()
+    if words is not None:
+        return words.zipf(word)
+    from wordfreq import zipf_frequency
+
+    return zipf_frequency(word.lower(), "en")
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import re
 from dataclasses import asdict
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from labyrinth.plugins.breadcrumb_labyrinth.loader import load_usable_types, load_world
-from labyrinth.plugins.breadcrumb_labyrinth.models import State, World
-from labyrinth.plugins.breadcrumb_labyrinth.render import render_room
+from labyrinth.plugins.breadcrumb_labyrinth.models import State
+from labyrinth.plugins.breadcrumb_labyrinth.render import RoomRenderer
+from labyrinth.plugins.breadcrumb_labyrinth.usables import Reply, compile_usables
 
 
 GUID_RE = re.compile(r"[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}")
@@ -18,6 +20,29 @@ class Engine:
         self.base_dir = base_dir
         self.usable_types = load_usable_types(base_dir / "usable_types.json")
         self.world = load_world(base_dir / "world.json", self.usable_types)
+        self.renderer = RoomRenderer(self.world)
+        self.usables = compile_usables(self.world, self.usable_types)
+
+        fairness = self.world.fairness
+        self.reveal_required_item_name = bool(fairness.get("reveal_required_item_name", False))
+        self.auto_describe_items = bool(fairness.get("auto_describe_items_on_acquire", False))
+        self.case_insensitive_submit = bool(fairness.get("accept_case_insensitive_submit", False))
+        self.movement_failure_repeats_room = bool(fairness.get("movement_failure_repeats_room", False))
+        self.target_guid = self._extract_guid()
+
+        # verb -> (handler(state, arg), requires an entered session)
+        self.commands: dict[str, tuple[Callable[[Any, str], Reply], bool]] = {
+            "ENTER": (self._enter, False),
+            "N": (partial(self._move, "N"), True),
+            "E": (partial(self._move, "E"), True),
+            "S": (partial(self._move, "S"), True),
+            "W": (partial(self._move, "W"), True),
+            "LOOK": (self._look, True),
+            "INVENTORY": (self._inventory, True),
+            "GET": (self._get, True),
+            "USE": (self._use, True),
+            "SUBMIT": (self._submit, True),
+        }
 
     def initial_state(self) -> State:
         item_visibility = {item_id: item.initially_visible for item_id, item in self.world.items.items()}
@@ -43,38 +68,33 @@ class Engine:
             return "ERROR: Empty command.", state, False, False
 
         head, *rest = cmd.split()
-        head_upper = head.upper()
+        entry = self.commands.get(head.upper())
+        if entry is None or entry[1]:
+            if state is None or not state.started:
+                return "ERROR: You must Enter first.", state, False, False
+        if entry is None:
+            return "ERROR: Unknown command.", state, False, False
 
-        if head_upper == "ENTER":
-            state = self.initial_state()
-            return render_room(self.world, state), state, True, False
+        handler, _ = entry
+        return handler(state, " ".join(rest).strip())
 
-        if state is None or not state.started:
-            return "ERROR: You must Enter first.", state, False, False
+    def reply(self, message: str, state: State) -> str:
+        return message + "\n\n" + self.renderer.render(state)
 
-        if head_upper in {"N", "E", "S", "W"}:
-            return self._move(state, head_upper)
-
-        if head_upper == "LOOK":
-            return render_room(self.world, state), state, False, False
-
-        if head_upper == "INVENTORY":
-            return self._inventory(state), state, False, False
-
-        if head_upper == "GET":
-            return self._get(state)
-
-        if head_upper == "USE":
-            item = " ".join(rest).strip() if rest else None
-            return self._use(state, item)
+    def grant_item(self, state: State, item_id: str, message: str) -> str:
+        state.inventory.append(item_id)
+        if self.auto_describe_items:
+            message = message + "\n" + self.world.items[item_id].description
+        return message
 
-        if head_upper == "SUBMIT":
-            guid = " ".join(rest).strip()
-            return self._submit(state, guid)
+    def _enter(self, state: State | None, arg: str) -> Reply:
+        state = self.initial_state()
+        return self.renderer.render(state), state, True, False
 
-        return "ERROR: Unknown command.", state, False, False
+    def _look(self, state: State, arg: str) -> Reply:
+        return self.renderer.render(state), state, False, False
 
-    def _move(self, state: State, direction: str) -> tuple[str, State, bool, bool]:
+    def _move(self, direction: str, state: State, arg: str) -> Reply:
         room = self.world.rooms[state.current_room]
         target = room.exits.get(direction)
         if not target and state.dynamic_exits.get(room.room_id):
@@ -82,21 +102,21 @@ class Engine:
 
         if not target:
             msg = "You cannot go that way."
-            if self.world.fairness.get("movement_failure_repeats_room", False):
-                return msg + "\n\n" + render_room(self.world, state), state, False, False
+            if self.movement_failure_repeats_room:
+                return self.reply(msg, state), state, False, False
             return msg, state, False, False
 
         state.current_room = target
         state.step_count += 1
-        return render_room(self.world, state), state, True, False
+        return self.renderer.render(state), state, True, False
 
-    def _inventory(self, state: State) -> str:
+    def _inventory(self, state: State, arg: str) -> Reply:
         if not state.inventory:
-            return "Inventory: (empty)"
+            return "Inventory: (empty)", state, False, False
         names = [self.world.items[item_id].name for item_id in state.inventory]
-        return "Inventory: " + ", ".join(names)
+        return "Inventory: " + ", ".join(names), state, False, False
 
-    def _get(self, state: State) -> tuple[str, State, bool, bool]:
+    def _get(self, state: State, arg: str) -> Reply:
         room = self.world.rooms[state.current_room]
         if not room.floor_item:
             return "Nothing to get here.", state, False, False
@@ -112,13 +132,13 @@ class Engine:
         state.step_count += 1
 
         item = self.world.items[item_id]
-        if self.world.fairness.get("auto_describe_items_on_acquire", False):
+        if self.auto_describe_items:
             msg = item.description
         else:
             msg = f"You pick up {item.name}."
-        return msg + "\n\n" + render_room(self.world, state), state, True, False
+        return self.reply(msg, state), state, True, False
 
-    def _use(self, state: State, item_arg: str | None) -> tuple[str, State, bool, bool]:
+    def _use(self, state: State, item_arg: str) -> Reply:
         room = self.world.rooms[state.current_room]
         if not room.usable:
             return "Nothing to use here.", state, False, False
@@ -133,82 +153,10 @@ class Engine:
         else:
             item_id = None
 
-        if u.type == "Chest":
-            return self._use_chest(state, u, ustate, item_id)
-        if u.type == "Button":
-            return self._use_button(state, u, ustate)
-        if u.type == "Door":
-            return self._use_door(state, u, ustate, item_id)
-
-        return "Nothing happens.", state, False, False
-
-    def _use_chest(self, state: State, u, ustate: dict[str, Any], item_id: str | None):
-        if ustate.get("locked"):
-            if item_id and item_id == u.requires_item:
-                ustate["locked"] = False
-                ustate["used"] = True
-                state.usable_state[u.usable_id] = ustate
-                state.step_count += 1
-                msg = u.config.get("on_unlock", {}).get("message", "You open the chest.")
-                grant = u.config.get("on_unlock", {}).get("grant_item")
-                if grant:
-                    state.inventory.append(grant)
-                    if self.world.fairness.get("auto_describe_items_on_acquire", False):
-                        msg = msg + "\n" + self.world.items[grant].description
-                return msg + "\n\n" + render_room(self.world, state), state, True, False
-            msg = u.config.get("message_locked", "The chest is locked.")
-            if self.world.fairness.get("reveal_required_item_name", False) and u.requires_item:
-                msg += f" It seems to need {self.world.items[u.requires_item].name}."
-            return msg, state, False, False
-
-        if ustate.get("used"):
-            return "The chest is empty.", state, False, False
-
-        ustate["used"] = True
-        state.usable_state[u.usable_id] = ustate
-        state.step_count += 1
-        msg = u.config.get("on_unlock", {}).get("message", "You open the chest.")
-        grant = u.config.get("on_unlock", {}).get("grant_item")
-        if grant:
-            state.inventory.append(grant)
-            if self.world.fairness.get("auto_describe_items_on_acquire", False):
-                msg = msg + "\n" + self.world.items[grant].description
-        return msg + "\n\n" + render_room(self.world, state), state, True, False
-
-    def _use_button(self, state: State, u, ustate: dict[str, Any]):
-        if ustate.get("used"):
-            return "Nothing else happens.", state, False, False
-
-        ustate["used"] = True
-        state.usable_state[u.usable_id] = ustate
-        state.step_count += 1
-
-        reveal = u.config.get("reveals_item")
-        if reveal:
-            state.item_visibility[reveal] = True
-
-        msg = u.config.get("message", "You press the button.")
-        return msg + "\n\n" + render_room(self.world, state), state, True, False
-
-    def _use_door(self, state: State, u, ustate: dict[str, Any], item_id: str | None):
-        if ustate.get("locked"):
-            if item_id and item_id == u.requires_item:
-                ustate["locked"] = False
-                ustate["used"] = True
-                state.usable_state[u.usable_id] = ustate
-                state.step_count += 1
-                reveals = u.config.get("reveals_exit", {})
-                direction = reveals.get("direction")
-                to_room = reveals.get("to_room")
-                state.dynamic_exits.setdefault(state.current_room, {})[direction] = to_room
-                msg = u.config.get("message_unlocked", "The door unlocks.")
-                return msg + "\n\n" + render_room(self.world, state), state, True, False
-            msg = u.config.get("message_locked", "The door is locked.")
-            if self.world.fairness.get("reveal_required_item_name", False) and u.requires_item:
-                msg += f" It seems to need {self.world.items[u.requires_item].name}."
-            return msg, state, False, False
-
-        return "The door stands open.", state, False, False
+        handler = self.usables.get(u.usable_id)
+        if handler is None:
+            return "Nothing happens.", state, False, False
+        return handler.use(self, state, ustate, item_id)
 
     def _resolve_item_id(self, state: State, item_arg: str) -> str | None:
         arg = item_arg.strip().lower()
@@ -219,9 +167,9 @@ class Engine:
                 return item_id
         return None
 
-    def _submit(self, state: State, guid: str) -> tuple[str, State, bool, bool]:
+    def _submit(self, state: State, guid: str) -> Reply:
         state.step_count += 1
-        target_guid = self._extract_guid()
+        target_guid = self.target_guid
         if not target_guid:
             return "FAIL: GUID not found in world.", state, True, False
 
@@ -229,7 +177,7 @@ class Engine:
         if not has_paper:
             return "FAIL: You do not possess the paper.", state, True, False
 
-        if self.world.fairness.get("accept_case_insensitive_submit", False):
+        if self.case_insensitive_submit:
             ok = guid.strip().lower() == target_guid.lower()
         else:
             ok = guid.strip() == target_guid
@@ -0,0 +1,177 @@
+"""Fuzz and benchmark the breadcrumb engine.
+
+Drives ``Engine.handle`` with random or grammar-based command sequences across a
+process pool, checks state invariants after every command, and reports throughput:
+
+    python -m labyrinth.plugins.breadcrumb_labyrinth.fuzz --sequences 20000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from labyrinth.plugins.breadcrumb_labyrinth.engine import Engine
+from labyrinth.plugins.breadcrumb_labyrinth.models import State
+
+
+PLUGIN_DIR = Path(__file__).parent
+
+
+@dataclass
+class FuzzReport:
+    worker: int
+    sequences: int = 0
+    commands: int = 0
+    seconds: float = 0.0
+    passes: int = 0
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        return self.commands / self.seconds if self.seconds else 0.0
+
+
+def _vocabulary(engine: Engine) -> list[str]:
+    words = ["Enter", "N", "E", "S", "W", "Look", "Inventory", "Get", "Use", "Submit"]
+    for item_id, item in engine.world.items.items():
+        words += [f"Use {item.name}", f"Use {item_id}", f"use {item.name.lower()}"]
+    if engine.target_guid:
+        words += [f"Submit {engine.target_guid}", f"Submit {engine.target_guid.lower()}"]
+    return words
+
+
+def random_command(rng: random.Random, vocab: list[str]) -> str:
+    """Mostly valid commands, with some noise: junk verbs, odd spacing, empty strings."""
+    roll = rng.random()
+    if roll < 0.85:
+        return rng.choice(vocab)
+    if roll < 0.92:
+        return " " + rng.choice(vocab).swapcase() + "  "
+    if roll < 0.97:
+        return "".join(rng.choice(string.printable) for _ in range(rng.randint(0, 12)))
+    return ""
+
+
+def grammar_sequence(rng: random.Random, engine: Engine, length: int) -> list[str]:
+    """A walk that favours moves through real exits and using what the agent carries."""
+    seq = ["Enter"]
+    room_id = engine.world.start_room
+    for _ in range(length - 1):
+        room = engine.world.rooms[room_id]
+        roll = rng.random()
+        if roll < 0.45 and room.exits:
+            direction, room_id = rng.choice(sorted(room.exits.items()))
+            seq.append(direction)
+        elif roll < 0.65:
+            seq.append("Get")
+        elif roll < 0.9:
+            item = rng.choice(list(engine.world.items.values()))
+            seq.append(rng.choice(["Use", f"Use {item.name}"]))
+        elif engine.target_guid:
+            seq.append(f"Submit {engine.target_guid}")
+        else:
+            seq.append("Look")
+    return seq
+
+
+def check_invariants(engine: Engine, before_steps: int | None, after: State | None, command: str, passed: bool) -> str | None:
+    if after is None:
+        return None if before_steps is None else "state lost"
+    if after.current_room not in engine.world.rooms:
+        return f"unknown room {after.current_room!r}"
+    unknown = [i for i in after.inventory if i not in engine.world.items]
+    if unknown:
+        return f"unknown inventory items {unknown}"
+    is_enter = command.strip().upper().split()[:1] == ["ENTER"]
+    if before_steps is not None and not is_enter and after.step_count < before_steps:
+        return f"step_count went from {before_steps} to {after.step_count}"
+    if passed and "paper_guid" not in after.inventory:
+        return "PASS without holding paper_guid"
+    return None
+
+
+def run_worker(worker: int, sequences: int, length: int, seed: int, mode: str = "mixed", base_dir: str | None = None) -> FuzzReport:
+    engine = Engine(Path(base_dir) if base_dir else PLUGIN_DIR)
+    vocab = _vocabulary(engine)
+    rng = random.Random(seed + worker)
+    report = FuzzReport(worker=worker)
+    handle = engine.handle
+    start = time.perf_counter()
+    for _ in range(sequences):
+        use_grammar = mode == "grammar" or (mode == "mixed" and rng.random() < 0.5)
+        if use_grammar:
+            commands = grammar_sequence(rng, engine, length)
+        else:
+            commands = [random_command(rng, vocab) for _ in range(length)]
+        state: State | None = None
+        for command in commands:
+            before_steps = state.step_count if state is not None else None
+            try:
+                _, state, _, passed = handle(state, command)
+            except Exception as e:
+                report.failures.append(f"{type(e).__name__}: {e} after {command!r} in {commands}")
+                break
+            report.commands += 1
+            problem = check_invariants(engine, before_steps, state, command, passed)
+            if problem:
+                report.failures.append(f"{problem} after {command!r} in {commands}")
+                break
+            if passed:
+                report.passes += 1
+        report.sequences += 1
+        if len(report.failures) >= 20:
+            break
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def fuzz(
+    sequences: int,
+    length: int = 30,
+    workers: int = 1,
+    seed: int = 0,
+    mode: str = "mixed",
+    base_dir: str | None = None,
+) -> list[FuzzReport]:
+    per_worker = [sequences // workers + (1 if i < sequences % workers else 0) for i in range(workers)]
+    if workers == 1:
+        return [run_worker(0, per_worker[0], length, seed, mode, base_dir)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_worker, i, n, length, seed, mode, base_dir) for i, n in enumerate(per_worker)
+        ]
+        return [f.result() for f in futures]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sequences", type=int, default=10000, help="total command sequences")
+    parser.add_argument("--length", type=int, default=30, help="commands per sequence")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=["random", "grammar", "mixed"], default="mixed")
+    parser.add_argument("--world-dir", default=None, help="folder with world.json and usable_types.json")
+    args = parser.parse_args(argv)
+
+    wall = time.perf_counter()
+    reports = fuzz(args.sequences, args.length, args.workers, args.seed, args.mode, args.world_dir)
+    wall = time.perf_counter() - wall
+
+    total = sum(r.commands for r in reports)
+    for r in reports:
+        print(f"worker {r.worker}: {r.sequences} sequences, {r.commands} commands, {r.rate:,.0f} cmd/s, {r.passes} passes")
+    print(f"total: {total} commands in {wall:.2f}s ({total / wall if wall else 0:,.0f} cmd/s wall)")
+    failures = [f for r in reports for f in r.failures]
+    for f in failures[:20]:
+        print(f"FAIL {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any
 
 from labyrinth.plugins.breadcrumb_labyrinth.models import Item, Room, Usable, World
+from labyrinth.plugins.breadcrumb_labyrinth.usables import BEHAVIORS, behavior_of
 
 
 VALID_DIRECTIONS = {"N", "E", "S", "W"}
@@ -50,6 +51,9 @@ def validate_world(world_data: dict[str, Any], usable_types: dict[str, Any]) ->
         utype = usable.get("type")
         if utype not in usable_types:
             raise ValueError(f"unknown usable type {utype} in {room_id}")
+        behavior = behavior_of(utype, usable_types)
+        if behavior not in BEHAVIORS:
+            raise ValueError(f"usable type {utype} has unknown behavior {behavior}")
 
         uid = usable.get("id")
         if uid in usable_ids:
@@ -63,7 +67,7 @@ def validate_world(world_data: dict[str, Any], usable_types: dict[str, Any]) ->
         if requires_item and not locked:
             raise ValueError(f"requires_item set but locked=false in {room_id}")
 
-        if utype == "Door":
+        if behavior == "door":
             reveals = usable.get("reveals_exit", {})
             direction = reveals.get("direction")
             to_room = reveals.get("to_room")
@@ -98,6 +102,7 @@ def load_world(path: Path, usable_types: dict[str, Any]) -> World:
                 locked=bool(u.get("locked", False)),
                 requires_item=u.get("requires_item"),
                 config=u,
+                idle_status=str(usable_types.get(u.get("type"), {}).get("idle_status", "open")),
             )
         rooms[room_id] = Room(
             room_id=room_id,
@@ -20,6 +20,7 @@ class Usable:
     locked: bool
     requires_item: str | None
     config: dict[str, Any]
+    idle_status: str = "open"
 
 
 @dataclass(frozen=True)
@@ -1,42 +1,76 @@
 from __future__ import annotations
 
 import json
+import random
 from pathlib import Path
 
 from labyrinth.core.models import ChallengeResult
-from labyrinth.core.registry import BaseChallengePlugin
-from labyrinth.plugins.breadcrumb_labyrinth.engine import Engine, state_from_dict, state_to_dict
+from labyrinth.core.registry import BaseChallengePlugin, SubmissionBusy
+from labyrinth.plugins.breadcrumb_labyrinth.engine import GUID_RE, Engine, state_from_dict, state_to_dict
+from labyrinth.plugins.breadcrumb_labyrinth.fuzz import grammar_sequence
+from labyrinth.plugins.breadcrumb_labyrinth.loader import load_usable_types, validate_world
+from labyrinth.plugins.breadcrumb_labyrinth.sessions import SessionStore, StaleSession
+
+# Attempts at a command or script whose session another process saved in the meantime.
+SAVE_ATTEMPTS = 20
 
 
 class Plugin(BaseChallengePlugin):
     id = "breadcrumb_labyrinth"
     name = "Breadcrumb Labyrinth"
+    _engine_instance: Engine | None = None
+
+    def _sessions_dir(self) -> Path:
+        return (self.state_dir or Path(__file__).parent) / "sessions"
+
+    def _sessions(self) -> SessionStore:
+        return SessionStore(self._sessions_dir())
+
+    def reset(self, cfg: dict, agent_name: str | None = None) -> None:
+        if agent_name is not None:
+            self._sessions().delete(agent_name)
+        elif self._sessions_dir().exists():
+            self._sessions().clear()
 
-    def _session_path(self, agent_name: str) -> Path:
-        safe = "".join(c for c in agent_name if c.isalnum() or c in ("-", "_")).strip()
-        if not safe:
-            safe = "agent"
-        sessions = Path(__file__).parent / "sessions"
-        sessions.mkdir(parents=True, exist_ok=True)
-        return sessions / f"{safe}.json"
+    def _engine(self) -> Engine:
+        # Built once per plugin instance so the world and render cache survive across submits.
+        if self._engine_instance is None:
+            self._engine_instance = Engine(Path(__file__).parent)
+        return self._engine_instance
 
     def get_instructions(self, cfg: dict) -> str:
         return cfg.get("prompts", {}).get("instructions", "").strip()
 
+    def validate_config(self, cfg: dict, plugin_dir: Path, root: Path) -> list[str]:
+        errors = super().validate_config(cfg, plugin_dir, root)
+        try:
+            usable_types = load_usable_types(plugin_dir / "usable_types.json")
+            world = json.loads((plugin_dir / "world.json").read_text(encoding="utf-8"))
+            validate_world(world, usable_types)
+        except (OSError, ValueError) as e:
+            return errors + [f"world.json: {e}"]
+        paper = world.get("items", {}).get("paper_guid", {})
+        if not GUID_RE.search(str(paper.get("description", ""))):
+            errors.append("world.json: paper_guid description has no GUID")
+        return errors
+
+    def sample_submission(self, cfg: dict, correct: bool, rng: random.Random) -> dict:
+        # A random walk through real exits; it may or may not reach the paper before submitting.
+        commands = grammar_sequence(rng, self._engine(), 20)
+        if correct and self._engine().target_guid:
+            commands.append(f"Submit {self._engine().target_guid}")
+        return {"commands": commands}
+
     def submit(self, agent_name: str, submission: dict, cfg: dict) -> ChallengeResult:
+        if "commands" in submission:
+            return self._submit_script(agent_name, submission.get("commands"), cfg)
+
         command = submission.get("command")
         if not isinstance(command, str):
             return ChallengeResult(status="fail", points=0, message="Missing command.")
 
-        engine = Engine(Path(__file__).parent)
-        session_path = self._session_path(agent_name)
-        state = None
-        if session_path.exists():
-            state = state_from_dict(json.loads(session_path.read_text(encoding="utf-8")))
-
-        output, new_state, changed, passed = engine.handle(state, command)
-        if changed and new_state is not None:
-            session_path.write_text(json.dumps(state_to_dict(new_state), indent=2), encoding="utf-8")
+        steps, _, passed = self._play(agent_name, [command])
+        output = steps[-1]["output"]
 
         if command.strip().upper().startswith("SUBMIT"):
             status = "success" if passed else "fail"
@@ -44,3 +78,53 @@ class Plugin(BaseChallengePlugin):
             return ChallengeResult(status=status, points=points, message=output)
 
         return ChallengeResult(status="success", points=0, message=output)
+
+    def _play(self, agent_name: str, commands: list[str]) -> tuple[list[dict[str, str]], bool, bool]:
+        """Run commands against the agent's session and save it once.
+
+        Returns (steps, submitted, passed). A script stops after the first
+        Submit or ERROR reply. If another process saved the session in the meantime, the
+        commands run again on the newer state, so neither writer's moves are lost. If the
+        session keeps changing underneath, ``SubmissionBusy`` is raised and nothing is saved.
+        """
+        engine = self._engine()
+        store = self._sessions()
+        for _ in range(SAVE_ATTEMPTS):
+            data, version = store.load(agent_name)
+            state = state_from_dict(data) if data is not None else None
+            steps: list[dict[str, str]] = []
+            dirty = submitted = passed = False
+            for command in commands:
+                output, state, changed, passed = engine.handle(state, command)
+                dirty = dirty or changed
+                steps.append({"command": command, "output": output})
+                if command.strip().upper().startswith("SUBMIT"):
+                    submitted = True
+                    break
+                if output.startswith("ERROR:"):
+                    break
+            if not dirty or state is None:
+                return steps, submitted, passed
+            try:
+                store.save(agent_name, state_to_dict(state), version)
+            except StaleSession:
+                continue
+            return steps, submitted, passed
+        raise SubmissionBusy("Session is busy.")
+
+    def _submit_script(self, agent_name: str, commands, cfg: dict) -> ChallengeResult:
+        if not isinstance(commands, list) or not commands or not all(isinstance(c, str) for c in commands):
+            return ChallengeResult(status="fail", points=0, message="commands must be a non-empty list of strings.")
+        limit = int(cfg.get("rules", {}).get("max_script_commands", 200))
+        if len(commands) > limit:
+            return ChallengeResult(status="fail", points=0, message=f"Too many commands (max {limit}).")
+
+        steps, submitted, passed = self._play(agent_name, commands)
+
+        transcript = "\n\n".join(f"> {s['command']}\n{s['output']}" for s in steps)
+        evidence = {"steps": steps, "executed": len(steps), "requested": len(commands)}
+        if submitted:
+            status = "success" if passed else "fail"
+            points = int(cfg.get("challenge", {}).get("points", {}).get("on_success", 0)) if passed else 0
+            return ChallengeResult(status=status, points=points, message=transcript, evidence=evidence)
+        return ChallengeResult(status="success", points=0, message=transcript, evidence=evidence)
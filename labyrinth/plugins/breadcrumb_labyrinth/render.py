@@ -1,40 +1,108 @@
 from __future__ import annotations
 
-from labyrinth.plugins.breadcrumb_labyrinth.models import State, World
+import threading
+from collections import OrderedDict
 
+from labyrinth.plugins.breadcrumb_labyrinth.models import Room, State, World
 
-def render_room(world: World, state: State) -> str:
-    room = world.rooms[state.current_room]
-    lines: list[str] = []
-    lines.append(f"== {room.title} ==")
-    lines.append("")
-    lines.append(room.description)
-    lines.append("")
 
+def render_static(room: Room) -> str:
+    """The part of a room's text that never changes: title and description."""
+    return f"== {room.title} ==\n\n{room.description}\n"
+
+
+def _usable_status(room: Room, state: State) -> str | None:
+    u = room.usable
+    if u is None:
+        return None
+    ustate = state.usable_state.get(u.usable_id, {"locked": u.locked, "used": False})
+    if ustate.get("locked"):
+        return "locked"
+    if ustate.get("used"):
+        return "used"
+    return u.idle_status
+
+
+def _floor_visible(room: Room, state: State) -> bool:
+    item_id = room.floor_item
+    if not item_id:
+        return False
+    return state.item_visibility.get(item_id, True) and not state.room_item_taken.get(room.room_id, False)
+
+
+def _dynamic_exits(room: Room, state: State) -> tuple[str, ...]:
+    return tuple(sorted(state.dynamic_exits.get(room.room_id) or ()))
+
+
+def _render_dynamic(world: World, room: Room, floor_visible: bool, status: str | None, dynamic: tuple[str, ...]) -> str:
+    lines: list[str] = []
     exits = set(room.exits.keys())
-    if state.dynamic_exits.get(room.room_id):
-        exits.update(state.dynamic_exits[room.room_id].keys())
+    exits.update(dynamic)
     if exits:
         lines.append("Exits: " + ", ".join(sorted(exits)))
     else:
         lines.append("Exits: none")
 
-    if room.floor_item:
-        item_id = room.floor_item
-        if state.item_visibility.get(item_id, True) and not state.room_item_taken.get(room.room_id, False):
-            item = world.items[item_id]
-            lines.append(f"You see: {item.name}")
-
-    if room.usable:
-        u = room.usable
-        ustate = state.usable_state.get(u.usable_id, {"locked": u.locked, "used": False})
-        status = "open"
-        if ustate.get("locked"):
-            status = "locked"
-        elif ustate.get("used"):
-            status = "used"
-        elif u.type == "Button":
-            status = "unused"
-        lines.append(f"Interactable: {u.name} ({status})")
+    if floor_visible and room.floor_item:
+        lines.append(f"You see: {world.items[room.floor_item].name}")
+
+    if room.usable and status is not None:
+        lines.append(f"Interactable: {room.usable.name} ({status})")
 
     return "\n".join(lines)
+
+
+def render_room(world: World, state: State) -> str:
+    room = world.rooms[state.current_room]
+    return render_static(room) + "\n" + _render_dynamic(
+        world,
+        room,
+        _floor_visible(room, state),
+        _usable_status(room, state),
+        _dynamic_exits(room, state),
+    )
+
+
+class RoomRenderer:
+    """render_room with per-room static text compiled once and an LRU over state fingerprints.
+
+    A room's text depends only on (room, floor item shown, usable status, dynamic exits),
+    so repeated LOOKs and failed moves are served from the cache.
+    """
+
+    def __init__(self, world: World, maxsize: int = 1024):
+        self.world = world
+        self.maxsize = maxsize
+        self._static = {room_id: render_static(room) + "\n" for room_id, room in world.rooms.items()}
+        self._cache: OrderedDict[tuple, str] = OrderedDict()
+        # One renderer serves every thread that submits to the plugin.
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, state: State) -> tuple:
+        room = self.world.rooms[state.current_room]
+        return (
+            room.room_id,
+            _floor_visible(room, state),
+            _usable_status(room, state),
+            _dynamic_exits(room, state),
+        )
+
+    def render(self, state: State) -> str:
+        key = self.fingerprint(state)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        room_id, floor_visible, status, dynamic = key
+        text = self._static[room_id] + _render_dynamic(self.world, self.world.rooms[room_id], floor_visible, status, dynamic)
+        with self._lock:
+            self._cache[key] = text
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return text
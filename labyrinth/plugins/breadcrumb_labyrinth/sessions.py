@@ -0,0 +1,197 @@
+"""Per-agent session files, safe to share between processes.
+
+A session lives at ``sessions/<aa>/<bb>/<agent>.json``, where ``aabb`` starts the
+sha256 of the agent's file name. That spreads sessions over 65536 folders, so no
+single folder grows huge. Each file carries a ``version`` that goes up by one on every
+save. ``save`` takes the agent's advisory lock (``<agent>.lock`` next to the session),
+checks that the version on disk is still the one the caller loaded, and only then
+replaces the file (write to a temporary file, then rename). A caller that raced
+another writer gets ``StaleSession`` and reloads instead of overwriting.
+
+Sessions from before sharding (``sessions/<agent>.json``) are still read. They move
+to their shard the next time they are saved.
+
+``delete`` and ``clear`` also remove lock files, temporary files left by a crashed
+writer, and shard folders that end up empty, so resets do not leave the tree growing.
+A lock file is only removed by whoever holds it. A process that was waiting on it
+notices the file is gone once it gets the lock, and locks the new file instead.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+
+class StaleSession(Exception):
+    """The session was saved by someone else since it was loaded."""
+
+
+def _safe_name(agent_name: str) -> str:
+    safe = "".join(c for c in agent_name if c.isalnum() or c in ("-", "_")).strip()
+    return safe or "agent"
+
+
+def _lock_file(f: BinaryIO, blocking: bool) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+
+def _unlock_file(f: BinaryIO) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _acquire(path: Path, blocking: bool = True) -> BinaryIO | None:
+    """Open and lock ``path``; None if not ``blocking`` and another holder has it."""
+    while True:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            f = open(path, "a+b")
+        except FileNotFoundError:
+            continue  # the shard folder was pruned in between
+        try:
+            if not _lock_file(f, blocking):
+                f.close()
+                return None
+            try:
+                current = os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+            except FileNotFoundError:
+                current = False
+        except BaseException:
+            f.close()
+            raise
+        if current:
+            return f
+        # The holder we waited for removed the file; lock the one that replaces it.
+        _unlock_file(f)
+        f.close()
+
+
+def _prune(folder: Path, root: Path) -> None:
+    """Remove ``folder`` and its parents up to ``root`` while they are empty."""
+    while folder != root and root in folder.parents:
+        try:
+            folder.rmdir()
+        except OSError:
+            return
+        folder = folder.parent
+
+
+class SessionStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path(self, agent_name: str) -> Path:
+        safe = _safe_name(agent_name)
+        digest = hashlib.sha256(safe.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / digest[2:4] / f"{safe}.json"
+
+    def _legacy_path(self, agent_name: str) -> Path:
+        return self.root / f"{_safe_name(agent_name)}.json"
+
+    @contextmanager
+    def lock(self, agent_name: str) -> Iterator[None]:
+        """Hold the agent's advisory lock, across processes as well as threads."""
+        f = _acquire(self.path(agent_name).with_suffix(".lock"))
+        assert f is not None
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+            f.close()
+
+    def _read(self, agent_name: str) -> dict[str, Any] | None:
+        for path in (self.path(agent_name), self._legacy_path(agent_name)):
+            try:
+                return json.loads(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                continue
+        return None
+
+    def load(self, agent_name: str) -> tuple[dict[str, Any] | None, int]:
+        """(session data, version); (None, 0) when the agent has no session."""
+        data = self._read(agent_name)
+        if data is None:
+            return None, 0
+        return data, int(data.pop("version", 0))
+
+    def save(self, agent_name: str, data: dict[str, Any], version: int) -> int:
+        """Write ``data`` if the stored version is still ``version``; returns the new version."""
+        path = self.path(agent_name)
+        with self.lock(agent_name):
+            current = self._read(agent_name)
+            if int((current or {}).get("version", 0)) != version:
+                raise StaleSession(agent_name)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": version + 1, **data}, indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+            self._legacy_path(agent_name).unlink(missing_ok=True)
+        return version + 1
+
+    def _remove_locked(self, session: Path, blocking: bool) -> bool:
+        """Delete a session's lock and temporary files if its lock can be taken."""
+        lock_path = session.with_suffix(".lock")
+        f = _acquire(lock_path, blocking)
+        if f is None:
+            return False
+        try:
+            for tmp in session.parent.glob(f"{session.name}.*.tmp"):
+                tmp.unlink(missing_ok=True)
+            session.unlink(missing_ok=True)
+            try:
+                lock_path.unlink(missing_ok=True)  # while still holding it; see _acquire
+            except PermissionError:
+                pass  # Windows cannot remove an open file; it is reused next time
+        finally:
+            _unlock_file(f)
+            f.close()
+        return True
+
+    def delete(self, agent_name: str) -> None:
+        session = self.path(agent_name)
+        self._legacy_path(agent_name).unlink(missing_ok=True)
+        self._remove_locked(session, blocking=True)
+        _prune(session.parent, self.root)
+
+    def clear(self) -> int:
+        """Delete every session; returns how many there were.
+
+        Lock and temporary files go too, except for agents whose lock is held right now.
+        """
+        removed = 0
+        for path in self.root.glob("*.json"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        for folder in self.root.glob("*/*"):
+            if not folder.is_dir():
+                continue
+            stems = {p.name.split(".", 1)[0] for p in folder.iterdir()}
+            for stem in stems:
+                session = folder / f"{stem}.json"
+                removed += session.exists()
+                if not self._remove_locked(session, blocking=False):
+                    session.unlink(missing_ok=True)
+            _prune(folder, self.root)
+        return removed
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from labyrinth.plugins.breadcrumb_labyrinth.models import State, Usable, World
+
+if TYPE_CHECKING:
+    from labyrinth.plugins.breadcrumb_labyrinth.engine import Engine
+
+
+Reply = tuple[str, State, bool, bool]
+
+
+class UsableHandler:
+    """Behaviour of one usable in the world, with its config fields read once at load."""
+
+    def __init__(self, usable: Usable, world: World):
+        self.usable_id = usable.usable_id
+        self.requires_item = usable.requires_item
+        self.needs_name = world.items[usable.requires_item].name if usable.requires_item else None
+
+    def locked_reply(self, engine: "Engine", state: State, message: str) -> Reply:
+        if engine.reveal_required_item_name and self.needs_name:
+            message += f" It seems to need {self.needs_name}."
+        return message, state, False, False
+
+    def use(self, engine: "Engine", state: State, ustate: dict[str, Any], item_id: str | None) -> Reply:
+        return "Nothing happens.", state, False, False
+
+
+class ChestHandler(UsableHandler):
+    def __init__(self, usable: Usable, world: World):
+        super().__init__(usable, world)
+        on_unlock = usable.config.get("on_unlock") or {}
+        self.open_message = on_unlock.get("message", "You open the chest.")
+        self.grant_item = on_unlock.get("grant_item")
+        self.locked_message = usable.config.get("message_locked", "The chest is locked.")
+
+    def _open(self, engine: "Engine", state: State, ustate: dict[str, Any]) -> Reply:
+        ustate["used"] = True
+        state.usable_state[self.usable_id] = ustate
+        state.step_count += 1
+        msg = self.open_message
+        if self.grant_item:
+            msg = engine.grant_item(state, self.grant_item, msg)
+        return engine.reply(msg, state), state, True, False
+
+    def use(self, engine: "Engine", state: State, ustate: dict[str, Any], item_id: str | None) -> Reply:
+        if ustate.get("locked"):
+            if item_id and item_id == self.requires_item:
+                ustate["locked"] = False
+                return self._open(engine, state, ustate)
+            return self.locked_reply(engine, state, self.locked_message)
+
+        if ustate.get("used"):
+            return "The chest is empty.", state, False, False
+        return self._open(engine, state, ustate)
+
+
+class ButtonHandler(UsableHandler):
+    def __init__(self, usable: Usable, world: World):
+        super().__init__(usable, world)
+        self.reveals_item = usable.config.get("reveals_item")
+        self.message = usable.config.get("message", "You press the button.")
+
+    def use(self, engine: "Engine", state: State, ustate: dict[str, Any], item_id: str | None) -> Reply:
+        if ustate.get("used"):
+            return "Nothing else happens.", state, False, False
+
+        ustate["used"] = True
+        state.usable_state[self.usable_id] = ustate
+        state.step_count += 1
+        if self.reveals_item:
+            state.item_visibility[self.reveals_item] = True
+        return engine.reply(self.message, state), state, True, False
+
+
+class DoorHandler(UsableHandler):
+    def __init__(self, usable: Usable, world: World):
+        super().__init__(usable, world)
+        reveals = usable.config.get("reveals_exit") or {}
+        self.direction = reveals.get("direction")
+        self.to_room = reveals.get("to_room")
+        self.locked_message = usable.config.get("message_locked", "The door is locked.")
+        self.unlocked_message = usable.config.get("message_unlocked", "The door unlocks.")
+
+    def use(self, engine: "Engine", state: State, ustate: dict[str, Any], item_id: str | None) -> Reply:
+        if not ustate.get("locked"):
+            return "The door stands open.", state, False, False
+        if not (item_id and item_id == self.requires_item):
+            return self.locked_reply(engine, state, self.locked_message)
+
+        ustate["locked"] = False
+        ustate["used"] = True
+        state.usable_state[self.usable_id] = ustate
+        state.step_count += 1
+        state.dynamic_exits.setdefault(state.current_room, {})[self.direction] = self.to_room
+        return engine.reply(self.unlocked_message, state), state, True, False
+
+
+# Behaviours a type in usable_types.json can name with "behavior".
+BEHAVIORS: dict[str, type[UsableHandler]] = {
+    "chest": ChestHandler,
+    "button": ButtonHandler,
+    "door": DoorHandler,
+}
+
+
+def behavior_of(type_name: str, usable_types: dict[str, Any]) -> str:
+    return str(usable_types.get(type_name, {}).get("behavior", type_name)).lower()
+
+
+def compile_usables(world: World, usable_types: dict[str, Any]) -> dict[str, UsableHandler]:
+    handlers: dict[str, UsableHandler] = {}
+    for room in world.rooms.values():
+        u = room.usable
+        if u is None:
+            continue
+        cls = BEHAVIORS.get(behavior_of(u.type, usable_types), UsableHandler)
+        handlers[u.usable_id] = cls(u, world)
+    return handlers
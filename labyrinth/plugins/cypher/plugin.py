@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
 from labyrinth.core.models import ChallengeResult
@@ -40,6 +41,15 @@ class Plugin(BaseChallengePlugin):
             return encrypted
         return _encrypt_caesar(self.get_secret_guid(cfg))
 
+    def validate_config(self, cfg: dict[str, Any], plugin_dir: Path, root: Path) -> list[str]:
+        errors = super().validate_config(cfg, plugin_dir, root)
+        secret = self.get_secret_guid(cfg)
+        if not secret:
+            errors.append("challenge.guid is missing")
+        elif _decrypt_caesar(self.get_display_guid(cfg)) != secret:
+            errors.append("challenge.guid_display does not decrypt to challenge.guid")
+        return errors
+
     def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
         if not self.validate_guid(submission, cfg):
             return ChallengeResult(
@@ -1,8 +0,0 @@
-from __future__ import annotations
-
-from labyrinth.core.image_quiz import ImageQuizChallenge
-
-
-class Plugin(ImageQuizChallenge):
-    id = "image_quiz_001"
-    name = "Image Quiz 001"
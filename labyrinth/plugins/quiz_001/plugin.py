@@ -1,8 +0,0 @@
-from __future__ import annotations
-
-from labyrinth.core.quiz import QuizChallenge
-
-
-class Plugin(QuizChallenge):
-    id = "quiz_001"
-    name = "Quiz 001"
@@ -1,9 +0,0 @@
-from __future__ import annotations
-
-from labyrinth.core.quiz import QuizChallenge
-
-
-class Plugin(QuizChallenge):
-    id = "quiz_005"
-    name = "Quiz 005"
-
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 from typing import Any
 
 from labyrinth.core.models import ChallengeResult
@@ -13,6 +14,11 @@ class Plugin(BaseChallengePlugin):
     def get_instructions(self, cfg: dict[str, Any]) -> str:
         return cfg.get("prompts", {}).get("instructions", "").strip()
 
+    def sample_submission(self, cfg: dict[str, Any], correct: bool, rng: random.Random) -> dict[str, Any]:
+        payload = super().sample_submission(cfg, correct, rng)
+        payload["proof_phrase"] = "LABYRINTH: I REGISTERED" if correct else "LABYRINTH"
+        return payload
+
     def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
         if not self.validate_guid(submission, cfg):
             return ChallengeResult(
@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 from typing import Any
 
+from labyrinth.core.arena import UnknownAgent
 from labyrinth.core.config import load_master_config
 from labyrinth.core.db import connect, fetch_all, fetch_one
 from labyrinth.core.models import ChallengeResult
@@ -92,7 +93,7 @@ class Plugin(BaseChallengePlugin):
     def get_instructions(self, cfg: dict[str, Any]) -> str:
         return cfg.get("prompts", {}).get("instructions", "").strip()
 
-    def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
+    def _standalone_points(self, agent_name: str, submission: dict[str, Any]):
         master_path = _resolve_master_config(submission)
         if master_path is None:
             return ChallengeResult(
@@ -110,11 +111,7 @@ class Plugin(BaseChallengePlugin):
 
         agent_row = fetch_one(conn, "SELECT id FROM agents WHERE name = ?", (agent_name,))
         if not agent_row:
-            return ChallengeResult(
-                status="fail",
-                points=0,
-                message=f"Unknown agent '{agent_name}'. Register first.",
-            )
+            return None
 
         scored = fetch_all(
             conn,
@@ -126,21 +123,39 @@ class Plugin(BaseChallengePlugin):
             """,
             (int(agent_row["id"]),),
         )
-        points_by_challenge = {r["challenge_id"]: int(r["points"]) for r in scored}
+        return plugins, {r["challenge_id"]: int(r["points"]) for r in scored}
+
+    def _arena_points(self, agent_name: str):
+        try:
+            return self.arena.plugins, self.arena.agent_points_by_challenge(agent_name)
+        except UnknownAgent:
+            return None
+
+    def submit(self, agent_name: str, submission: dict[str, Any], cfg: dict[str, Any]) -> ChallengeResult:
+        # Inside an Arena reuse its plugins and connection unless another config is requested.
+        if self.arena is not None and not submission.get("config_path"):
+            loaded = self._arena_points(agent_name)
+        else:
+            loaded = self._standalone_points(agent_name, submission)
+        if isinstance(loaded, ChallengeResult):
+            return loaded
+        if loaded is None:
+            return ChallengeResult(
+                status="fail",
+                points=0,
+                message=f"Unknown agent '{agent_name}'. Register first.",
+            )
+        plugins, points_by_challenge = loaded
 
         rows: list[dict[str, Any]] = []
         for pid, p in plugins.items():
-            points_cfg = p.cfg.get("challenge", {}).get("points", {})
-            max_points = int(points_cfg.get("on_success", 0))
-            name = p.cfg.get("challenge", {}).get("name", getattr(p.instance, "name", pid))
-            guid = p.instance.get_display_guid(p.cfg)
             rows.append(
                 {
                     "id": pid,
-                    "name": name,
-                    "max_points": max_points,
+                    "name": p.meta.name,
+                    "max_points": p.meta.on_success,
                     "agent_points": points_by_challenge.get(pid, 0),
-                    "guid": guid,
+                    "guid": p.meta.display_guid,
                 }
             )
 
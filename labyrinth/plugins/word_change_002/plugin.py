@@ -1,9 +0,0 @@
-from __future__ import annotations
-
-from labyrinth.core.word_change import WordChangeChallenge
-
-
-class Plugin(WordChangeChallenge):
-    id = "word_change_002"
-    name = "Change a Word 002"
-
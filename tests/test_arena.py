@@ -0,0 +1,236 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from labyrinth import Arena, ArenaError, ChallengeBusy, InvalidSubmission, RateLimited, UnknownAgent, UnknownChallenge
+from labyrinth.core.agents import iter_agent_records
+from labyrinth.core.registry import SubmissionBusy
+from labyrinth.core.scoring import recompute_scores
+
+
+REPO = Path(__file__).resolve().parents[1]
+PALINDROME_GUID = "3a49a545-380e-4679-8542-354f82814ee5"
+
+MASTER_TEMPLATE = """
+db:
+  path: "{db}"
+rate_limit:
+  enabled: {limited}
+  capacity: 2
+  refill_per_second: 0.001
+plugins:
+  - id: "scorecard"
+    path: "{repo}/labyrinth/plugins/scorecard"
+    enabled: true
+    config_path: "{repo}/labyrinth/plugins/scorecard/config.yaml"
+  - id: "palindrome"
+    kind: "guid"
+    path: "{repo}/labyrinth/plugins/palindrome"
+    enabled: true
+    config_path: "{repo}/labyrinth/plugins/palindrome/config.yaml"
+"""
+
+
+class ArenaTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.arena = self._arena(limited=False)
+
+    def _arena(self, limited: bool, extra: str = "", **kwargs) -> Arena:
+        root = Path(self.tmp.name)
+        master = root / f"labyrinth-{limited}{len(extra)}.yaml"
+        db = root / f"{limited}{len(extra)}.db"
+        master.write_text(MASTER_TEMPLATE.format(repo=REPO, db=db, limited=str(limited).lower()) + extra)
+        arena = Arena(master, audit_path=str(root / "audit.jsonl"), **kwargs)
+        self.addCleanup(arena.close)
+        return arena
+
+    def test_register_submit_leaderboard(self):
+        self.assertEqual(self.arena.register_agent("a")["name"], "a")
+        self.assertEqual([c["id"] for c in self.arena.list_challenges()], ["scorecard", "palindrome"])
+
+        ok = self.arena.submit("palindrome", "a", {"challenge_guid": PALINDROME_GUID})
+        self.assertEqual((ok.status, ok.points), ("success", 20))
+        again = self.arena.submit("palindrome", "a", f'{{"challenge_guid": "{PALINDROME_GUID}"}}')
+        self.assertEqual(again.points, 0)
+        bad = self.arena.submit("palindrome", "a", {"challenge_guid": "nope"})
+        self.assertEqual((bad.status, bad.points), ("fail", -20))
+
+        self.assertEqual(self.arena.leaderboard()[0]["points"], 0)
+        card = self.arena.submit("scorecard", "a", {})
+        self.assertIn("palindrome", card.message)
+        self.assertIn("challenge_submit", (Path(self.tmp.name) / "audit.jsonl").read_text())
+
+    def test_challenge_for_guid(self):
+        self.assertEqual(self.arena.challenge_for_guid(f" {PALINDROME_GUID} "), "palindrome")
+        self.assertIsNone(self.arena.challenge_for_guid("not-a-guid"))
+
+    def test_cached_manifest_and_instructions(self):
+        first = self.arena.manifest_response("palindrome")
+        self.assertIs(self.arena.manifest_response("palindrome"), first)
+        self.assertEqual(self.arena.manifest("palindrome")["id"], "palindrome")
+        self.assertTrue(first.matches(f'W/"x", {first.etag}'))
+        self.assertFalse(first.matches('"stale"'))
+        info = self.arena.instructions_response("palindrome")
+        self.assertNotEqual(info.etag, first.etag)
+        self.assertEqual(self.arena.instructions("palindrome"), json.loads(info.body)["instructions"])
+
+    def test_errors(self):
+        self.arena.register_agent("a")
+        with self.assertRaises(UnknownChallenge):
+            self.arena.manifest("nope")
+        with self.assertRaises(UnknownAgent):
+            self.arena.submit("palindrome", "ghost", {})
+        with self.assertRaises(InvalidSubmission):
+            self.arena.submit("palindrome", "a", "[1, 2]")
+
+        plugin = self.arena.plugins["palindrome"].instance
+        original = plugin.submit
+
+        def busy(*args):
+            raise SubmissionBusy("Session is busy.")
+
+        plugin.submit = busy
+        with self.assertRaises(ChallengeBusy) as ctx:
+            self.arena.submit("palindrome", "a", {"challenge_guid": "nope"})
+        self.assertEqual(ctx.exception.exit_code, 8)
+        plugin.submit = original
+        # Nothing was recorded, so the retry is the agent's first attempt.
+        self.assertEqual(self.arena.leaderboard()[0]["points"], 0)
+        self.assertEqual(self.arena.submit("palindrome", "a", {"challenge_guid": PALINDROME_GUID}).points, 20)
+
+        limited = self._arena(limited=True)
+        limited.register_agent("a")
+        limited.submit("palindrome", "a", {})
+        limited.submit("palindrome", "a", {})
+        with self.assertRaises(RateLimited) as ctx:
+            limited.submit("palindrome", "a", {})
+        self.assertEqual(ctx.exception.exit_code, 6)
+        # Restoring a round starts everyone with full buckets.
+        limited.restore(limited.snapshot(Path(self.tmp.name) / "limited.template.db"))
+        limited.submit("palindrome", "a", {})
+
+    def test_threaded_submits_award_once(self):
+        self.arena.register_agent("a")
+        results = []
+
+        def worker():
+            for _ in range(20):
+                results.append(self.arena.submit("palindrome", "a", {"challenge_guid": PALINDROME_GUID}))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(results), 80)
+        self.assertEqual(sum(r.points for r in results), 20)
+        self.assertEqual(self.arena.agent_points_by_challenge("a"), {"palindrome": 20})
+
+    def test_idempotent_retry(self):
+        now = [1000.0]
+        arena = self._arena(limited=True, clock=lambda: now[0])
+        arena.register_agent("a")
+        calls = []
+        plugin = arena.plugins["palindrome"].instance
+        original = plugin.submit
+        plugin.submit = lambda *args: calls.append(args[1]) or original(*args)
+
+        payload = {"challenge_guid": "nope", "idempotency_key": "k1"}
+        first = arena.submit("palindrome", "a", payload)
+        # Repeats neither re-run the plugin, nor record a run, nor spend rate limit tokens.
+        for _ in range(3):
+            self.assertEqual(arena.submit("palindrome", "a", payload), first)
+        self.assertEqual(arena.submit("palindrome", "a", {"challenge_guid": "nope"}, idempotency_key="k1"), first)
+        self.assertEqual(calls, [{"challenge_guid": "nope"}])
+        self.assertEqual(arena.leaderboard()[0]["points"], -20)
+
+        with self.assertRaises(InvalidSubmission):
+            arena.submit("palindrome", "a", {"challenge_guid": PALINDROME_GUID, "idempotency_key": "k1"})
+
+        now[0] += 86401
+        arena.submit("palindrome", "a", payload)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(arena.leaderboard()[0]["points"], -40)
+
+    def test_raced_key_with_other_payload_is_rejected(self):
+        self.arena.register_agent("a")
+        plugin = self.arena.plugins["palindrome"].instance
+        original = plugin.submit
+
+        def racing(*args):
+            # Another request with the same key but a different payload finishes first.
+            plugin.submit = original
+            self.arena.submit("palindrome", "a", {"challenge_guid": PALINDROME_GUID, "idempotency_key": "k"})
+            return original(*args)
+
+        plugin.submit = racing
+        with self.assertRaises(InvalidSubmission):
+            self.arena.submit("palindrome", "a", {"challenge_guid": "nope", "idempotency_key": "k"})
+        self.assertEqual(self.arena.leaderboard()[0]["points"], 20)
+
+    def test_clear_score_under_decay_rescores_others(self):
+        arena = self._arena(limited=False, extra="leaderboard:\n  score_mode: decay\n  decay_half_life_hours: 12\n")
+        ids = {name: arena.register_agent(name)["id"] for name in ("a", "b")}
+        for agent, ts in (("a", "2026-01-01 00:00:00"), ("b", "2026-01-01 12:00:00")):
+            arena.conn.execute(
+                "INSERT INTO runs(agent_id, challenge_id, status, points, submitted_at) VALUES (?, 'palindrome', 'success', 20, ?)",
+                (ids[agent], ts),
+            )
+        recompute_scores(arena.conn, arena.scoring)
+        self.assertEqual(arena.agent_points_by_challenge("b"), {"palindrome": 10})
+        arena.clear_score("a")
+        # b is now the first solver, so nothing decays.
+        self.assertEqual(arena.agent_points_by_challenge("b"), {"palindrome": 20})
+
+    def test_snapshot_restore_and_clear_all(self):
+        for name in ("a", "b"):
+            self.arena.register_agent(name)
+        template = self.arena.snapshot(Path(self.tmp.name) / "round.template.db")
+
+        self.arena.register_agent("late")
+        self.arena.submit("palindrome", "a", {"challenge_guid": PALINDROME_GUID})
+        self.assertEqual(self.arena.clear_all_scores(), 1)
+        self.assertEqual([r["points"] for r in self.arena.leaderboard()], [0, 0, 0])
+
+        self.arena.submit("palindrome", "b", {"challenge_guid": PALINDROME_GUID})
+        self.assertEqual(self.arena.restore(template), ["a", "b"])
+        self.assertEqual(self.arena.leaderboard(), [{"agent": "a", "points": 0}, {"agent": "b", "points": 0}])
+        # The restored arena accepts new work as usual.
+        self.assertEqual(self.arena.submit("palindrome", "b", {"challenge_guid": PALINDROME_GUID}).points, 20)
+        with self.assertRaises(ArenaError):
+            self.arena.restore(Path(self.tmp.name) / "missing.db")
+
+    def test_import_agents_and_id_cache(self):
+        self.arena.register_agent("a")
+        lines = ["name,team\n", "a,red\n", "b,blue\n", "b,green\n", ",grey\n", "c,\n"]
+        report = self.arena.import_agents(iter_agent_records(lines, "csv"), chunk_size=1)
+        self.assertEqual((report.created, report.conflicts), (["b", "c"], ["a", "b"]))
+        self.assertEqual(report.invalid, ["line 5: missing name"])
+        meta = self.arena.conn.execute("SELECT meta_json FROM agents WHERE name = 'b'").fetchone()[0]
+        self.assertEqual(json.loads(meta), {"team": "blue"})
+
+        old_id = self.arena.agent_id("b")
+        self.arena.clear_score("b", hard=True)
+        with self.assertRaises(UnknownAgent):
+            self.arena.agent_id("b")
+        self.assertNotEqual(self.arena.register_agent("b")["id"], old_id)
+        self.assertEqual(self.arena.agent_id("b"), self.arena.register_agent("d")["id"] - 1)
+
+    def test_import_csv_meta_column(self):
+        lines = ["name,team,meta\n", 'e,red,"{""tier"": 2}"\n', "f,blue,vip\n", "g,,\n"]
+        report = self.arena.import_agents(iter_agent_records(lines, "csv"))
+        self.assertEqual((report.created, report.invalid), (["e", "f", "g"], []))
+        rows = self.arena.conn.execute("SELECT name, meta_json FROM agents ORDER BY name").fetchall()
+        self.assertEqual(
+            {r[0]: r[1] and json.loads(r[1]) for r in rows},
+            {"e": {"team": "red", "tier": 2}, "f": {"team": "blue", "meta": "vip"}, "g": None},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
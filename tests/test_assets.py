@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from labyrinth.core.assets import PACK_NAME, AssetPack, asset_store, build_pack, prune_loose
+from labyrinth.core.validate import validate_tree
+
+
+GUID = "5b1c6f0e-2a7d-4c3e-9b8a-0d4e6f1a2b3c"
+
+
+class AssetPackTests(unittest.TestCase):
+    def _tree(self, root: Path) -> Path:
+        plugin = root / "plugins" / "hunt"
+        (plugin / "files" / "a" / "b").mkdir(parents=True)
+        (plugin / "files" / "decoy.txt").write_text("nothing here", encoding="utf-8")
+        (plugin / "files" / "copy.txt").write_text("nothing here", encoding="utf-8")
+        (plugin / "files" / "a" / "b" / "treasure.txt").write_text(f"GUID: {GUID}", encoding="utf-8")
+        cfg = {"kind": "guid", "challenge": {"id": "hunt", "guid": GUID, "points": {"on_success": 5}}}
+        (plugin / "config.yaml").write_text(yaml.safe_dump(cfg), encoding="utf-8")
+        master = {"plugins": [{"id": "hunt", "kind": "guid", "config_path": "plugins/hunt/config.yaml"}]}
+        (root / "labyrinth.yaml").write_text(yaml.safe_dump(master), encoding="utf-8")
+        return plugin
+
+    def test_pack_read_prune_and_extract(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            plugin = self._tree(root)
+            stats = build_pack(root, [plugin])
+            self.assertEqual((stats.files, stats.blobs), (3, 2))  # identical files share a blob
+
+            with AssetPack(root / PACK_NAME) as pack:
+                self.assertEqual(pack.read("plugins/hunt/files/copy.txt"), b"nothing here")
+                self.assertEqual(pack.verify(), [])
+                self.assertEqual(prune_loose(root, pack), 3)
+                self.assertFalse((plugin / "files").exists())
+                self.assertTrue((plugin / "config.yaml").exists())
+
+                store = asset_store(root)
+                self.assertEqual(store.find_text(plugin / "files", GUID), [plugin / "files" / "a" / "b" / "treasure.txt"])
+                self.assertEqual(validate_tree(root / "labyrinth.yaml", jobs=1, use_cache=False)[0].errors, ())
+
+                self.assertEqual(pack.extract(root, "plugins/hunt"), 3)
+                self.assertEqual(pack.extract(root, "plugins/hunt"), 0)
+            self.assertIn(GUID, (plugin / "files" / "a" / "b" / "treasure.txt").read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from labyrinth.core.audit import build_audit_index, iter_audit, parse_time, replay_audit
+from labyrinth.core.db import connect, fetch_all, init_db
+from labyrinth.core.scoring import leaderboard
+
+
+def _line(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+class AuditTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "audit.jsonl"
+        old = [
+            {"event": "agent_register", "agent": "a", "ts": "2026-01-01T00:00:00Z"},
+            {"event": "challenge_submit", "agent": "a", "challenge_id": "cypher", "status": "fail", "points": -20, "ts": "2026-01-01T00:01:00Z"},
+        ]
+        mid = [
+            {"event": "agent_register", "agent": "b", "ts": "2026-01-02T00:00:00Z"},
+            {"event": "agent_clear_score", "agent": "a", "ts": "2026-01-02T00:00:01Z"},
+        ]
+        live = [
+            {"event": "challenge_submit", "agent": "b", "challenge_id": "cypher", "status": "success", "points": 20, "ts": "2026-01-03T00:00:00.5Z"},
+            {"event": "challenge_submit", "agent": "a", "challenge_id": "quiz_001", "status": "success", "points": 50, "ts": "2026-01-03T01:00:00Z"},
+            {"event": "challenge_submit", "agent": "c", "challenge_id": "cypher", "status": "fail", "points": -20, "ts": "2026-01-03T02:00:00Z"},
+        ]
+        with gzip.open(str(self.path) + ".2.gz", "wt", encoding="utf-8") as f:
+            f.writelines(_line(e) for e in old)
+        Path(str(self.path) + ".1").write_text("".join(_line(e) for e in mid), encoding="utf-8")
+        self.path.write_text("".join(_line(e) for e in live), encoding="utf-8")
+
+    def test_streams_all_segments_in_order(self):
+        events = list(iter_audit(self.path))
+        self.assertEqual(len(events), 7)
+        self.assertEqual(events[0]["ts"], "2026-01-01T00:00:00Z")
+
+    def test_filters(self):
+        failed = list(iter_audit(self.path, event="challenge_submit", challenge_id="cypher"))
+        self.assertEqual([e["agent"] for e in failed], ["a", "b", "c"])
+        recent = list(iter_audit(self.path, agent="a", since=parse_time("2026-01-02T12:00:00")))
+        self.assertEqual([e["challenge_id"] for e in recent], ["quiz_001"])
+        window = list(iter_audit(self.path, since=parse_time("2026-01-03"), until=parse_time("2026-01-03T01:00:00")))
+        self.assertEqual(len(window), 1)
+        # 02:30+02:00 is 00:30 UTC.
+        self.assertEqual(parse_time("2026-01-03T02:30:00+02:00"), parse_time("2026-01-03T00:30:00Z"))
+        early = list(iter_audit(self.path, since=parse_time("2026-01-03"), until=parse_time("2026-01-03T02:30:00+02:00")))
+        self.assertEqual(early, window)
+
+    def test_index_seeks_without_changing_results(self):
+        build_audit_index(self.path, every=1)
+        self.assertTrue(Path(str(self.path) + ".idx").exists())
+        since = parse_time("2026-01-03T00:30:00")
+        self.assertEqual([e["agent"] for e in iter_audit(self.path, since=since)], ["a", "c"])
+        # Appending extends the existing index.
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(_line({"event": "agent_register", "agent": "d", "ts": "2026-01-04T00:00:00Z"}))
+        self.assertEqual(build_audit_index(self.path, every=1), 1)
+
+    def test_index_of_a_rotated_log_is_ignored(self):
+        build_audit_index(self.path, every=1)
+        self.path.rename(str(self.path) + ".0")
+        # The new live log outgrows the old one, so only its identity tells the index is stale.
+        events = [
+            {"event": "agent_register", "agent": f"n{i}", "ts": f"2026-01-05T00:{i:02d}:00Z"} for i in range(30)
+        ]
+        self.path.write_text("".join(_line(e) for e in events), encoding="utf-8")
+        recent = list(iter_audit(self.path, since=parse_time("2026-01-05T00:00:00")))
+        self.assertEqual(len(recent), 30)
+
+    def test_replay_rebuilds_runs(self):
+        conn = connect(":memory:")
+        init_db(conn)
+        conn.execute(
+            "INSERT INTO idempotency(agent_id, key, challenge_id, request_hash, result_json, created_at) "
+            "VALUES (1, 'k', 'cypher', 'h', '{}', 0)"
+        )
+        counts = replay_audit(conn, iter_audit(self.path))
+        self.assertEqual(counts["agents"], 3)
+        self.assertEqual(counts["clears"], 1)
+        runs = fetch_all(conn, "SELECT challenge_id FROM runs ORDER BY id")
+        self.assertEqual([r["challenge_id"] for r in runs], ["cypher", "quiz_001", "cypher"])
+        board = {r["agent"]: r["points"] for r in leaderboard(conn)}
+        self.assertEqual(board, {"a": 50, "b": 20, "c": -20})
+        self.assertEqual(fetch_all(conn, "SELECT key FROM idempotency"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
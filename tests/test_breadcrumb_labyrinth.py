@@ -1,9 +1,17 @@
 import json
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 
+from labyrinth.core.config import load_yaml
+from labyrinth.core.registry import SubmissionBusy
 from labyrinth.plugins.breadcrumb_labyrinth.engine import Engine
+from labyrinth.plugins.breadcrumb_labyrinth.fuzz import fuzz
 from labyrinth.plugins.breadcrumb_labyrinth.loader import load_usable_types, validate_world
+from labyrinth.plugins.breadcrumb_labyrinth.plugin import Plugin
+from labyrinth.plugins.breadcrumb_labyrinth.render import render_room
+from labyrinth.plugins.breadcrumb_labyrinth.sessions import SessionStore, StaleSession
 
 
 PLUGIN_DIR = Path("labyrinth/plugins/breadcrumb_labyrinth")
@@ -112,6 +120,133 @@ class BreadcrumbLabyrinthTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_world(bad, usable_types)
 
+    def test_cached_render_matches_reference(self):
+        engine = Engine(PLUGIN_DIR)
+        state = None
+        script = ["Enter", "Look", "N", "Use", "Look", "Get", "E", "Look", "S", "Use", "Use Bronze Key", "E", "W", "Look"]
+        for command in script:
+            _, state, _, _ = engine.handle(state, command)
+            self.assertEqual(engine.renderer.render(state), render_room(engine.world, state))
+        self.assertGreater(engine.renderer.hits, 0)
+
+    def test_new_usable_type_from_declaration_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            types = json.loads((PLUGIN_DIR / "usable_types.json").read_text(encoding="utf-8"))
+            types["types"]["Lever"] = {"behavior": "button", "idle_status": "up", "fields": ["id", "type", "name"]}
+            world = json.loads((PLUGIN_DIR / "world.json").read_text(encoding="utf-8"))
+            world["rooms"]["room1"]["usable"].update({"type": "Lever", "name": "Lever", "message": "Clunk."})
+            (Path(tmp) / "usable_types.json").write_text(json.dumps(types), encoding="utf-8")
+            (Path(tmp) / "world.json").write_text(json.dumps(world), encoding="utf-8")
+
+            engine = Engine(Path(tmp))
+            output, state, _, _ = engine.handle(None, "Enter")
+            self.assertIn("Interactable: Lever (up)", output)
+            output, state, _, _ = engine.handle(state, "Use")
+            self.assertIn("Clunk.", output)
+            self.assertIn("You see: Bronze Key", output)
+
+    def test_fuzz_invariants_hold(self):
+        (report,) = fuzz(300, length=25, workers=1, seed=7)
+        self.assertEqual(report.failures, [])
+        self.assertEqual(report.commands, 300 * 25)
+        self.assertGreater(report.passes, 0)
+
+    def _plugin(self, tmp: str) -> Plugin:
+        plugin = Plugin()
+        plugin._sessions_dir = lambda: Path(tmp)
+        return plugin
+
+    def test_script_runs_to_submit(self):
+        cfg = load_yaml(PLUGIN_DIR / "config.yaml")
+        with tempfile.TemporaryDirectory() as tmp:
+            plugin = self._plugin(tmp)
+            script = ["Enter", "Use", "Get", "E", "Use Bronze Key", "Submit 3F2504E0-4F89-11D3-9A0C-0305E82C3301", "Look"]
+            result = plugin.submit("a", {"commands": script}, cfg)
+            self.assertEqual(result.status, "success")
+            self.assertEqual(result.points, 100)
+            self.assertEqual(result.evidence["executed"], 6)
+            self.assertIn("> Use Bronze Key", result.message)
+            self.assertTrue(result.message.endswith("PASS: Correct GUID submitted."))
+            saved = json.loads(plugin._sessions().path("a").read_text(encoding="utf-8"))
+            self.assertIn("paper_guid", saved["inventory"])
+            self.assertEqual(saved["version"], 1)
+
+    def test_script_stops_at_error_and_resumes_session(self):
+        cfg = load_yaml(PLUGIN_DIR / "config.yaml")
+        with tempfile.TemporaryDirectory() as tmp:
+            plugin = self._plugin(tmp)
+            result = plugin.submit("a", {"commands": ["Enter", "E", "Dance", "W"]}, cfg)
+            self.assertEqual(result.evidence["executed"], 3)
+            self.assertIn("ERROR: Unknown command.", result.message)
+            result = plugin.submit("a", {"command": "Look"}, cfg)
+            self.assertIn("Room 2", result.message)
+            bad = plugin.submit("a", {"commands": "Enter"}, cfg)
+            self.assertEqual(bad.status, "fail")
+
+    def test_reset_forgets_sessions(self):
+        cfg = load_yaml(PLUGIN_DIR / "config.yaml")
+        with tempfile.TemporaryDirectory() as tmp:
+            plugin = self._plugin(tmp)
+            for agent in ("a", "b", "c"):
+                plugin.submit(agent, {"command": "Enter"}, cfg)
+            plugin.reset(cfg, "a")
+            self.assertEqual(sorted(p.name for p in Path(tmp).glob("*/*/*.json")), ["b.json", "c.json"])
+            # A crashed writer's temporary file goes with the reset.
+            crashed = plugin._sessions().path("b").with_name("b.json.999.tmp")
+            crashed.write_text("{}", encoding="utf-8")
+            plugin.reset(cfg)
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+            self.assertIn("ERROR", plugin.submit("b", {"command": "Look"}, cfg).message)
+
+    def test_sessions_are_sharded_versioned_and_reject_stale_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SessionStore(tmp)
+            path = store.path("agent-1")
+            self.assertEqual(path.relative_to(tmp).parts[2], "agent-1.json")
+            self.assertEqual(store.load("agent-1"), (None, 0))
+            self.assertEqual(store.save("agent-1", {"step_count": 1}, 0), 1)
+            with self.assertRaises(StaleSession):
+                store.save("agent-1", {"step_count": 9}, 0)
+            self.assertEqual(store.load("agent-1"), ({"step_count": 1}, 1))
+
+            # A session written before sharding is read, then moved on its next save.
+            (Path(tmp) / "old.json").write_text('{"step_count": 4}', encoding="utf-8")
+            self.assertEqual(store.load("old"), ({"step_count": 4}, 0))
+            store.save("old", {"step_count": 5}, 0)
+            self.assertFalse((Path(tmp) / "old.json").exists())
+            self.assertTrue(store.path("old").exists())
+
+    def test_concurrent_commands_are_not_lost(self):
+        cfg = load_yaml(PLUGIN_DIR / "config.yaml")
+        with tempfile.TemporaryDirectory() as tmp:
+            plugin = self._plugin(tmp)
+            plugin.submit("a", {"command": "Enter"}, cfg)
+            threads = [
+                threading.Thread(target=lambda: [plugin.submit("a", {"command": "Submit nope"}, cfg) for _ in range(10)])
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            data, version = plugin._sessions().load("a")
+            self.assertEqual(version, 41)
+            self.assertEqual(data["step_count"], 40)
+
+    def test_session_that_stays_busy_raises(self):
+        cfg = load_yaml(PLUGIN_DIR / "config.yaml")
+        with tempfile.TemporaryDirectory() as tmp:
+            plugin = self._plugin(tmp)
+            store = SessionStore(tmp)
+
+            def always_stale(*args):
+                raise StaleSession("a")
+
+            store.save = always_stale
+            plugin._sessions = lambda: store
+            with self.assertRaises(SubmissionBusy):
+                plugin.submit("a", {"command": "Enter"}, cfg)
+
 
 if __name__ == "__main__":
     unittest.main()
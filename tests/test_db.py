@@ -0,0 +1,52 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from labyrinth.core.db import QueryTracer, connect, fetch_all, fetch_one, init_db
+
+
+class QueryTraceTests(unittest.TestCase):
+    def test_counters_and_slow_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            slow_log = Path(tmp) / "slow.jsonl"
+            tracer = QueryTracer(slow_ms=0, slow_log=slow_log)
+            conn = connect(str(Path(tmp) / "t.db"), tracer=tracer)
+            init_db(conn)
+            conn.executemany("INSERT INTO agents(name) VALUES (?)", [("a",), ("b",), ("c",)])
+            for _ in range(2):
+                self.assertEqual(len(fetch_all(conn, "SELECT id, name FROM agents")), 3)
+            self.assertEqual(fetch_one(conn, "SELECT id FROM agents WHERE name = ?", ("b",))["id"], 2)
+            conn.execute("DELETE FROM agents WHERE name = ?", ("c",))
+            conn.execute("SELECT name FROM agents").fetchall()
+
+            stats = {s["sql"]: s for s in tracer.stats()}
+            self.assertEqual(stats["SELECT id, name FROM agents"]["calls"], 2)
+            self.assertEqual(stats["SELECT id, name FROM agents"]["rows"], 6)
+            self.assertEqual(stats["INSERT INTO agents(name) VALUES (?)"]["rows"], 3)
+            self.assertEqual(stats["DELETE FROM agents WHERE name = ?"]["rows"], 1)
+            self.assertIsNone(stats["SELECT name FROM agents"]["rows"])  # not fetched through the tracer
+
+            merged = QueryTracer()
+            merged.merge(tracer.stats())
+            merged.merge(tracer.stats())
+            merged = {s["sql"]: s for s in merged.stats()}
+            self.assertEqual(merged["SELECT id, name FROM agents"]["calls"], 4)
+            self.assertEqual(merged["SELECT id, name FROM agents"]["rows"], 12)
+            self.assertIsNone(merged["SELECT name FROM agents"]["rows"])
+
+            logged = [json.loads(line) for line in slow_log.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(len(logged), 6)
+            lookup = next(r for r in logged if r["sql"].startswith("SELECT id FROM agents WHERE"))
+            self.assertTrue(any("USING" in step for step in lookup["plan"]))
+            conn.close()
+
+    def test_untraced_connection(self):
+        conn = connect(":memory:")
+        init_db(conn)
+        self.assertIsNone(getattr(conn, "tracer", None))
+        self.assertEqual(fetch_all(conn, "SELECT * FROM agents"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from labyrinth import Arena
+from labyrinth.core.assets import build_pack
+from labyrinth.core.images import ImageIndex, decode_png, encode_png, image_index, image_manifest, thumbnail
+
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _png(width: int, height: int) -> bytes:
+    rows = [bytearray(v for x in range(width) for v in (x % 256, y % 256, 128)) for y in range(height)]
+    return encode_png(width, height, 3, rows)
+
+
+class ImageTests(unittest.TestCase):
+    def test_thumbnail_fits_preview_size(self):
+        width, height, channels, rows = decode_png(thumbnail(_png(200, 100), size=64))
+        self.assertEqual((width, height, channels), (64, 32, 3))
+        self.assertEqual(len(rows[0]), 64 * 3)
+
+    def test_index_describes_once_and_detects_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            image = root / "answers" / "a.png"
+            image.parent.mkdir()
+            image.write_bytes(_png(40, 30))
+
+            index = ImageIndex(root)
+            info = index.describe(image)
+            self.assertEqual((info.width, info.height, info.path), (40, 30, "answers/a.png"))
+            self.assertTrue((root / info.preview).is_file())
+            index.save()
+
+            reloaded = ImageIndex(root)
+            self.assertEqual(reloaded.describe("answers/a.png"), info)
+            self.assertIsNone(reloaded.check(image))
+            image.write_bytes(_png(41, 30))
+            self.assertIn("changed", reloaded.check(image))
+            image.unlink()
+            self.assertIn("missing", reloaded.check(image))
+
+    def test_packing_after_indexing_keeps_images_valid(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            plugin = root / "labyrinth" / "plugins" / "image_quiz_001"
+            shutil.copytree(REPO / "labyrinth" / "plugins" / "image_quiz_001", plugin)
+            (root / "labyrinth.yaml").write_text(
+                f'db:\n  path: "{root / "labyrinth.db"}"\n'
+                "plugins:\n"
+                '  - id: "image_quiz_001"\n'
+                '    kind: "image_quiz"\n'
+                '    path: "labyrinth/plugins/image_quiz_001"\n'
+                '    config_path: "labyrinth/plugins/image_quiz_001/config.yaml"\n',
+                encoding="utf-8",
+            )
+            with Arena(root / "labyrinth.yaml", audit_path=str(root / "audit.jsonl")) as arena:
+                p = arena.plugins["image_quiz_001"]
+                index = image_index(root)
+                self.assertEqual(len(image_manifest(index, p.instance.image_paths(p.cfg, plugin))), 7)
+                index.save()
+            build_pack(root, [plugin])
+
+            with Arena(root / "labyrinth.yaml", audit_path=str(root / "audit.jsonl")) as arena:
+                arena.register_agent("a")
+                result = arena.submit("image_quiz_001", "a", {"challenge_guid": p.cfg["challenge"]["guid"]})
+                self.assertEqual(result.status, "success")
+
+
+if __name__ == "__main__":
+    unittest.main()
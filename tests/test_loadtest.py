@@ -0,0 +1,36 @@
+import os
+import unittest
+from pathlib import Path
+
+from labyrinth.core.loadtest import loadtest
+
+
+class LoadtestTests(unittest.TestCase):
+    def test_thread_and_asyncio_agents(self):
+        before = os.stat("labyrinth.db").st_mtime_ns
+        plugins = Path("labyrinth/plugins")
+        files_before = sorted(p for p in plugins.rglob("*") if "__pycache__" not in p.parts)
+        for mode in ("thread", "asyncio"):
+            report = loadtest("labyrinth.yaml", agents=3, ops=6, mode=mode, seed=1, rate_limit=False)
+            # register + scorecard + ops per agent
+            self.assertEqual(len(report.samples), 3 * 8)
+            self.assertEqual(report.by_operation()["register"], 3)
+            self.assertFalse([o for o in report.outcomes if o.startswith("error") or o == "locked"], report.outcomes)
+            self.assertGreater(report.outcomes["success"], 0)
+            self.assertLessEqual(report.percentile(50), report.percentile(99))
+        self.assertEqual(os.stat("labyrinth.db").st_mtime_ns, before)
+        self.assertEqual(sorted(p for p in plugins.rglob("*") if "__pycache__" not in p.parts), files_before)
+
+    def test_process_agents_report_their_queries(self):
+        report = loadtest("labyrinth.yaml", agents=2, ops=3, mode="process", workers=2, rate_limit=False, trace=True)
+        self.assertEqual(len(report.samples), 2 * 5)
+        stats = {s["sql"]: s for s in report.query_stats}
+        self.assertEqual(stats["INSERT INTO agents(name) VALUES (?)"]["calls"], 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            loadtest("labyrinth.yaml", mode="fibers")
+
+
+if __name__ == "__main__":
+    unittest.main()
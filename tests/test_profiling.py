@@ -0,0 +1,37 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from labyrinth.core.profiling import DEFAULT_PROFILE_DIR, Profiler, profile_files, resolve_profile_dir, summarize
+
+
+def busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_profiles_are_written_and_summarized(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for _ in range(3):
+                with Profiler(tmp, "challenge submit", memory=True) as profiler:
+                    busy(20000)
+                self.assertIn("-challenge_submit", profiler.paths[0].name)
+                self.assertIn("peak=", profiler.paths[1].read_text(encoding="utf-8"))
+
+            files = profile_files([tmp])
+            self.assertEqual(len(files), 3)
+            count, rows = summarize(files, top=5)
+            self.assertEqual(count, 3)
+            hot = {r.function: r for r in rows}
+            genexpr = next(r for name, r in hot.items() if "test_profiling.py" in name and "genexpr" in name)
+            self.assertEqual(genexpr.hot_runs, 3)
+
+    def test_resolve_profile_dir(self):
+        self.assertIsNone(resolve_profile_dir(None))
+        self.assertIsNone(resolve_profile_dir("0"))
+        self.assertEqual(resolve_profile_dir("1"), DEFAULT_PROFILE_DIR)
+        self.assertEqual(resolve_profile_dir("out"), "out")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from labyrinth.core.config import RateLimitConfig
+from labyrinth.core.db import connect, init_db
+from labyrinth.core.ratelimit import MemoryRateLimiter, SqliteRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitTests(unittest.TestCase):
+    def setUp(self):
+        self.cfg = RateLimitConfig(enabled=True, capacity=2, refill_per_second=1, overrides={"maze": (5, 10)})
+
+    def _exercise(self, limiter, clock):
+        self.assertEqual(limiter.acquire("a", "quiz"), 0.0)
+        self.assertEqual(limiter.acquire("a", "quiz"), 0.0)
+        self.assertAlmostEqual(limiter.acquire("a", "quiz"), 1.0)
+        # Other agents and challenges have their own buckets.
+        self.assertEqual(limiter.acquire("b", "quiz"), 0.0)
+        for _ in range(5):
+            self.assertEqual(limiter.acquire("a", "maze"), 0.0)
+        self.assertGreater(limiter.acquire("a", "maze"), 0.0)
+        clock.now += 1.0
+        self.assertEqual(limiter.acquire("a", "quiz"), 0.0)
+        self.assertGreater(limiter.acquire("a", "quiz"), 0.0)
+
+    def test_memory_bucket(self):
+        clock = FakeClock()
+        limiter = MemoryRateLimiter(self.cfg, clock=clock)
+        self._exercise(limiter, clock)
+        limiter.reset()
+        self.assertEqual(limiter.acquire("a", "quiz"), 0.0)
+
+    def test_sqlite_bucket(self):
+        conn = connect(":memory:")
+        init_db(conn)
+        clock = FakeClock()
+        limiter = SqliteRateLimiter(conn, self.cfg, clock=clock)
+        self._exercise(limiter, clock)
+        row = conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()
+        self.assertEqual(row[0], 3)
+        limiter.reset()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0], 0)
+
+    def test_disabled(self):
+        limiter = MemoryRateLimiter(RateLimitConfig(enabled=False, capacity=0))
+        self.assertEqual(limiter.acquire("a", "quiz"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys
+import unittest
+
+from labyrinth.core.config import load_master_config
+from labyrinth.core.guid import GuidChallenge
+from labyrinth.core.quiz import QuizChallenge
+from labyrinth.core.registry import build_guid_index, find_challenge_by_guid, load_plugins
+from labyrinth.core.word_change import WordChangeChallenge
+
+
+MASTER_CONFIG = "labyrinth.yaml"
+
+
+class RegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.cfg = load_master_config(MASTER_CONFIG)
+        self.plugins = load_plugins(self.cfg.plugins)
+
+    def test_declarative_kinds_use_core_classes(self):
+        quiz = self.plugins["quiz_001"]
+        self.assertIs(type(quiz.instance), QuizChallenge)
+        self.assertEqual(quiz.instance.id, "quiz_001")
+        self.assertEqual(quiz.instance.name, "Quiz 001")
+        self.assertIs(type(self.plugins["word_change_003"].instance), WordChangeChallenge)
+        self.assertIs(type(self.plugins["palindrome"].instance), GuidChallenge)
+        self.assertNotIn("labyrinth.plugins.quiz_001", sys.modules)
+
+    def test_module_plugins_still_load(self):
+        self.assertEqual(type(self.plugins["cypher"].instance).__name__, "Plugin")
+
+    def test_guid_kind_submit(self):
+        p = self.plugins["palindrome"]
+        ok = p.instance.submit("a", {"challenge_guid": "3a49a545-380e-4679-8542-354f82814ee5"}, p.cfg)
+        self.assertEqual(ok.status, "success")
+        self.assertEqual(ok.message, "Palindrome challenge solved for a.")
+        bad = p.instance.submit("a", {"challenge_guid": "nope"}, p.cfg)
+        self.assertEqual(bad.status, "fail")
+
+    def test_meta_precomputed(self):
+        cypher = self.plugins["cypher"]
+        self.assertEqual(cypher.meta.display_guid, "8g4b3d2c-0e5f-5d7g-9b3c-2e6f7g8b9c0d")
+        self.assertEqual(cypher.meta.on_success, 20)
+        self.assertIs(cypher.instance.meta, cypher.meta)
+        self.assertTrue(cypher.instance.validate_guid({"challenge_guid": " 7f3a2c1b-9d4e-4c6f-8a2b-1d5e6f7a8b9c "}, cypher.cfg))
+        self.assertFalse(cypher.instance.validate_guid({"challenge_guid": 7}, cypher.cfg))
+        self.assertEqual(self.plugins["word_change_001"].meta.secret_digest, b"")
+
+    def test_guid_index(self):
+        index = build_guid_index(self.plugins)
+        self.assertEqual(find_challenge_by_guid(index, "a8229209-254c-4e38-9abe-2ee764d52f6b"), "quiz_001")
+        self.assertIsNone(find_challenge_by_guid(index, "hidden"))
+        self.assertIsNone(find_challenge_by_guid(index, ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+from labyrinth.core.config import LeaderboardConfig, parse_duration
+from labyrinth.core.db import connect, init_db
+from labyrinth.core.scoring import (
+    engine_for,
+    ensure_scores,
+    leaderboard,
+    record_run,
+    recompute_scores,
+    score_history,
+)
+
+
+# (agent, challenge, status, awarded points, submitted_at)
+RUNS = [
+    ("a", "x", "fail", -10, "2026-01-01 00:00:00"),
+    ("a", "x", "success", 10, "2026-01-01 01:00:00"),
+    ("b", "x", "success", 10, "2026-01-01 13:00:00"),
+    ("b", "x", "success", 0, "2026-01-01 14:00:00"),
+    ("b", "y", "fail", -5, "2026-01-01 15:00:00"),
+    ("c", "y", "fail", -5, "2026-01-01 16:00:00"),
+    ("c", "y", "fail", -5, "2026-01-01 17:00:00"),
+    ("c", "y", "success", 5, "2026-01-01 18:00:00"),
+]
+
+
+class ScoringTests(unittest.TestCase):
+    def _board(self, mode: str, incremental: bool = True, **kw) -> dict[str, int]:
+        conn = connect(":memory:")
+        init_db(conn)
+        ids = {}
+        for name in "abc":
+            ids[name] = conn.execute("INSERT INTO agents(name) VALUES (?)", (name,)).lastrowid
+        engine = engine_for(LeaderboardConfig(score_mode=mode, decay_half_life_hours=12, **kw))
+        for agent, challenge, status, points, ts in RUNS:
+            conn.execute(
+                "INSERT INTO runs(agent_id, challenge_id, status, points, submitted_at) VALUES (?,?,?,?,?)",
+                (ids[agent], challenge, status, points, ts),
+            )
+            if incremental:
+                record_run(conn, engine, ids[agent], challenge, status, points, ts)
+        conn.commit()
+        if not incremental:
+            recompute_scores(conn, engine)
+        self.conn = conn
+        return {r["agent"]: r["points"] for r in leaderboard(conn)}
+
+    def test_modes(self):
+        self.assertEqual(self._board("sum"), {"a": 0, "b": 5, "c": -5})
+        self.assertEqual(self._board("best"), {"a": 10, "b": 5, "c": 5})
+        self.assertEqual(self._board("first_solve"), {"a": 10, "b": 10, "c": 5})
+        # b solved x 12h (one half-life) after a did.
+        self.assertEqual(self._board("decay"), {"a": 10, "b": 5, "c": 5})
+        self.assertEqual(self._board("penalized", attempt_penalty=2), {"a": 8, "b": 10, "c": 1})
+
+    def test_incremental_matches_recompute(self):
+        for mode in ("sum", "best", "first_solve", "decay", "penalized"):
+            self.assertEqual(self._board(mode), self._board(mode, incremental=False), mode)
+
+    def test_mode_switch_recomputes_once(self):
+        self._board("sum")
+        best = engine_for(LeaderboardConfig(score_mode="best"))
+        self.assertTrue(ensure_scores(self.conn, best))
+        self.assertFalse(ensure_scores(self.conn, best))
+        self.assertEqual(leaderboard(self.conn)[0], {"agent": "a", "points": 10})
+
+    def test_tie_break(self):
+        self._board("first_solve")
+        # a and b both have 10; a reached it first and with fewer attempts.
+        self.assertEqual([r["agent"] for r in leaderboard(self.conn, "earliest")], ["a", "b", "c"])
+        self.assertEqual([r["agent"] for r in leaderboard(self.conn, "fewest_attempts")], ["a", "b", "c"])
+
+    def test_history_rollups(self):
+        rows = "SELECT agent_id, resolution, bucket, score, runs FROM score_history ORDER BY 1, 2, 3"
+        self._board("sum", history_resolutions=(3600, 86400))
+        incremental = self.conn.execute(rows).fetchall()
+        self._board("sum", incremental=False, history_resolutions=(3600, 86400))
+        self.assertEqual(self.conn.execute(rows).fetchall(), incremental)
+
+        c = self.conn.execute("SELECT id FROM agents WHERE name = 'c'").fetchone()[0]
+        self.assertEqual(
+            [(p["bucket"][11:16], p["score"]) for p in score_history(self.conn, c, 3600)],
+            [("16:00", -5), ("17:00", -10), ("18:00", -5)],
+        )
+        self.assertEqual(score_history(self.conn, c, 86400), [{"bucket": "2026-01-01 00:00:00", "score": -5, "runs": 3}])
+        # The bucket holding `since` is included.
+        self.assertEqual(len(score_history(self.conn, c, 3600, since="2026-01-01 17:30:00")), 2)
+        self.assertEqual(parse_duration("1h"), 3600)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            engine_for(LeaderboardConfig(score_mode="median"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from labyrinth.core.db import connect, init_db
+from labyrinth.core.stats import backfill_stats, challenge_stats, forget_agent, record_attempt
+
+
+# (agent, challenge, status, submitted_at)
+RUNS = [
+    ("a", "x", "fail", "2026-01-01 00:00:00"),
+    ("a", "x", "success", "2026-01-01 00:10:00"),
+    ("b", "x", "fail", "2026-01-01 01:00:00"),
+    ("b", "x", "fail", "2026-01-01 01:01:00"),
+    ("b", "x", "success", "2026-01-01 01:30:00"),
+    ("b", "x", "success", "2026-01-01 02:00:00"),
+    ("c", "x", "fail", "2026-01-01 03:00:00"),
+    ("c", "y", "success", "2026-01-01 03:00:00"),
+]
+
+
+class StatsTests(unittest.TestCase):
+    def setUp(self):
+        self.conn = connect(":memory:")
+        init_db(self.conn)
+        self.ids = {n: self.conn.execute("INSERT INTO agents(name) VALUES (?)", (n,)).lastrowid for n in "abc"}
+        for agent, challenge, status, ts in RUNS:
+            self.conn.execute(
+                "INSERT INTO runs(agent_id, challenge_id, status, points, submitted_at) VALUES (?,?,?,0,?)",
+                (self.ids[agent], challenge, status, ts),
+            )
+            record_attempt(self.conn, self.ids[agent], challenge, status, ts)
+        self.conn.commit()
+
+    def test_counters_and_medians(self):
+        x, y = challenge_stats(self.conn)
+        self.assertEqual((x.attempts, x.successes, x.agents, x.solvers), (7, 3, 3, 2))
+        self.assertAlmostEqual(x.mean_attempts_to_solve, 2.5)
+        self.assertEqual(x.median_solve_seconds, (600 + 1800) / 2)
+        self.assertEqual((y.solvers, y.median_solve_seconds), (1, 0.0))
+
+    def test_backfill_matches_incremental(self):
+        incremental = challenge_stats(self.conn)
+        self.assertEqual(backfill_stats(self.conn), len(RUNS))
+        self.assertEqual(challenge_stats(self.conn), incremental)
+
+    def test_forget_agent(self):
+        forget_agent(self.conn, self.ids["b"])
+        self.conn.execute("DELETE FROM runs WHERE agent_id = ?", (self.ids["b"],))
+        after = challenge_stats(self.conn, "x")
+        backfill_stats(self.conn)
+        self.assertEqual(challenge_stats(self.conn, "x"), after)
+        self.assertEqual(after[0].median_solve_seconds, 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
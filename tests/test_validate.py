@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from labyrinth.core.validate import CACHE_NAME, validate_tree
+
+
+class ValidateTests(unittest.TestCase):
+    def test_repo_plugins_are_valid(self):
+        reports = validate_tree("labyrinth.yaml", jobs=1, use_cache=False)
+        problems = {r.id: r.errors for r in reports if not r.ok}
+        self.assertEqual(problems, {})
+
+    def test_reports_bad_entries_and_caches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            wc_dir = root / "wc"
+            wc_dir.mkdir()
+            wc_cfg = {
+                "challenge": {"id": "wc", "name": "WC", "points": {"on_success": 5}},
+                "word_change": {"start": "SILK", "end": "PUMP", "steps": 2},
+            }
+            (wc_dir / "config.yaml").write_text(yaml.safe_dump(wc_cfg), encoding="utf-8")
+            master = {
+                "plugins": [
+                    {"id": "wc", "kind": "word_change", "config_path": "wc/config.yaml"},
+                    {"id": "nocfg", "path": "wc"},
+                    {"id": "badmod", "module": "plugin", "config_path": "wc/config.yaml"},
+                    {"id": "badkind", "kind": "riddle", "config_path": "wc/config.yaml"},
+                ]
+            }
+            master_path = root / "labyrinth.yaml"
+            master_path.write_text(yaml.safe_dump(master), encoding="utf-8")
+
+            reports = {r.id: r for r in validate_tree(master_path, jobs=1)}
+            self.assertIn("impossible", reports["wc"].errors[0])
+            self.assertEqual(reports["nocfg"].errors, ("missing config_path",))
+            self.assertIn("module", reports["badmod"].errors[0])
+            self.assertIn("unknown kind", reports["badkind"].errors[0])
+            self.assertTrue((root / CACHE_NAME).exists())
+
+            again = {r.id: r for r in validate_tree(master_path, jobs=1)}
+            self.assertTrue(again["wc"].cached)
+
+            wc_cfg["word_change"]["steps"] = 5
+            (wc_dir / "config.yaml").write_text(yaml.safe_dump(wc_cfg), encoding="utf-8")
+            fixed = {r.id: r for r in validate_tree(master_path, jobs=1)}
+            self.assertFalse(fixed["wc"].cached)
+            self.assertTrue(fixed["wc"].ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from labyrinth.core.word_change import WordChangeChallenge
+from labyrinth.core.word_ladder import build_graph, generate_puzzles, ladder, make_puzzle, solve
+
+
+WORDS = ["COLD", "CORD", "CARD", "WARD", "WARM", "WORM", "WORD", "BOLD", "BALD", "BARD", "ZZZZ"]
+
+
+class WordLadderTests(unittest.TestCase):
+    def setUp(self):
+        self.graph = build_graph(WORDS)
+
+    def test_ladder_counts_shortest_chains(self):
+        found = ladder(self.graph, "cold", "WARM")
+        self.assertEqual(found.distance, 4)
+        self.assertEqual(found.chain[0], "COLD")
+        self.assertEqual(found.chain[-1], "WARM")
+        # COLD-CORD-CARD-WARD, COLD-CORD-WORD-WARD and COLD-CORD-WORD-WORM, each then to WARM.
+        self.assertEqual(found.solutions, 3)
+        self.assertIsNone(ladder(self.graph, "COLD", "ZZZZ"))
+
+    def test_solve_pads_to_exact_steps(self):
+        self.assertEqual(len(solve(self.graph, "COLD", "WARM", 4)), 5)
+        padded = solve(self.graph, "COLD", "WARM", 7)
+        self.assertEqual((len(padded), padded[0], padded[-1]), (8, "COLD", "WARM"))
+        for a, b in zip(padded, padded[1:]):
+            self.assertEqual(sum(x != y for x, y in zip(a, b)), 1)
+        self.assertIsNone(solve(self.graph, "COLD", "WARM", 3))
+
+    def test_puzzles_have_exact_shortest_distance(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            puzzle = make_puzzle(self.graph, 3, rng)
+            if puzzle is not None:
+                self.assertEqual(ladder(self.graph, puzzle.start, puzzle.end).distance, 3)
+
+        puzzles = generate_puzzles(5, length=4, steps=(4, 5), workers=1, exclude=[("SILK", "PUMP")])
+        self.assertEqual(len({(p.start, p.end) for p in puzzles}), 5)
+        plugin = WordChangeChallenge()
+        for p in puzzles:
+            cfg = {"word_change": {"start": p.start, "end": p.end, "steps": p.steps}}
+            self.assertTrue(plugin._validate_chain(plugin.sample_submission(cfg, True, rng), cfg))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from labyrinth.core.wordlist import WordList, WordListError, build_wordlist, default_wordlist
+
+
+class WordListTests(unittest.TestCase):
+    def test_build_and_lookup(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "words.bin"
+            entries = [("silk", 4.12), ("Pump", 3.99), ("sill", 2.5), ("a", 7.0), ("zzz", 0.04)]
+            self.assertEqual(build_wordlist(path, entries), 5)
+
+            words = WordList(path)
+            self.assertEqual((len(words), words.lengths), (5, [1, 3, 4]))
+            self.assertEqual(words.zipf("SILK"), 4.1)
+            self.assertEqual(words.zipf("pump"), 3.9)  # rounded down
+            self.assertEqual(words.zipf("zzz"), 0.1)  # every listed word counts as known
+            self.assertNotIn("silt", words)
+            self.assertNotIn("café", words)
+            self.assertEqual(list(words.words(4)), ["pump", "silk", "sill"])
+            self.assertEqual(list(words.words(4, min_zipf=3.0)), ["pump", "silk"])
+
+            path.write_bytes(b"not a list")
+            with self.assertRaises(WordListError):
+                WordList(path)
+
+    def test_shipped_list(self):
+        words = default_wordlist()
+        self.assertIsNotNone(words)
+        for word in ("SILK", "SILL", "PILL", "PULL", "PULP", "PUMP"):
+            self.assertIn(word, words)
+        self.assertNotIn("XQZV", words)
+
+
+if __name__ == "__main__":
+    unittest.main()